@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Étapes d'Ingestion (02 → 04)
+========================================
+Mesure temps et mémoire des étapes du pipeline sur des données synthétiques
+de forme OPSD (voir synthetic_opsd.py), à plusieurs échelles:
+
+- store:    conversion CSV → magasin colonnaire Parquet (étape 2 du script 01)
+- load:     exploration initiale (script 02)
+- quality:  analyse de qualité (script 03)
+- cleaning: nettoyage complet (script 04, sans filigrane incrémental)
+
+Chaque étape s'exécute dans un processus neuf: temps réel, temps CPU, pic
+tracemalloc et pic de mémoire résidente (RSS) lui sont propres. Les
+résultats sont écrits dans benchmarks/results/ (JSON horodaté) et comparés
+au dernier résultat disponible pour repérer les régressions.
+
+Utilisation (depuis la racine du projet):
+    python benchmarks/run_benchmarks.py                        # 1x, 10x, 100x
+    python benchmarks/run_benchmarks.py --scales 1 --stages load quality
+    python benchmarks/run_benchmarks.py --scales 1 --compare benchmarks/results/bench_20260215_101500.json
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from synthetic_opsd import GENERATOR_VERSION, generate_dataset
+
+try:
+    import resource
+except ImportError:  # Windows: pas de pic RSS
+    resource = None
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s: %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BENCH_DIR = PROJECT_ROOT / "benchmarks"
+RAW_FILE = "data/raw/opsd_timeseries/time_series_60min_singleindex.csv"
+STAGES = ["store", "load", "quality", "cleaning"]
+
+
+def _import_script(filename):
+    """Importe un script numéroté (ex. 02_initial_exploration.py) comme module."""
+    path = PROJECT_ROOT / "scripts" / filename
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    # Module enregistré sous son nom: les fonctions du script restent
+    # sérialisables (pickle) pour ses propres ProcessPoolExecutor
+    sys.modules[path.stem] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss est en Ko sous Linux, en octets sous macOS
+    divisor = 1024 ** 2 if sys.platform == 'darwin' else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor, 2)
+
+
+def _run_stage(stage, workdir, trace_memory):
+    """Exécute une étape dans le processus courant (processus fils dédié)."""
+    os.chdir(workdir)
+    sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+    import opsd_store
+
+    config = opsd_store.load_config()
+    if stage == "store":
+        settings = opsd_store.storage_settings(config)
+        run = lambda: opsd_store.build_store(RAW_FILE, settings["store_dir"],
+                                             settings["float_dtype"], settings["chunksize"])
+    elif stage == "load":
+        module = _import_script("02_initial_exploration.py")
+        run = lambda: module.explore_dataset(RAW_FILE, config)
+    elif stage == "quality":
+        module = _import_script("03_data_quality_analysis.py")
+        quality_config = config.get('data_quality', {})
+        run = lambda: module.analyze_data_quality(
+            RAW_FILE, config['focus_countries'], config=config,
+            streaming=quality_config.get('streaming', False),
+            chunksize=quality_config.get('streaming_chunksize', 100_000))
+    else:
+        module = _import_script("04_data_cleaning.py")
+        shutil.rmtree("data/processed", ignore_errors=True)
+        run = lambda: module.clean_data(RAW_FILE, config)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    rss_before = _peak_rss_mb()
+    if trace_memory:
+        tracemalloc.start()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    run()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    traced_peak = None
+    if trace_memory:
+        traced_peak = round(tracemalloc.get_traced_memory()[1] / (1024 ** 2), 2)
+        tracemalloc.stop()
+
+    return {
+        "stage": stage,
+        "wall_s": round(wall, 3),
+        "cpu_s": round(cpu, 3),
+        "tracemalloc_peak_mb": traced_peak,
+        "rss_before_mb": rss_before,
+        "peak_rss_mb": _peak_rss_mb(),
+        "store_used": opsd_store.store_is_fresh(RAW_FILE, opsd_store.storage_settings(config)["store_dir"]),
+    }
+
+
+def ensure_dataset(scale, seed):
+    """Génère le CSV synthétique de l'échelle demandée s'il n'existe pas déjà."""
+    csv_path = BENCH_DIR / "data" / f"opsd_x{scale:g}_seed{seed}.csv"
+    meta_path = csv_path.with_name(csv_path.name + '.meta.json')
+    if csv_path.exists() and meta_path.exists():
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+        if info.get("generator_version") == GENERATOR_VERSION:
+            return csv_path, info
+    info = generate_dataset(csv_path, scale, seed)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(info, f, indent=2)
+    return csv_path, info
+
+
+def prepare_workdir(scale, csv_path):
+    """Répertoire de travail isolé: configuration du projet + données synthétiques."""
+    workdir = BENCH_DIR / "work" / f"x{scale:g}"
+    shutil.rmtree(workdir, ignore_errors=True)
+    (workdir / "data/raw/opsd_timeseries").mkdir(parents=True)
+    (workdir / "reports").mkdir()
+    shutil.copytree(PROJECT_ROOT / "config", workdir / "config")
+
+    # Mesurer le nettoyage complet, pas le chemin incrémental
+    config_path = workdir / "config/pipeline_config.yaml"
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    config.setdefault('cleaning', {})['incremental'] = False
+    with open(config_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, allow_unicode=True, sort_keys=False)
+
+    os.symlink(csv_path.resolve(), workdir / RAW_FILE)
+    return workdir
+
+
+def environment_info():
+    """Contexte d'exécution enregistré avec les résultats."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def latest_result(results_dir, exclude=None):
+    """Dernier fichier de résultats (hors `exclude`), ou None."""
+    candidates = sorted(p for p in Path(results_dir).glob("bench_*.json") if p != exclude)
+    return candidates[-1] if candidates else None
+
+
+def compare_results(current, previous, tolerance):
+    """
+    Compare deux exécutions étape par étape.
+
+    Returns:
+        list: Régressions (temps réel ou pic RSS au-delà de la tolérance)
+    """
+    # Une étape lue depuis le magasin colonnaire n'est comparée qu'à elle-même
+    previous_index = {(r["scale"], r["stage"], r["store_used"]): r for r in previous["results"]}
+    regressions = []
+    logger.info(f"\n   {'Échelle':>8s} {'Étape':10s} {'Temps (s)':>22s} {'Pic RSS (Mo)':>24s}")
+    for result in current["results"]:
+        before = previous_index.get((result["scale"], result["stage"], result["store_used"]))
+        if before is None:
+            continue
+        line = f"   {result['scale']:>7g}x {result['stage']:10s}"
+        for key, width in (("wall_s", 22), ("peak_rss_mb", 24)):
+            old, new = before.get(key), result.get(key)
+            if not old or new is None:
+                line += f" {'n/d':>{width}s}"
+                continue
+            ratio = new / old
+            flag = " ⚠️" if ratio > 1 + tolerance else ""
+            line += f" {f'{old:.2f} → {new:.2f} ({ratio:.2f}×)':>{width}s}{flag}"
+            if flag:
+                regressions.append((result["scale"], result["stage"], key, old, new))
+        logger.info(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des étapes 02 à 04 sur données synthétiques")
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10, 100],
+                        help="Facteurs de taille (1 = 50 401 × 300)")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-tracemalloc', action='store_true',
+                        help="Désactiver tracemalloc (temps sans surcoût de traçage)")
+    parser.add_argument('--compare', help="Fichier de résultats de référence (défaut: le dernier)")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Hausse relative signalée comme régression (défaut: 20%%)")
+    args = parser.parse_args()
+
+    logger.info("=" * 80)
+    logger.info("BENCHMARK DU PIPELINE D'INGESTION")
+    logger.info("=" * 80)
+
+    trace_memory = not args.no_tracemalloc
+    stages = [stage for stage in STAGES if stage in args.stages]
+    results = []
+    for scale in args.scales:
+        logger.info(f"\n📦 Échelle {scale:g}x")
+        csv_path, info = ensure_dataset(scale, args.seed)
+        workdir = prepare_workdir(scale, csv_path)
+        for stage in stages:
+            # Processus neuf par étape: pics mémoire indépendants
+            with ProcessPoolExecutor(max_workers=1,
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                result = executor.submit(_run_stage, stage, str(workdir), trace_memory).result()
+            result.update({"scale": scale, "rows": info["rows"], "columns": info["columns"],
+                           "csv_mb": info["size_mb"]})
+            results.append(result)
+            logger.info(f"   {stage:10s} {result['wall_s']:9.2f} s  CPU {result['cpu_s']:9.2f} s  "
+                        f"RSS {result['peak_rss_mb'] or 0:9.1f} Mo  "
+                        f"tracemalloc {result['tracemalloc_peak_mb'] or 0:9.1f} Mo")
+
+    report = {
+        "created": datetime.now().isoformat(timespec='seconds'),
+        "environment": environment_info(),
+        "settings": {"seed": args.seed, "tracemalloc": trace_memory, "stages": stages,
+                     "generator_version": GENERATOR_VERSION},
+        "results": results,
+    }
+    results_dir = BENCH_DIR / "results"
+    results_dir.mkdir(parents=True, exist_ok=True)
+    output_file = results_dir / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    logger.info(f"\n✅ Résultats sauvegardés: {output_file}")
+
+    reference = Path(args.compare) if args.compare else latest_result(results_dir, exclude=output_file)
+    if reference is None:
+        logger.info("   Aucun résultat de référence pour comparaison")
+        return
+    with open(reference, 'r', encoding='utf-8') as f:
+        previous = json.load(f)
+    if previous["settings"].get("tracemalloc") != trace_memory:
+        logger.warning("   ⚠️  Référence mesurée avec un réglage tracemalloc différent: temps peu comparables")
+    logger.info(f"\n📊 Comparaison avec {reference.name}:")
+    regressions = compare_results(report, previous, args.tolerance)
+    if regressions:
+        logger.warning(f"\n   ⚠️  {len(regressions)} régression(s) au-delà de {args.tolerance:.0%}")
+    else:
+        logger.info(f"\n   ✅ Aucune régression au-delà de {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Générateur de Données Synthétiques OPSD
+===================================================
+Génère un CSV ayant la forme du fichier OPSD time_series_60min_singleindex
+(mêmes 300 colonnes `{zone}_{source}_{métrique}`, pas horaire UTC), avec:
+
+- saisonnalités journalière/hebdomadaire pour charge, solaire et éolien
+- valeurs manquantes réalistes: séries démarrant tard, s'arrêtant tôt,
+  heures isolées manquantes et pannes de plusieurs heures/jours
+- épisodes de prix négatifs de plusieurs heures (midi, week-end)
+
+Échelles: 1x = 50 401 lignes × 300 colonnes. Au-delà de 10x, le nombre de
+lignes est plafonné (10x = 57 ans d'heures, limite des datetime64[ns]) et
+les colonnes sont répliquées (zones `{zone}_R{k}`): 100x = 10x lignes ×
+10x colonnes.
+
+Utilisation:
+    python benchmarks/synthetic_opsd.py --scale 10 --output benchmarks/data/opsd_x10.csv
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s: %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+GENERATOR_VERSION = 1
+BASE_ROWS = 50_401
+MAX_ROW_FACTOR = 10
+START = "2014-12-31 23:00"
+
+METRICS = {
+    "la": "load_actual_entsoe_transparency",
+    "lf": "load_forecast_entsoe_transparency",
+    "p": "price_day_ahead",
+    "sc": "solar_capacity",
+    "sg": "solar_generation_actual",
+    "sp": "solar_profile",
+    "wc": "wind_capacity",
+    "wg": "wind_generation_actual",
+    "wp": "wind_profile",
+    "fc": "wind_offshore_capacity",
+    "fg": "wind_offshore_generation_actual",
+    "fp": "wind_offshore_profile",
+    "nc": "wind_onshore_capacity",
+    "ng": "wind_onshore_generation_actual",
+    "np": "wind_onshore_profile",
+}
+
+# Zones et métriques du fichier OPSD (ordre des colonnes conservé)
+ZONES = [
+    ("AT", "la lf p sg ng"),
+    ("BE", "la lf sg wg fg ng"),
+    ("BG", "la lf sg ng"),
+    ("CH", "la lf sc sg nc ng"),
+    ("CY", "la lf ng"),
+    ("CZ", "la lf sg ng"),
+    ("DE", "la lf sc sg sp wc wg wp fc fg fp nc ng np"),
+    ("DE_50hertz", "la lf sg wg fg ng"),
+    ("DE_LU", "la lf p sg wg fg ng"),
+    ("DE_amprion", "la lf sg ng"),
+    ("DE_tennet", "la lf sg wg fg ng"),
+    ("DE_transnetbw", "la lf sg ng"),
+    ("DK", "la lf sc sg wc wg fc fg nc ng"),
+    ("DK_1", "la lf p sg wg fg ng"),
+    ("DK_2", "la lf p sg wg fg ng"),
+    ("EE", "la lf sg ng"),
+    ("ES", "la lf sg ng"),
+    ("FI", "la lf ng"),
+    ("FR", "la lf sg ng"),
+    ("GB_GBN", "la lf p sc sg sp wc wg wp fc fg fp nc ng np"),
+    ("GB_NIR", "la lf sc nc ng"),
+    ("GB_UKM", "la lf sc sg wc wg fc fg nc ng"),
+    ("GR", "la lf sg ng"),
+    ("HR", "la lf sg ng"),
+    ("HU", "la lf sg ng"),
+    ("IE", "la lf ng"),
+    ("IE_sem", "la lf p ng"),
+    ("IT", "la lf sg ng"),
+    ("IT_BRNN", "p ng"),
+    ("IT_CNOR", "la lf p sg ng"),
+    ("IT_CSUD", "la lf p sg ng"),
+    ("IT_FOGN", "p sg ng"),
+    ("IT_GR", "p"),
+    ("IT_NORD", "la lf p sg ng"),
+    ("IT_NORD_AT", "p"),
+    ("IT_NORD_CH", "p"),
+    ("IT_NORD_FR", "p"),
+    ("IT_NORD_SI", "p"),
+    ("IT_PRGP", "p sg ng"),
+    ("IT_ROSN", "p sg ng"),
+    ("IT_SACO_AC", "p"),
+    ("IT_SACO_DC", "p"),
+    ("IT_SARD", "la lf p sg ng"),
+    ("IT_SICI", "la lf p sg ng"),
+    ("IT_SUD", "la lf p sg ng"),
+    ("LT", "la lf sg ng"),
+    ("LU", "la lf"),
+    ("LV", "la lf ng"),
+    ("ME", "la lf ng"),
+    ("NL", "la lf sg wg fg ng"),
+    ("NO", "la lf ng"),
+    ("NO_1", "la lf p ng"),
+    ("NO_2", "la lf p ng"),
+    ("NO_3", "la lf p ng"),
+    ("NO_4", "la lf p ng"),
+    ("NO_5", "la lf p ng"),
+    ("PL", "la lf sg ng"),
+    ("PT", "la lf sg wg fg ng"),
+    ("RO", "la lf sg ng"),
+    ("RS", "la lf"),
+    ("SE", "la lf wc fc nc ng"),
+    ("SE_1", "la lf p ng"),
+    ("SE_2", "la lf p ng"),
+    ("SE_3", "la lf p ng"),
+    ("SE_4", "la lf p ng"),
+    ("SI", "la lf sg ng"),
+    ("SK", "la lf sg ng"),
+    ("UA", "la lf"),
+]
+
+KINDS = {
+    "la": "load", "lf": "load", "p": "price",
+    "sc": "capacity", "wc": "capacity", "fc": "capacity", "nc": "capacity",
+    "sg": "solar", "wg": "wind", "fg": "wind", "ng": "wind",
+    "sp": "solar_profile", "wp": "wind_profile", "fp": "wind_profile", "np": "wind_profile",
+}
+
+# Zones où les prix négatifs sont les plus fréquents
+HIGH_NEGATIVE_ZONES = ("DE", "DK")
+
+
+def scale_shape(scale):
+    """(lignes, répliques des colonnes) pour une échelle donnée."""
+    row_factor = min(scale, MAX_ROW_FACTOR)
+    replicas = max(1, round(scale / row_factor))
+    return int(BASE_ROWS * row_factor), replicas
+
+
+def column_specs(replicas=1):
+    """Colonnes de données (nom, zone, type), répliquées au-delà de 10x."""
+    specs = []
+    for k in range(replicas):
+        suffix = f"_R{k}" if k else ""
+        for zone, codes in ZONES:
+            for code in codes.split():
+                specs.append((f"{zone}{suffix}_{METRICS[code]}", zone, KINDS[code]))
+    return specs
+
+
+def _column_plan(index, zone, kind, n_rows, seed):
+    """Paramètres fixes d'une colonne: niveau, phase et valeurs manquantes."""
+    rng = np.random.default_rng([seed, index])
+    plan = {
+        "kind": kind,
+        "level": float(rng.uniform(500, 60_000)),
+        "phase": float(rng.uniform(0, 2 * np.pi)),
+        "start": 0,
+        "end": n_rows,
+        "missing_rate": float(rng.uniform(0, 0.01)),
+        "negative_rate": 0.002 if zone.split('_')[0] in HIGH_NEGATIVE_ZONES else 0.0005,
+    }
+    # Séries publiées plus tard ou arrêtées avant la fin du fichier
+    if rng.random() < 0.3:
+        plan["start"] = int(rng.uniform(0, 0.5) * n_rows)
+    if rng.random() < 0.1:
+        plan["end"] = int(rng.uniform(0.8, 1.0) * n_rows)
+    # Pannes de plusieurs heures à une semaine
+    n_outages = rng.poisson(2 * n_rows / BASE_ROWS)
+    starts = rng.integers(0, n_rows, n_outages)
+    plan["outages"] = [(int(s), int(s + rng.integers(3, 24 * 7))) for s in starts]
+    return plan
+
+
+def _generate_values(plan, t, hour, dayofweek, dayofyear, rng):
+    """Valeurs d'une colonne pour un bloc d'heures (NaN inclus)."""
+    n = len(t)
+    kind = plan["kind"]
+    seasonal = np.cos(2 * np.pi * (dayofyear - 172) / 365)
+    solar_shape = np.clip(np.sin(np.pi * (hour - 5) / 14), 0, None) * (0.65 + 0.35 * seasonal)
+    wind_shape = np.clip(
+        0.3
+        + 0.2 * np.sin(2 * np.pi * t / (24 * 4.3) + plan["phase"])
+        + 0.15 * np.sin(2 * np.pi * t / (24 * 29) + 2 * plan["phase"])
+        - 0.1 * seasonal
+        + 0.08 * rng.standard_normal(n),
+        0, 1)
+
+    if kind == "load":
+        values = plan["level"] * (1 + 0.15 * np.sin(2 * np.pi * (hour - 8) / 24)
+                                  - 0.08 * (dayofweek >= 5) - 0.1 * seasonal
+                                  + 0.02 * rng.standard_normal(n))
+        values = values.round(1)
+    elif kind == "capacity":
+        values = (plan["level"] * (1 + 0.05 * (t // 8760))).round(1)
+    elif kind == "solar":
+        values = (plan["level"] * solar_shape * rng.uniform(0.5, 1, n)).round(1)
+    elif kind == "wind":
+        values = (plan["level"] * wind_shape).round(1)
+    elif kind == "solar_profile":
+        values = (solar_shape * rng.uniform(0.5, 1, n)).round(4)
+    elif kind == "wind_profile":
+        values = wind_shape.round(4)
+    else:
+        values = (40 + 12 * np.sin(2 * np.pi * (hour - 7) / 24) - 20 * wind_shape
+                  + 8 * rng.standard_normal(n))
+        # Épisodes de prix négatifs: plus probables à midi et le week-end
+        weight = 1 + 2 * ((hour >= 10) & (hour <= 15)) + (dayofweek >= 5)
+        for start in np.flatnonzero(rng.random(n) < plan["negative_rate"] * weight):
+            duration = rng.integers(1, 9)
+            values[start:start + duration] = -rng.uniform(0.5, 60)
+        values = values.round(2)
+
+    missing = (t < plan["start"]) | (t >= plan["end"]) | (rng.random(n) < plan["missing_rate"])
+    for start, end in plan["outages"]:
+        missing |= (t >= start) & (t < end)
+    values[missing] = np.nan
+    return values
+
+
+def generate_dataset(output_path, scale=1, seed=42, chunk_cells=15_000_000):
+    """
+    Écrit un CSV synthétique de forme OPSD à l'échelle demandée.
+
+    Args:
+        output_path: Chemin du CSV à produire
+        scale: Facteur de taille (1 = 50 401 × 300)
+        seed: Graine aléatoire (même graine = même fichier)
+        chunk_cells: Nombre de cellules générées par bloc (mémoire bornée)
+
+    Returns:
+        dict: Métadonnées du fichier (lignes, colonnes, taille)
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    n_rows, replicas = scale_shape(scale)
+    specs = column_specs(replicas)
+    plans = [_column_plan(i, zone, kind, n_rows, seed) for i, (_, zone, kind) in enumerate(specs)]
+    chunk_rows = max(1_000, chunk_cells // len(specs))
+    origin = pd.Timestamp(START, tz='UTC')
+
+    logger.info(f"Génération {scale:g}x: {n_rows:,} lignes × {len(specs) + 2:,} colonnes → {output_path}")
+    tmp_path = output_path.with_name(output_path.name + '.tmp')
+    for chunk_index, first in enumerate(range(0, n_rows, chunk_rows)):
+        t = np.arange(first, min(first + chunk_rows, n_rows))
+        timestamps = origin + pd.to_timedelta(t, unit='h')
+        rng = np.random.default_rng([seed, len(specs), chunk_index])
+        hour = timestamps.hour.to_numpy()
+        dayofweek = timestamps.dayofweek.to_numpy()
+        dayofyear = timestamps.dayofyear.to_numpy()
+
+        data = {
+            'utc_timestamp': timestamps.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'cet_cest_timestamp': timestamps.tz_convert('Europe/Brussels').strftime('%Y-%m-%dT%H:%M:%S%z'),
+        }
+        for (name, _, _), plan in zip(specs, plans):
+            data[name] = _generate_values(plan, t, hour, dayofweek, dayofyear, rng)
+        pd.DataFrame(data).to_csv(tmp_path, mode='w' if first == 0 else 'a',
+                                  header=first == 0, index=False)
+    tmp_path.replace(output_path)
+
+    return {
+        "generator_version": GENERATOR_VERSION,
+        "scale": scale,
+        "seed": seed,
+        "rows": n_rows,
+        "columns": len(specs) + 2,
+        "size_mb": round(output_path.stat().st_size / (1024**2), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère un CSV synthétique de forme OPSD")
+    parser.add_argument('--scale', type=float, default=1, help="Facteur de taille (1 = 50 401 × 300)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='benchmarks/data/opsd_x1.csv')
+    args = parser.parse_args()
+
+    info = generate_dataset(args.output, args.scale, args.seed)
+    logger.info(f"✅ {info['rows']:,} lignes × {info['columns']:,} colonnes, {info['size_mb']:.2f} Mo")
+
+
+if __name__ == "__main__":
+    main()
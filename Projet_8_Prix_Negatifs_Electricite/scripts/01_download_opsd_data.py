@@ -3,21 +3,24 @@
 Script 1: Téléchargement des Données OPSD
 ==========================================
 Télécharge automatiquement le dataset OPSD Time Series depuis le portail
-Open Power System Data.
+Open Power System Data, ainsi que les fichiers météo et pages ENTSO-E
+déclarés dans la configuration (téléchargements concurrents).
 
 Auteur: Étudiant 1 - Responsable Données & Ingestion
 Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
 Date: Février 2026
 """
 
-import os
+import argparse
 import sys
-import requests
 import logging
 from pathlib import Path
-from tqdm import tqdm
 import yaml
 
+from multi_fetcher import fetch_all, fetch_jobs, fetcher_settings
+from opsd_store import build_store, storage_settings, store_is_fresh
+from run_profile import RunProfile
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -38,101 +41,84 @@ def load_config(config_path='config/pipeline_config.yaml'):
         sys.exit(1)
 
 
-def download_file(url, destination_path, chunk_size=8192):
-    """
-    Télécharge un fichier depuis une URL avec barre de progression.
-    
-    Args:
-        url (str): URL du fichier à télécharger
-        destination_path (Path): Chemin de destination
-        chunk_size (int): Taille des chunks pour le téléchargement
-    
-    Returns:
-        bool: True si succès, False sinon
-    """
-    try:
-        logger.info(f"Téléchargement depuis: {url}")
-        logger.info(f"Destination: {destination_path}")
-        
-        # Créer le dossier de destination s'il n'existe pas
-        destination_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Téléchargement avec barre de progression
-        response = requests.get(url, stream=True, timeout=30)
-        response.raise_for_status()
-        
-        # Obtenir la taille totale si disponible
-        total_size = int(response.headers.get('content-length', 0))
-        
-        with open(destination_path, 'wb') as f:
-            with tqdm(total=total_size, unit='B', unit_scale=True, desc=destination_path.name) as pbar:
-                for chunk in response.iter_content(chunk_size=chunk_size):
-                    if chunk:
-                        f.write(chunk)
-                        pbar.update(len(chunk))
-        
-        # Vérifier la taille du fichier téléchargé
-        file_size = destination_path.stat().st_size
-        logger.info(f"Fichier téléchargé: {file_size / (1024*1024):.2f} Mo")
-        
-        return True
-        
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Erreur lors du téléchargement: {e}")
-        return False
-    except Exception as e:
-        logger.error(f"Erreur inattendue: {e}")
-        return False
-
-
 def main():
     """Fonction principale du script de téléchargement."""
+    parser = argparse.ArgumentParser(description="Téléchargement des données OPSD")
+    parser.add_argument('--force', action='store_true',
+                        help="Re-télécharger même si le fichier distant n'a pas changé")
+    args = parser.parse_args()
+    
     logger.info("=" * 80)
     logger.info("DÉBUT DU TÉLÉCHARGEMENT DES DONNÉES OPSD")
     logger.info("=" * 80)
     
     # Charger la configuration
     config = load_config()
+    download_config = config.get('download', {})
     
-    # Télécharger OPSD Time Series
-    logger.info("\n1. Téléchargement des données OPSD Time Series (horaire)")
+    # Télécharger toutes les sources déclarées (OPSD Time Series, météo, ENTSO-E)
+    run_profile = RunProfile("01_download_opsd_data")
+    run_profile.section("1. Téléchargement des sources de données")
+    logger.info("\n1. Téléchargement des sources de données (concurrent)")
     opsd_config = config['data_sources']['opsd_timeseries']
-    opsd_url = opsd_config['url']
     opsd_dest = Path(opsd_config['destination']) / opsd_config['filename']
+    jobs = fetch_jobs(config)
+    logger.info(f"   {len(jobs)} ressources: {', '.join(job.name for job in jobs)}")
+    
+    # Non interactif: un fichier est ignoré si ETag/Last-Modified n'ont pas
+    # changé, et repris s'il avait été interrompu
+    results = fetch_all(
+        jobs,
+        fetcher_settings(config),
+        chunk_size=download_config.get('chunk_size_kb', 1024) * 1024,
+        timeout=download_config.get('timeout', 30),
+        force=args.force
+    )
+    failed = [job for job in jobs if not results[job.name]["ok"]]
+    for job in failed:
+        logger.warning(f"⚠️  Non récupéré: {job.name}")
+    if any(job.required for job in failed):
+        logger.error("❌ Échec du téléchargement OPSD Time Series")
+        sys.exit(1)
+    logger.info("✅ Téléchargement OPSD Time Series réussi!")
     
-    if opsd_dest.exists():
-        logger.warning(f"Le fichier existe déjà: {opsd_dest}")
-        response = input("Voulez-vous le re-télécharger? (o/n): ")
-        if response.lower() != 'o':
-            logger.info("Téléchargement ignoré.")
-        else:
-            success = download_file(opsd_url, opsd_dest)
-            if success:
-                logger.info("✅ Téléchargement OPSD Time Series réussi!")
-            else:
-                logger.error("❌ Échec du téléchargement OPSD Time Series")
-                sys.exit(1)
+    # Conversion en magasin colonnaire partagé par les scripts 02 à 04
+    run_profile.section("2. Conversion en magasin colonnaire")
+    logger.info("\n2. Conversion en magasin colonnaire (Parquet)")
+    settings = storage_settings(config)
+    if store_is_fresh(opsd_dest, settings['store_dir']):
+        logger.info(f"   Magasin déjà à jour: {settings['store_dir']}")
     else:
-        success = download_file(opsd_url, opsd_dest)
-        if success:
-            logger.info("✅ Téléchargement OPSD Time Series réussi!")
-        else:
-            logger.error("❌ Échec du téléchargement OPSD Time Series")
-            sys.exit(1)
+        manifest = build_store(opsd_dest, settings['store_dir'],
+                               float_dtype=settings['float_dtype'],
+                               chunksize=settings['chunksize'])
+        run_profile.processed(manifest['rows'], len(manifest['columns']))
+    run_profile.save()
     
     # Information sur OPSD Weather Data
-    logger.info("\n2. Données OPSD Weather (ERA5)")
-    logger.info("⚠️  Les données météo sont volumineuses (plusieurs Go)")
-    logger.info("    URL: https://data.open-power-system-data.org/weather_data/")
-    logger.info("    Action: Vérifier manuellement la page pour téléchargement ciblé")
-    logger.info("    Recommandation: Télécharger seulement les pays focus (DE, DK, FR)")
+    logger.info("\n3. Données OPSD Weather (ERA5)")
+    weather_jobs = [job for job in jobs if job.name.startswith("opsd_weather:")]
+    if weather_jobs:
+        logger.info(f"    {sum(results[job.name]['ok'] for job in weather_jobs)}/{len(weather_jobs)} "
+                    f"fichiers dans {config['data_sources']['opsd_weather']['destination']}")
+    else:
+        logger.info("⚠️  Les données météo sont volumineuses (plusieurs Go)")
+        logger.info("    URL: https://data.open-power-system-data.org/weather_data/")
+        logger.info("    Action: Renseigner data_sources.opsd_weather.files dans la configuration")
+        logger.info("    Recommandation: Télécharger seulement les pays focus (DE, DK, FR)")
     
     # Information sur ENTSO-E
-    logger.info("\n3. Données ENTSO-E Transparency Platform")
-    logger.info("⚠️  Nécessite une inscription gratuite")
-    logger.info("    URL: https://transparency.entsoe.eu/")
-    logger.info("    Action: S'inscrire et obtenir un token API")
-    logger.info("    Note: Ces données sont complémentaires (optionnelles pour démarrage)")
+    logger.info("\n4. Données ENTSO-E Transparency Platform")
+    entsoe_jobs = [job for job in jobs if job.name.startswith("entsoe:")]
+    if entsoe_jobs:
+        logger.info(f"    {sum(results[job.name]['ok'] for job in entsoe_jobs)}/{len(entsoe_jobs)} "
+                    f"pages dans {config['data_sources']['entsoe']['destination']}")
+    else:
+        logger.info("⚠️  Nécessite une inscription gratuite")
+        logger.info("    URL: https://transparency.entsoe.eu/")
+        logger.info("    Action: S'inscrire, exporter le token API (ENTSOE_TOKEN) et")
+        logger.info("            renseigner data_sources.entsoe.requests")
+        logger.info("    Note: Ces données sont complémentaires (optionnelles pour démarrage)")
     
     logger.info("\n" + "=" * 80)
     logger.info("TÉLÉCHARGEMENT TERMINÉ")
@@ -9,13 +9,17 @@ Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
 Date: Février 2026
 """
 
-import pandas as pd
-import numpy as np
+import argparse
 import os
 import sys
-from pathlib import Path
 import logging
 
+from column_schema import schema_for
+from dataset_profile import profile_dataset, write_exploration_report
+from opsd_store import load_config
+from run_profile import RunProfile
+from sample_profile import preview_settings, profile_preview
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,9 +28,17 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def explore_dataset(file_path):
-    """Explore le dataset OPSD et génère un rapport initial."""
+def explore_dataset(file_path, config=None, profile=None):
+    """
+    Explore le dataset OPSD et génère un rapport initial.
+    
+    Args:
+        file_path: Chemin vers le fichier CSV OPSD
+        config: Configuration du pipeline (pays focus, magasin colonnaire)
+        profile: Profil déjà calculé (dataset_profile), sinon calculé ici
+    """
     
+    run_profile = RunProfile("02_initial_exploration")
     logger.info("=" * 80)
     logger.info("EXPLORATION INITIALE DU DATASET OPSD")
     logger.info("=" * 80)
@@ -41,155 +53,142 @@ def explore_dataset(file_path):
     logger.info(f"\n📁 Fichier: {file_path}")
     logger.info(f"📏 Taille: {file_size:.2f} Mo")
     
-    # Charger le dataset avec parsing des dates
+    focus_countries = config['focus_countries'] if config else ['DE', 'DK', 'FR']
+    
+    # Profil commun avec l'analyse de qualité: une seule lecture du dataset
+    run_profile.section("CHARGEMENT DES DONNÉES")
     logger.info("\n⏳ Chargement des données (cela peut prendre quelques secondes)...")
     try:
-        df = pd.read_csv(file_path, parse_dates=[0], low_memory=False)
+        if profile is None:
+            quality_config = (config or {}).get('data_quality', {})
+            profile = profile_dataset(file_path, focus_countries, config,
+                                      streaming=quality_config.get('streaming', False),
+                                      chunksize=quality_config.get('streaming_chunksize', 100_000))
         logger.info("✅ Données chargées avec succès!")
+        run_profile.processed(profile['rows'], len(profile['columns']))
     except Exception as e:
         logger.error(f"❌ Erreur lors du chargement: {e}")
         sys.exit(1)
+    columns = profile['columns']
     
     # Informations générales
+    run_profile.section("1. DIMENSIONS DU DATASET")
     logger.info("\n" + "=" * 80)
     logger.info("1. DIMENSIONS DU DATASET")
     logger.info("=" * 80)
-    rows, cols = df.shape
+    rows, cols = profile['rows'], len(columns)
     logger.info(f"   Lignes (timestamps): {rows:,}")
     logger.info(f"   Colonnes (variables): {cols:,}")
-    memory_usage = df.memory_usage(deep=True).sum() / (1024 ** 2)
-    logger.info(f"   Mémoire utilisée: {memory_usage:.2f} Mo")
+    logger.info(f"   Mémoire utilisée: {profile['memory_mb']:.2f} Mo")
     
     # Informations sur l'index temporel
+    run_profile.section("2. PÉRIODE TEMPORELLE")
     logger.info("\n" + "=" * 80)
     logger.info("2. PÉRIODE TEMPORELLE")
     logger.info("=" * 80)
-    time_col = df.columns[0]
+    time_col = columns[0]
     logger.info(f"   Colonne temporelle: '{time_col}'")
-    logger.info(f"   Début: {df[time_col].min()}")
-    logger.info(f"   Fin: {df[time_col].max()}")
-    duration = df[time_col].max() - df[time_col].min()
+    logger.info(f"   Début: {profile['period_start']}")
+    logger.info(f"   Fin: {profile['period_end']}")
+    duration = profile['period_end'] - profile['period_start']
     logger.info(f"   Durée totale: {duration}")
     
     # Types de données
+    run_profile.section("3. TYPES DE DONNÉES")
     logger.info("\n" + "=" * 80)
     logger.info("3. TYPES DE DONNÉES")
     logger.info("=" * 80)
-    type_counts = df.dtypes.value_counts()
-    for dtype, count in type_counts.items():
+    for dtype, count in profile['dtypes'].items():
         logger.info(f"   {dtype}: {count} colonnes")
     
     # Aperçu des colonnes
+    run_profile.section("4. APERÇU DES COLONNES (premières 20)")
     logger.info("\n" + "=" * 80)
     logger.info("4. APERÇU DES COLONNES (premières 20)")
     logger.info("=" * 80)
-    for i, col in enumerate(df.columns[:20], 1):
+    for i, col in enumerate(columns[:20], 1):
         logger.info(f"   {i:2d}. {col}")
-    if len(df.columns) > 20:
-        logger.info(f"   ... et {len(df.columns) - 20} autres colonnes")
+    if len(columns) > 20:
+        logger.info(f"   ... et {len(columns) - 20} autres colonnes")
     
     # Analyse des colonnes par pays (identifiées par code à 2 lettres)
+    run_profile.section("5. COLONNES PAR PAYS (Focus: DE, DK, FR)")
     logger.info("\n" + "=" * 80)
     logger.info("5. COLONNES PAR PAYS (Focus: DE, DK, FR)")
     logger.info("=" * 80)
     
-    focus_countries = ['DE', 'DK', 'FR']
+    schema = schema_for(columns)
     for country in focus_countries:
-        country_cols = [col for col in df.columns if country in col]
+        country_cols = schema.columns_for(country)
         logger.info(f"\n   {country} ({len(country_cols)} colonnes):")
         
         # Chercher les colonnes de prix
-        price_cols = [col for col in country_cols if 'price' in col.lower()]
+        price_cols = schema.columns_for(country, role='price')
         if price_cols:
             logger.info(f"      Prix: {price_cols}")
         
         # Chercher les colonnes de génération
-        gen_cols = [col for col in country_cols if any(x in col.lower() for x in ['solar', 'wind', 'generation'])]
+        gen_cols = schema.columns_for(country, role='generation')
         if gen_cols:
             logger.info(f"      Génération: {gen_cols[:5]}" + (" ..." if len(gen_cols) > 5 else ""))
         
         # Chercher les colonnes de charge
-        load_cols = [col for col in country_cols if 'load' in col.lower()]
+        load_cols = schema.columns_for(country, role='load')
         if load_cols:
             logger.info(f"      Charge: {load_cols}")
     
     # Valeurs manquantes
+    run_profile.section("6. VALEURS MANQUANTES (Top 10 colonnes)")
     logger.info("\n" + "=" * 80)
     logger.info("6. VALEURS MANQUANTES (Top 10 colonnes)")
     logger.info("=" * 80)
-    missing = df.isnull().sum()
-    missing_pct = (missing / len(df) * 100).sort_values(ascending=False)
+    missing = profile['missing']
+    missing_pct = (missing / rows * 100).sort_values(ascending=False)
     
     for col, pct in missing_pct.head(10).items():
         count = missing[col]
         logger.info(f"   {col[:50]:50s} : {count:6,} ({pct:5.1f}%)")
     
     # Statistiques sur les colonnes de prix (si trouvées)
+    run_profile.section("7. ANALYSE DES PRIX DAY-AHEAD")
     logger.info("\n" + "=" * 80)
     logger.info("7. ANALYSE DES PRIX DAY-AHEAD")
     logger.info("=" * 80)
     
-    price_keywords = ['day_ahead', 'price', 'DA']
-    price_cols = [col for col in df.columns if any(kw in col for kw in price_keywords)]
+    price_cols = schema.columns_for(role='price')
     
     if price_cols:
         logger.info(f"   {len(price_cols)} colonnes de prix identifiées")
         
-        # Focus sur pays prioritaires
+        # Focus sur pays prioritaires (2 colonnes par pays, statistiques du profil)
         for country in focus_countries:
-            country_price_cols = [col for col in price_cols if country in col]
-            if country_price_cols:
-                for col in country_price_cols[:2]:  # Limiter à 2 colonnes par pays
-                    if col in df.columns:
-                        logger.info(f"\n   {col}:")
-                        logger.info(f"      Min: {df[col].min():.2f} EUR/MWh")
-                        logger.info(f"      Max: {df[col].max():.2f} EUR/MWh")
-                        logger.info(f"      Médiane: {df[col].median():.2f} EUR/MWh")
-                        
-                        # Compter prix négatifs
-                        negative_count = (df[col] < 0).sum()
-                        negative_pct = (negative_count / df[col].count()) * 100
-                        logger.info(f"      Prix négatifs: {negative_count:,} ({negative_pct:.2f}%)")
+            for col, stats in profile['exploration_price_stats'].get(country, {}).items():
+                logger.info(f"\n   {col}:")
+                if stats is None:
+                    logger.info("      ⚠️  Aucune donnée non-nulle")
+                    continue
+                logger.info(f"      Min: {stats['min']:.2f} EUR/MWh")
+                logger.info(f"      Max: {stats['max']:.2f} EUR/MWh")
+                logger.info(f"      Médiane: {stats['median']:.2f} EUR/MWh")
+                logger.info(f"      Prix négatifs: {stats['negative_count']:,} ({stats['negative_pct']:.2f}%)")
     
     # Sauvegarder un rapport texte
+    run_profile.section("8. SAUVEGARDE DU RAPPORT")
     logger.info("\n" + "=" * 80)
     logger.info("8. SAUVEGARDE DU RAPPORT")
     logger.info("=" * 80)
     
-    output_dir = Path("reports")
-    output_dir.mkdir(exist_ok=True)
-    report_file = output_dir / "initial_exploration.txt"
-    
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("RAPPORT D'EXPLORATION INITIALE - OPSD TIME SERIES\n")
-        f.write("=" * 80 + "\n\n")
-        f.write(f"Fichier: {file_path}\n")
-        f.write(f"Taille: {file_size:.2f} Mo\n")
-        f.write(f"Lignes: {rows:,}\n")
-        f.write(f"Colonnes: {cols:,}\n")
-        f.write(f"Période: {df[time_col].min()} à {df[time_col].max()}\n\n")
-        
-        f.write("Liste complète des colonnes:\n")
-        f.write("-" * 80 + "\n")
-        for i, col in enumerate(df.columns, 1):
-            f.write(f"{i:4d}. {col}\n")
-    
+    report_file = write_exploration_report(profile)
     logger.info(f"   ✅ Rapport sauvegardé: {report_file}")
     
     # Afficher les premières lignes
+    run_profile.section("9. APERÇU DES DONNÉES (5 premières lignes, colonnes sélectionnées)")
     logger.info("\n" + "=" * 80)
     logger.info("9. APERÇU DES DONNÉES (5 premières lignes, colonnes sélectionnées)")
     logger.info("=" * 80)
     
-    # Sélectionner quelques colonnes pour l'affichage
-    display_cols = [time_col]
-    for country in focus_countries:
-        price_col = [col for col in df.columns if country in col and 'price' in col.lower()]
-        if price_col:
-            display_cols.append(price_col[0])
-    
-    logger.info("\n" + df[display_cols].head().to_string())
+    logger.info("\n" + profile['preview'].to_string())
+    run_profile.save()
     
     logger.info("\n" + "=" * 80)
     logger.info("EXPLORATION TERMINÉE")
@@ -200,8 +199,71 @@ def explore_dataset(file_path):
     logger.info("   3. Procéder au nettoyage\n")
 
 
+def preview_dataset(file_path, config=None):
+    """
+    Aperçu rapide: estimations et intervalles de confiance à partir d'un
+    échantillon de blocs temporels, sans lecture complète du fichier.
+    Aucun rapport n'est écrit (le rapport exact reste celui de l'exploration).
+    """
+    logger.info("=" * 80)
+    logger.info("APERÇU RAPIDE DU DATASET OPSD (ÉCHANTILLON)")
+    logger.info("=" * 80)
+    
+    focus_countries = config['focus_countries'] if config else ['DE', 'DK', 'FR']
+    settings = preview_settings(config)
+    preview = profile_preview(file_path, focus_countries, config)
+    # Unité d'échantillonnage: le bloc (les lignes d'un bloc sont autocorrélées)
+    level = (f"IC {preview['confidence']*100:.0f}% sur {preview['blocks']} blocs, "
+             f"{preview['strata']} strates")
+    
+    logger.info("\n" + "=" * 80)
+    logger.info("1. ÉCHANTILLON")
+    logger.info("=" * 80)
+    logger.info(f"   {preview['blocks']} blocs de {settings['block_rows']} lignes "
+                f"({settings['strata']} strates temporelles)")
+    logger.info(f"   Lignes échantillonnées: {preview['sampled_rows']:,}")
+    logger.info(f"   Lignes estimées: ~{preview['estimated_rows']:,}")
+    logger.info(f"   Colonnes: {len(preview['columns']):,}")
+    logger.info(f"   Période: {preview['period_start']} → {preview['period_end']}")
+    
+    logger.info("\n" + "=" * 80)
+    logger.info(f"2. VALEURS MANQUANTES ESTIMÉES (Top 10 colonnes, {level})")
+    logger.info("=" * 80)
+    missing = preview['missing'].sort_values('estimate', ascending=False)
+    for col, row in missing.head(10).iterrows():
+        logger.info(f"   {col[:50]:50s} : {row['estimate']:5.1f}% "
+                    f"[{row['low']:5.1f} – {row['high']:5.1f}]")
+    
+    logger.info("\n" + "=" * 80)
+    logger.info(f"3. PRIX DAY-AHEAD ESTIMÉS ({level})")
+    logger.info("=" * 80)
+    for country in focus_countries:
+        for col, stats in preview['price_stats'].get(country, {}).items():
+            logger.info(f"\n   {col}:")
+            if stats is None:
+                logger.info("      ⚠️  Aucune donnée non-nulle dans l'échantillon")
+                continue
+            mean, low, high = stats['mean']
+            logger.info(f"      Fourchette observée: {stats['min']:.2f} → {stats['max']:.2f} EUR/MWh")
+            logger.info(f"      Médiane (échantillon): {stats['median']:.2f} EUR/MWh")
+            logger.info(f"      Moyenne: {mean:.2f} EUR/MWh [{low:.2f} – {high:.2f}]")
+            share, low, high = stats['negative_pct']
+            logger.info(f"      Prix négatifs: {share:.2f}% [{low:.2f} – {high:.2f}]")
+    
+    logger.info("\n" + "=" * 80)
+    logger.info("APERÇU TERMINÉ")
+    logger.info("=" * 80)
+    logger.info("\n   Valeurs exactes: python scripts/02_initial_exploration.py (sans --preview)\n")
+    return preview
+
+
 def main():
     """Fonction principale."""
+    parser = argparse.ArgumentParser(description="Exploration initiale du dataset OPSD")
+    parser.add_argument('--preview', action='store_true',
+                        help="Aperçu rapide estimé sur un échantillon (intervalles de confiance)")
+    args = parser.parse_args()
+    
     data_file = "data/raw/opsd_timeseries/time_series_60min_singleindex.csv"
     
     if not os.path.exists(data_file):
@@ -209,7 +271,10 @@ def main():
         logger.error("   Veuillez d'abord exécuter: python scripts/01_download_opsd_data.py")
         sys.exit(1)
     
-    explore_dataset(data_file)
+    if args.preview:
+        preview_dataset(data_file, config=load_config())
+    else:
+        explore_dataset(data_file, config=load_config())
 
 
 if __name__ == "__main__":
@@ -9,14 +9,19 @@ Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
 Date: Février 2026
 """
 
-import pandas as pd
-import numpy as np
 import json
 import sys
 import logging
 from pathlib import Path
 from datetime import timedelta
 
+from dataset_profile import profile_dataset, write_exploration_report
+from fill_engine import fill_settings
+from opsd_store import load_config
+from outlier_flags import FLAG_NAMES, outlier_settings
+from run_profile import RunProfile
+from temporal_integrity import integrity_dir, write_integrity_index
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,14 +29,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Libellés des rôles de colonnes dans les recommandations
+ROLE_LABELS = {"price": "prix", "generation": "génération", "load": "charge"}
+
 
-def analyze_data_quality(file_path, focus_countries=['DE', 'DK', 'FR']):
+def analyze_data_quality(file_path, focus_countries=['DE', 'DK', 'FR'], config=None,
+                         streaming=False, chunksize=100_000, profile=None,
+                         exploration_report=False):
     """
     Analyse complète de la qualité des données OPSD.
     
     Args:
         file_path: Chemin vers le fichier CSV OPSD
         focus_countries: Liste des codes pays prioritaires
+        config: Configuration du pipeline (magasin colonnaire)
+        streaming: Analyse par blocs en mémoire constante
+        chunksize: Nombre de lignes par bloc en mode streaming
+        profile: Profil déjà calculé avec les valeurs aberrantes
+            (profile_dataset(..., outliers=outlier_settings(config))),
+            sinon calculé ici
+        exploration_report: Écrire aussi reports/initial_exploration.txt
+            depuis le même profil (une seule lecture du dataset)
     """
     
     logger.info("=" * 80)
@@ -39,10 +57,16 @@ def analyze_data_quality(file_path, focus_countries=['DE', 'DK', 'FR']):
     logger.info("=" * 80)
     
     # Charger les données
-    logger.info("\n⏳ Chargement des données...")
+    run_profile = RunProfile("03_data_quality_analysis")
+    run_profile.section("CHARGEMENT ET PROFILAGE DES DONNÉES")
+    outlier_config = outlier_settings(config)
     try:
-        df = pd.read_csv(file_path, parse_dates=[0], low_memory=False)
-        logger.info(f"✅ {len(df):,} lignes × {len(df.columns):,} colonnes chargées")
+        if profile is None:
+            # Valeurs aberrantes comptées pendant la même lecture que le profil
+            profile = profile_dataset(file_path, focus_countries, config, streaming, chunksize,
+                                      outliers=outlier_config)
+        logger.info(f"✅ {profile['rows']:,} lignes × {len(profile['columns']):,} colonnes analysées")
+        run_profile.processed(profile['rows'], len(profile['columns']))
     except Exception as e:
         logger.error(f"❌ Erreur: {e}")
         sys.exit(1)
@@ -57,22 +81,21 @@ def analyze_data_quality(file_path, focus_countries=['DE', 'DK', 'FR']):
         "recommendations": []
     }
     
-    time_col = df.columns[0]
-    
     # ========================================================================
     # 1. VUE D'ENSEMBLE
     # ========================================================================
+    run_profile.section("1. VUE D'ENSEMBLE")
     logger.info("\n" + "=" * 80)
     logger.info("1. VUE D'ENSEMBLE")
     logger.info("=" * 80)
     
     quality_report["overview"] = {
-        "rows": len(df),
-        "columns": len(df.columns),
-        "period_start": str(df[time_col].min()),
-        "period_end": str(df[time_col].max()),
-        "duration_days": (df[time_col].max() - df[time_col].min()).days,
-        "memory_mb": round(df.memory_usage(deep=True).sum() / (1024**2), 2)
+        "rows": profile["rows"],
+        "columns": len(profile["columns"]),
+        "period_start": str(profile["period_start"]),
+        "period_end": str(profile["period_end"]),
+        "duration_days": (profile["period_end"] - profile["period_start"]).days,
+        "memory_mb": profile["memory_mb"]
     }
     
     logger.info(f"   Lignes: {quality_report['overview']['rows']:,}")
@@ -83,15 +106,17 @@ def analyze_data_quality(file_path, focus_countries=['DE', 'DK', 'FR']):
     # ========================================================================
     # 2. ANALYSE DES VALEURS MANQUANTES
     # ========================================================================
+    run_profile.section("2. ANALYSE DES VALEURS MANQUANTES")
     logger.info("\n" + "=" * 80)
     logger.info("2. ANALYSE DES VALEURS MANQUANTES")
     logger.info("=" * 80)
     
-    missing = df.isnull().sum()
-    missing_pct = (missing / len(df) * 100)
+    n_rows = profile["rows"]
+    missing = profile["missing"]
+    missing_pct = (missing / n_rows * 100)
     
     # Statistiques globales
-    total_cells = len(df) * len(df.columns)
+    total_cells = n_rows * len(profile["columns"])
     missing_cells = missing.sum()
     missing_pct_global = (missing_cells / total_cells) * 100
     
@@ -138,79 +163,97 @@ def analyze_data_quality(file_path, focus_countries=['DE', 'DK', 'FR']):
     # ========================================================================
     # 3. ANALYSE TEMPORELLE
     # ========================================================================
+    run_profile.section("3. COHÉRENCE TEMPORELLE")
     logger.info("\n" + "=" * 80)
     logger.info("3. COHÉRENCE TEMPORELLE")
     logger.info("=" * 80)
     
     # Vérifier les gaps temporels
-    df_sorted = df.sort_values(time_col)
-    time_diffs = df_sorted[time_col].diff()
     expected_diff = timedelta(hours=1)
-    
-    gaps = time_diffs[time_diffs > expected_diff]
+    gaps_count = profile["gaps_count"]
     
     logger.info(f"\n   Fréquence attendue: {expected_diff}")
-    logger.info(f"   Nombre de gaps détectés: {len(gaps)}")
+    logger.info(f"   Nombre de gaps détectés: {gaps_count}")
     
     quality_report["temporal_analysis"]["expected_frequency"] = "1 hour"
-    quality_report["temporal_analysis"]["gaps_count"] = len(gaps)
+    quality_report["temporal_analysis"]["gaps_count"] = gaps_count
     
-    if len(gaps) > 0:
-        logger.info(f"   Gap maximum: {gaps.max()}")
+    if gaps_count > 0:
+        logger.info(f"   Gap maximum: {profile['max_gap']}")
         logger.info(f"\n   Premiers 5 gaps:")
-        for idx, gap in gaps.head().items():
-            timestamp = df_sorted.loc[idx, time_col]
+        for timestamp, gap in profile["first_gaps"]:
             logger.info(f"      {timestamp}: gap de {gap}")
         
-        quality_report["temporal_analysis"]["max_gap"] = str(gaps.max())
+        quality_report["temporal_analysis"]["max_gap"] = str(profile["max_gap"])
     else:
         logger.info("   ✅ Aucun gap temporel détecté")
     
     # Vérifier les doublons temporels
-    duplicates = df[time_col].duplicated().sum()
+    duplicates = profile["duplicates"]
     logger.info(f"\n   Timestamps dupliqués: {duplicates}")
     quality_report["temporal_analysis"]["duplicate_timestamps"] = int(duplicates)
     
+    # Index d'intégrité: heures manquantes, anomalies DST, plages manquantes par colonne
+    runs = profile["timestamp_runs"]
+    missing_runs = profile["missing_runs"]
+    dst_anomalies = int(runs["gaps"]["dst"].sum() + runs["duplicates"]["dst"].sum())
+    quality_report["temporal_analysis"]["missing_hours"] = int(runs["gaps"]["missing_steps"].sum())
+    quality_report["temporal_analysis"]["dst_anomalies"] = dst_anomalies
+    quality_report["temporal_analysis"]["out_of_order"] = runs["out_of_order"]
+    logger.info(f"   Heures manquantes (gaps): {quality_report['temporal_analysis']['missing_hours']:,}")
+    logger.info(f"   Anomalies DST (gaps/doublons au changement d'heure): {dst_anomalies}")
+    if runs["out_of_order"]:
+        logger.warning(f"   ⚠️  {runs['out_of_order']} timestamps hors ordre")
+    
+    if len(missing_runs) > 0:
+        longest = missing_runs.loc[missing_runs["length"].idxmax()]
+        quality_report["temporal_analysis"]["missing_runs"] = {
+            "count": len(missing_runs),
+            "columns_affected": int(missing_runs["column"].nunique()),
+            "longest": {
+                "column": str(longest["column"]),
+                "start": str(longest["start"]),
+                "end": str(longest["end"]),
+                "length_hours": int(longest["length"]),
+            },
+        }
+        logger.info(f"   Plages de valeurs manquantes: {len(missing_runs):,} "
+                    f"sur {missing_runs['column'].nunique()} colonnes")
+        logger.info(f"   Plus longue: {longest['column']} ({int(longest['length']):,} h, "
+                    f"{longest['start']} → {longest['end']})")
+    
+    index_dir = write_integrity_index(runs, missing_runs, profile["rows"], file_path,
+                                      integrity_dir(config))
+    quality_report["temporal_analysis"]["integrity_index"] = str(index_dir)
+    logger.info(f"   ✅ Index d'intégrité sauvegardé: {index_dir}")
+    
     # ========================================================================
     # 4. ANALYSE DES PRIX (Focus pays prioritaires)
     # ========================================================================
+    run_profile.section("4. ANALYSE DES PRIX DAY-AHEAD")
     logger.info("\n" + "=" * 80)
     logger.info("4. ANALYSE DES PRIX DAY-AHEAD")
     logger.info("=" * 80)
     
-    price_cols = [col for col in df.columns if 'price' in col.lower() and 'day_ahead' in col.lower()]
     quality_report["price_analysis"] = {}
     
     for country in focus_countries:
         logger.info(f"\n   Analyse pour {country}:")
-        country_price_cols = [col for col in price_cols if country in col]
+        country_stats = profile["price_stats"].get(country)
         
-        if not country_price_cols:
+        if not country_stats:
             logger.info(f"      ⚠️  Aucune colonne de prix trouvée")
             continue
         
         quality_report["price_analysis"][country] = {}
         
-        for col in country_price_cols:
+        for col, stats in country_stats.items():
             logger.info(f"\n      {col}:")
             
-            # Statistiques de base
-            col_data = df[col].dropna()
-            if len(col_data) == 0:
+            if stats is None:
                 logger.info(f"         ⚠️  Aucune donnée non-nulle")
                 continue
             
-            stats = {
-                "count": int(len(col_data)),
-                "missing": int(df[col].isnull().sum()),
-                "missing_pct": round((df[col].isnull().sum() / len(df)) * 100, 2),
-                "min": round(col_data.min(), 2),
-                "max": round(col_data.max(), 2),
-                "mean": round(col_data.mean(), 2),
-                "median": round(col_data.median(), 2),
-                "std": round(col_data.std(), 2)
-            }
-            
             logger.info(f"         Observations: {stats['count']:,}")
             logger.info(f"         Manquantes: {stats['missing']:,} ({stats['missing_pct']:.1f}%)")
             logger.info(f"         Min: {stats['min']:.2f} EUR/MWh")
@@ -220,37 +263,57 @@ def analyze_data_quality(file_path, focus_countries=['DE', 'DK', 'FR']):
             logger.info(f"         Écart-type: {stats['std']:.2f} EUR/MWh")
             
             # Prix négatifs
-            negative_count = (col_data < 0).sum()
-            negative_pct = (negative_count / len(col_data)) * 100
-            
-            stats["negative_count"] = int(negative_count)
-            stats["negative_pct"] = round(negative_pct, 2)
-            
-            logger.info(f"         Prix négatifs: {negative_count:,} ({negative_pct:.2f}%)")
-            
-            if negative_count > 0:
-                logger.info(f"         Prix négatif minimum: {col_data[col_data < 0].min():.2f} EUR/MWh")
-                stats["most_negative"] = round(col_data[col_data < 0].min(), 2)
+            logger.info(f"         Prix négatifs: {stats['negative_count']:,} ({stats['negative_pct']:.2f}%)")
+            if stats["negative_count"] > 0:
+                logger.info(f"         Prix négatif minimum: {stats['most_negative']:.2f} EUR/MWh")
             
             # Outliers extrêmes (> 3 écart-types)
-            mean = col_data.mean()
-            std = col_data.std()
-            outliers_high = col_data[col_data > mean + 3*std]
-            outliers_low = col_data[col_data < mean - 3*std]
-            
-            stats["outliers_high_count"] = int(len(outliers_high))
-            stats["outliers_low_count"] = int(len(outliers_low))
-            
-            logger.info(f"         Outliers supérieurs (>μ+3σ): {len(outliers_high)}")
-            logger.info(f"         Outliers inférieurs (<μ-3σ): {len(outliers_low)}")
+            logger.info(f"         Outliers supérieurs (>μ+3σ): {stats['outliers_high_count']}")
+            logger.info(f"         Outliers inférieurs (<μ-3σ): {stats['outliers_low_count']}")
             
             quality_report["price_analysis"][country][col] = stats
     
     # ========================================================================
-    # 5. RECOMMANDATIONS
+    # 5. VALEURS ABERRANTES (STATISTIQUES ROBUSTES)
     # ========================================================================
+    run_profile.section("5. VALEURS ABERRANTES")
     logger.info("\n" + "=" * 80)
-    logger.info("5. RECOMMANDATIONS")
+    logger.info("5. VALEURS ABERRANTES (STATISTIQUES ROBUSTES)")
+    logger.info("=" * 80)
+    
+    # Colonnes prix/charge/génération des pays focus, comptées par le profil
+    outlier_cols = profile["outlier_columns"]
+    flag_summary = profile["outlier_flags"]
+    flag_totals = {name: sum(counts[name] for counts in flag_summary.values()) for name in FLAG_NAMES}
+    
+    logger.info(f"   Colonnes analysées: {len(outlier_cols)} (prix, charge, génération)")
+    logger.info(f"   z robuste (médiane/MAD glissants sur {outlier_config['outlier_window_hours']} h "
+                f"et par heure du jour): seuil |z| > {outlier_config['outlier_z_threshold']}")
+    logger.info(f"      Marquées (fenêtre glissante): {flag_totals['rolling']:,}")
+    logger.info(f"      Marquées (heure du jour): {flag_totals['hourly']:,}")
+    logger.info(f"   Prix < {outlier_config['price_outlier_threshold']} EUR/MWh: {flag_totals['price_floor']:,}")
+    if outlier_config["generation_negative_check"]:
+        logger.info(f"   Générations négatives: {flag_totals['negative_generation']:,}")
+    top_flagged = sorted(flag_summary.items(), key=lambda item: -sum(item[1].values()))[:10]
+    if top_flagged:
+        logger.info(f"\n   Colonnes les plus marquées:")
+        for col, counts in top_flagged:
+            details = ", ".join(f"{name}={count:,}" for name, count in counts.items() if count)
+            logger.info(f"      {col[:60]:60s}: {details}")
+    
+    quality_report["outliers"] = {
+        "settings": outlier_config,
+        "flags": FLAG_NAMES,
+        "totals": flag_totals,
+        "columns": flag_summary,
+    }
+    
+    # ========================================================================
+    # 6. RECOMMANDATIONS
+    # ========================================================================
+    run_profile.section("6. RECOMMANDATIONS")
+    logger.info("\n" + "=" * 80)
+    logger.info("6. RECOMMANDATIONS")
     logger.info("=" * 80)
     
     recommendations = []
@@ -267,8 +330,20 @@ def analyze_data_quality(file_path, focus_countries=['DE', 'DK', 'FR']):
         logger.info(f"   • {rec}")
     
     # Recommandations sur les gaps temporels
-    if len(gaps) > 0:
-        rec = f"Investiguer et documenter les {len(gaps)} gaps temporels détectés"
+    if gaps_count > 0:
+        rec = f"Investiguer et documenter les {gaps_count} gaps temporels détectés"
+        recommendations.append(rec)
+        logger.info(f"   • {rec}")
+    
+    # Recommandations sur les valeurs aberrantes
+    if flag_totals["price_floor"] > 0:
+        rec = (f"Vérifier {flag_totals['price_floor']} prix inférieurs à "
+               f"{outlier_config['price_outlier_threshold']} EUR/MWh")
+        recommendations.append(rec)
+        logger.info(f"   • {rec}")
+    
+    if flag_totals["negative_generation"] > 0:
+        rec = f"Masquer {flag_totals['negative_generation']} valeurs de génération négatives"
         recommendations.append(rec)
         logger.info(f"   • {rec}")
     
@@ -277,17 +352,31 @@ def analyze_data_quality(file_path, focus_countries=['DE', 'DK', 'FR']):
     recommendations.append(rec)
     logger.info(f"   • {rec}")
     
-    rec = "Utiliser forward fill pour les séries temporelles de prix et génération"
-    recommendations.append(rec)
-    logger.info(f"   • {rec}")
+    # Stratégie de remplissage: celle que le nettoyage appliquera (fill_engine)
+    fill = fill_settings(config or {})
+    by_strategy = {}
+    for role, strategy in fill["strategies"].items():
+        by_strategy.setdefault(strategy, []).append(ROLE_LABELS.get(role, role))
+    for strategy, roles in by_strategy.items():
+        series = " et ".join([", ".join(roles[:-1]), roles[-1]] if len(roles) > 1 else roles)
+        if strategy == "forward_fill":
+            rec = (f"Forward fill borné à {fill['limit_hours']} h pour les séries de {series} "
+                   f"(au-delà, les NaN sont conservés)")
+        elif strategy == "keep_nan":
+            rec = f"Conserver les NaN des séries de {series} (absence de marché ou de mesure)"
+        else:
+            rec = f"Stratégie '{strategy}' pour les séries de {series}"
+        recommendations.append(rec)
+        logger.info(f"   • {rec}")
     
     quality_report["recommendations"] = recommendations
     
     # ========================================================================
-    # 6. SAUVEGARDE DU RAPPORT
+    # 7. SAUVEGARDE DU RAPPORT
     # ========================================================================
+    run_profile.section("7. SAUVEGARDE DU RAPPORT")
     logger.info("\n" + "=" * 80)
-    logger.info("6. SAUVEGARDE DU RAPPORT")
+    logger.info("7. SAUVEGARDE DU RAPPORT")
     logger.info("=" * 80)
     
     output_dir = Path("reports")
@@ -300,6 +389,12 @@ def analyze_data_quality(file_path, focus_countries=['DE', 'DK', 'FR']):
     
     logger.info(f"   ✅ Rapport JSON sauvegardé: {json_file}")
     
+    # Rapport d'exploration issu du même profil: le script 02 n'a pas à relire le dataset
+    if exploration_report:
+        report_file = write_exploration_report(profile)
+        logger.info(f"   ✅ Rapport d'exploration sauvegardé: {report_file}")
+    run_profile.save()
+    
     logger.info("\n" + "=" * 80)
     logger.info("ANALYSE DE QUALITÉ TERMINÉE")
     logger.info("=" * 80)
@@ -320,7 +415,16 @@ def main():
         logger.error("   Veuillez d'abord exécuter: python scripts/01_download_opsd_data.py")
         sys.exit(1)
     
-    analyze_data_quality(data_file)
+    config = load_config()
+    quality_config = config.get('data_quality', {})
+    analyze_data_quality(
+        data_file,
+        config['focus_countries'],
+        config=config,
+        streaming=quality_config.get('streaming', False),
+        chunksize=quality_config.get('streaming_chunksize', 100_000),
+        exploration_report=quality_config.get('exploration_report', True)
+    )
 
 
 if __name__ == "__main__":
@@ -12,10 +12,28 @@ Date: Février 2026
 import pandas as pd
 import numpy as np
 import yaml
+import os
 import sys
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from incremental import (config_signature, manifest_is_usable, read_appended_rows,
+                         read_manifest, snapshot_source, write_manifest)
+from aggregate_cubes import cubes_dir, update_cubes, write_cubes
+from calendar_features import add_calendar_features, calendar_settings
+from column_schema import schema_for
+from dtype_plan import optimize_dtypes
+from fill_engine import fill_plan, fill_settings, forward_fill, missing_runs_of
+from opsd_store import load_timeseries, read_columns
+from out_of_core import BlockCleaner, null_count_pass, out_of_core_settings
+from outlier_flags import outlier_flags_path, update_outlier_flags, write_outlier_flags
+from price_episodes import episodes_path, update_episode_index, write_episode_index
+from processed_data import (append_processed, open_processed, processed_settings,
+                            write_processed, write_processed_blocks)
+from run_profile import RunProfile
+from temporal_integrity import integrity_dir, missing_counts, read_missing_runs, timestamps_ns
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -30,6 +48,294 @@ def load_config(config_path='config/pipeline_config.yaml'):
         return yaml.safe_load(f)
 
 
+def clean_country_block(block, threshold, ts_ns, runs, settings):
+    """
+    Étapes 2 et 3 du nettoyage pour les colonnes d'un seul pays.
+    
+    Fonction de niveau module pour pouvoir être exécutée dans un processus
+    séparé: les pays sont indépendants (sélection, seuil, remplissage),
+    seuls les timestamps sont partagés.
+    
+    Args:
+        block: DataFrame des colonnes du pays (sans colonne temporelle)
+        threshold: Seuil de suppression des colonnes incomplètes
+        ts_ns: Timestamps des lignes (int64, ns UTC)
+        runs: Plages de valeurs manquantes des colonnes (index d'intégrité),
+            ou None pour les extraire du bloc
+        settings: Stratégies de remplissage (fill_settings)
+    
+    Returns:
+        dict: Bloc nettoyé, colonnes supprimées et compteurs de remplissage
+    """
+    columns = list(block.columns)
+    values = block.to_numpy(dtype='float64')
+    if runs is None:
+        runs = missing_runs_of(values, columns)
+    
+    # Comptes de valeurs manquantes déduits des plages (aucun rescan)
+    missing = missing_counts(runs, columns)
+    missing_pct = missing / len(block)
+    dropped = missing_pct[missing_pct >= threshold]
+    kept = [col for col in columns if col not in dropped.index]
+    if len(dropped):
+        values = values[:, [columns.index(col) for col in kept]]
+    
+    # Forward fill borné, en place, uniquement pour les classes concernées
+    plan = fill_plan(kept, settings)
+    fill_cols = plan["forward_fill"]
+    result = forward_fill(values, kept, ts_ns, runs[runs["column"].isin(fill_cols)],
+                          settings["limit_hours"])
+    filled = dict(zip(kept, result["filled"].tolist()))
+    
+    fill_positions = [kept.index(col) for col in fill_cols]
+    return {
+        "data": pd.DataFrame(values, columns=kept, index=block.index),
+        "fill_columns": fill_cols,
+        "dropped": dropped.to_dict(),
+        "n_price": len(plan["price"]),
+        "n_gen": len(plan["generation"]),
+        "n_load": len(plan["load"]),
+        "filled": {col: filled[col] for col in fill_cols},
+        "price_missing": int(missing[plan["price"]].sum()),
+        "remaining_missing": {col: int(missing[col] - filled[col]) for col in kept},
+        "last_values": dict(zip(fill_cols, result["last_values"][fill_positions].tolist())),
+        "last_timestamps": dict(zip(fill_cols, result["last_ts"][fill_positions].tolist())),
+    }
+
+
+def _timestamps_state(columns, last_ts):
+    """Timestamps des dernières observations pour le filigrane (None si jamais observée)."""
+    return {col: (int(ts) if ts >= 0 else None) for col, ts in zip(columns, last_ts)}
+
+
+def clean_increment(input_file, manifest, output_file, config):
+    """
+    Nettoyage incrémental: traite uniquement les lignes ajoutées au CSV
+    source depuis le dernier filigrane et les ajoute au fichier nettoyé.
+    
+    Les colonnes retenues sont celles du dernier traitement complet; le
+    forward fill borné reprend à partir de la dernière observation de
+    chaque colonne (valeur et timestamp).
+    
+    Args:
+        input_file: Chemin vers le fichier CSV brut
+        manifest: Filigrane du dernier traitement
+        output_file: Fichier nettoyé (Arrow) à compléter
+        config: Configuration du pipeline (plan de types, export CSV)
+    
+    Returns:
+        pd.DataFrame | None: Nouvelles lignes nettoyées, ou None si
+        l'historique a changé (traitement complet requis)
+    """
+    logger.info("\n" + "=" * 80)
+    logger.info("NETTOYAGE INCRÉMENTAL")
+    logger.info("=" * 80)
+    logger.info(f"   Dernier timestamp traité: {manifest['watermark']}")
+    
+    new_rows, snapshot = read_appended_rows(input_file, manifest)
+    if new_rows is None:
+        return None
+    if new_rows.empty:
+        logger.info("   ✅ Aucune nouvelle ligne: données nettoyées déjà à jour")
+        return new_rows
+    logger.info(f"   {len(new_rows):,} nouvelles lignes à traiter")
+    
+    # Forward fill borné à travers la frontière: l'état initial est la
+    # dernière observation de chaque colonne lors du traitement précédent
+    fill_cols = manifest["fill_columns"]
+    initial_values = np.array([manifest["last_values"][col] for col in fill_cols], dtype='float64')
+    initial_ts = np.array([manifest["last_timestamps"][col] for col in fill_cols], dtype='float64')
+    block = new_rows[fill_cols].to_numpy(dtype='float64')
+    result = forward_fill(block, fill_cols, timestamps_ns(new_rows[new_rows.columns[0]]),
+                          missing_runs_of(block, fill_cols), fill_settings(config)["limit_hours"],
+                          initial_values, np.nan_to_num(initial_ts, nan=-1).astype('int64'))
+    new_rows[fill_cols] = block
+    logger.info(f"   {int(result['filled'].sum()):,} valeurs remplies par forward fill")
+    
+    # Variables temporelles uniquement pour les nouvelles lignes
+    time_col = new_rows.columns[0]
+    if time_col != 'timestamp':
+        new_rows = new_rows.rename(columns={time_col: 'timestamp'})
+    add_calendar_features(new_rows, 'timestamp', config)
+    new_rows = new_rows[manifest["output_columns"]]
+    watermark = str(new_rows['timestamp'].max())
+    
+    # Même plan de types que le traitement complet
+    new_rows, _ = optimize_dtypes(new_rows, config)
+    append_processed(new_rows, output_file)
+    logger.info(f"   ✅ {len(new_rows):,} lignes ajoutées à {output_file}")
+    
+    csv_file = Path(output_file).with_suffix('.csv')
+    if processed_settings(config)["csv_export"] and csv_file.exists():
+        new_rows.to_csv(csv_file, mode='a', header=False,
+                        index=isinstance(new_rows.index, pd.DatetimeIndex))
+        logger.info(f"   ✅ {len(new_rows):,} lignes ajoutées à l'export {csv_file}")
+    
+    # Index des épisodes complété: seuls les épisodes ouverts au filigrane sont recalculés
+    episodes = update_episode_index(output_file, episodes_path(config), manifest["watermark"])
+    logger.info(f"   ✅ Index des épisodes de prix négatifs: {len(episodes):,} épisodes")
+    update_cubes(output_file, cubes_dir(config), manifest["watermark"])
+    logger.info("   ✅ Cubes d'agrégats complétés avec les nouvelles lignes")
+    # Fenêtre glissante recalculée seulement là où elle atteint les nouvelles lignes;
+    # statistiques par heure du jour et FLAG_HOURLY remis à jour sur toute la période
+    patched = update_outlier_flags(output_file, outlier_flags_path(config), config)
+    logger.info(f"   ✅ Drapeaux de valeurs aberrantes mis à jour ({patched:,} lignes recalculées, "
+                f"statistiques par heure rafraîchies)")
+    
+    manifest.update({
+        "source": snapshot,
+        "watermark": watermark,
+        "rows": manifest["rows"] + len(new_rows),
+        "last_values": dict(zip(fill_cols, result["last_values"].tolist())),
+        "last_timestamps": _timestamps_state(fill_cols, result["last_ts"]),
+    })
+    write_manifest(manifest)
+    return new_rows
+
+
+def clean_out_of_core(input_file, config, run_profile, source_snapshot):
+    """
+    Nettoyage hors mémoire: mêmes étapes que le traitement complet, sur des
+    blocs de lignes de taille bornée (section `cleaning.block_rows`).
+    
+    Une première passe compte les valeurs manquantes pour décider des
+    colonnes supprimées; la seconde remplit, enrichit et écrit chaque bloc.
+    
+    Args:
+        input_file: Chemin vers le fichier CSV brut
+        config: Configuration du pipeline
+        run_profile: Profil d'exécution du script
+        source_snapshot: Instantané de la source (filigrane)
+    
+    Returns:
+        Path: Fichier nettoyé (Arrow)
+    """
+    block_rows = out_of_core_settings(config)["block_rows"]
+    output_settings = processed_settings(config)
+    output_file = Path(output_settings["path"])
+    
+    run_profile.section("LECTURE DE L'EN-TÊTE")
+    header = read_columns(input_file, config=config)
+    time_col = header[0]
+    logger.info(f"\n   Mode hors mémoire: blocs de {block_rows:,} lignes")
+    logger.info(f"   En-tête: {len(header):,} colonnes disponibles")
+    
+    # ========================================================================
+    # 1. FOCUS SUR LES PAYS PRIORITAIRES
+    # ========================================================================
+    run_profile.section("1. SÉLECTION DES COLONNES POUR PAYS FOCUS")
+    logger.info("\n" + "=" * 80)
+    logger.info("1. SÉLECTION DES COLONNES POUR PAYS FOCUS")
+    logger.info("=" * 80)
+    
+    focus_countries = config['focus_countries']
+    schema = schema_for(header)
+    value_cols = [col for country in focus_countries for col in schema.columns_for(country)]
+    logger.info(f"   Pays focus: {', '.join(focus_countries)}")
+    logger.info(f"   Total colonnes sélectionnées: {len(value_cols) + 1}")
+    
+    # ========================================================================
+    # 2. SUPPRESSION DES COLONNES TRÈS INCOMPLÈTES (première passe)
+    # ========================================================================
+    run_profile.section("2. SUPPRESSION DES COLONNES TRÈS INCOMPLÈTES")
+    logger.info("\n" + "=" * 80)
+    logger.info("2. SUPPRESSION DES COLONNES TRÈS INCOMPLÈTES")
+    logger.info("=" * 80)
+    
+    threshold = config['missing_values_strategy']['threshold_drop']
+    logger.info(f"   Seuil: ≥{threshold*100:.0f}% de valeurs manquantes")
+    logger.info("   ⏳ Comptage des valeurs manquantes (première passe)...")
+    initial_rows, missing = null_count_pass(input_file, value_cols, block_rows, config)
+    run_profile.processed(initial_rows, len(value_cols) + 1)
+    missing_pct = missing / max(initial_rows, 1)
+    dropped = missing_pct[missing_pct >= threshold]
+    kept = [col for col in value_cols if col not in dropped.index]
+    logger.info(f"   Colonnes à supprimer: {len(dropped)}")
+    logger.info(f"   ✅ {len(kept) + 1} colonnes restantes")
+    
+    # ========================================================================
+    # 3. NETTOYAGE ET ÉCRITURE PAR BLOCS
+    # ========================================================================
+    run_profile.section("3. NETTOYAGE ET ÉCRITURE PAR BLOCS")
+    logger.info("\n" + "=" * 80)
+    logger.info("3. NETTOYAGE ET ÉCRITURE PAR BLOCS")
+    logger.info("=" * 80)
+    
+    cleaner = BlockCleaner(time_col, kept, fill_settings(config), config)
+    blocks = cleaner.blocks(input_file, block_rows)
+    if output_settings["csv_export"]:
+        blocks = _export_csv_blocks(blocks, output_file.with_suffix('.csv'))
+    rows = write_processed_blocks(blocks, output_file)
+    run_profile.processed(rows, len(cleaner.output_columns))
+    logger.info(f"   ✅ {int(cleaner.filled.sum()):,} valeurs remplies via forward fill borné")
+    logger.info(f"   ✅ Arrow sauvegardé: {output_file} ({rows:,} lignes)")
+    
+    # ========================================================================
+    # 6. RÉSUMÉ DU NETTOYAGE
+    # ========================================================================
+    run_profile.section("6. RÉSUMÉ DU NETTOYAGE")
+    logger.info("\n" + "=" * 80)
+    logger.info("6. RÉSUMÉ DU NETTOYAGE")
+    logger.info("=" * 80)
+    
+    final_cols = len(cleaner.output_columns)
+    final_missing = int(cleaner.remaining.sum())
+    logger.info(f"\n   Dimensions:")
+    logger.info(f"      Avant: {initial_rows:,} lignes × {len(header):,} colonnes")
+    logger.info(f"      Après: {rows:,} lignes × {final_cols:,} colonnes")
+    logger.info(f"\n   Valeurs manquantes:")
+    logger.info(f"      Total: {final_missing:,} ({final_missing / max(rows * final_cols, 1) * 100:.2f}%)")
+    
+    # ========================================================================
+    # 8. SAUVEGARDE DES DONNÉES NETTOYÉES
+    # ========================================================================
+    run_profile.section("8. SAUVEGARDE DES DONNÉES NETTOYÉES")
+    logger.info("\n" + "=" * 80)
+    logger.info("8. SAUVEGARDE DES DONNÉES NETTOYÉES")
+    logger.info("=" * 80)
+    
+    # Index et cubes calculés colonne par colonne depuis le fichier mappé
+    episodes = write_episode_index(output_file, episodes_path(config))
+    logger.info(f"   ✅ Index des épisodes de prix négatifs: {len(episodes):,} épisodes")
+    cubes = write_cubes(output_file, cubes_dir(config))
+    logger.info(f"   ✅ Cubes d'agrégats: {cubes_dir(config)} ({', '.join(cubes)})")
+    flags = write_outlier_flags(output_file, outlier_flags_path(config), config)
+    logger.info(f"   ✅ Drapeaux de valeurs aberrantes: {outlier_flags_path(config)} "
+                f"({int((flags.to_numpy() != 0).sum()):,} valeurs marquées)")
+    
+    # Échantillon tiré directement du fichier mappé (seules ces lignes sont lues)
+    sample_file = output_file.parent / "opsd_sample_1000.csv"
+    rng = np.random.default_rng()
+    with open_processed(output_file) as data:
+        sample = data.take(rng.choice(len(data), min(1000, len(data)), replace=False))
+    sample.to_csv(sample_file, index=isinstance(sample.index, pd.DatetimeIndex))
+    logger.info(f"   ✅ Échantillon sauvegardé: {sample_file}")
+    
+    fill_cols = cleaner.fill_columns
+    write_manifest({
+        "source": source_snapshot,
+        "config": config_signature(config),
+        "watermark": cleaner.watermark,
+        "rows": rows,
+        "raw_columns": [time_col] + kept,
+        "fill_columns": fill_cols,
+        "output_columns": cleaner.output_columns,
+        "last_values": dict(zip(fill_cols, cleaner.last_values.tolist())),
+        "last_timestamps": _timestamps_state(fill_cols, cleaner.last_ts),
+    })
+    logger.info("   ✅ Filigrane incrémental mis à jour")
+    run_profile.save()
+    return output_file
+
+
+def _export_csv_blocks(blocks, csv_file):
+    """Recopie chaque bloc nettoyé dans l'export CSV au passage."""
+    for i, block in enumerate(blocks):
+        block.to_csv(csv_file, mode='w' if i == 0 else 'a', header=(i == 0),
+                     index=isinstance(block.index, pd.DatetimeIndex))
+        yield block
+
+
 def clean_data(input_file, config):
     """
     Nettoie les données OPSD selon les recommandations de l'analyse de qualité.
@@ -37,24 +343,51 @@ def clean_data(input_file, config):
     Args:
         input_file: Chemin vers le fichier CSV brut
         config: Configuration du pipeline
+    
+    Returns:
+        pd.DataFrame | Path: Données nettoyées (nouvelles lignes en mode
+        incrémental), ou fichier nettoyé en mode hors mémoire
     """
     
     logger.info("=" * 80)
     logger.info("NETTOYAGE DES DONNÉES OPSD")
     logger.info("=" * 80)
     
-    # Charger les données
-    logger.info("\n⏳ Chargement des données brutes...")
-    df = pd.read_csv(input_file, parse_dates=[0], low_memory=False)
-    logger.info(f"✅ {len(df):,} lignes × {len(df.columns):,} colonnes chargées")
-    
-    time_col = df.columns[0]
-    initial_rows = len(df)
-    initial_cols = len(df.columns)
+    run_profile = RunProfile("04_data_cleaning")
+    output_settings = processed_settings(config)
+    output_file = Path(output_settings["path"])
+    output_dir = output_file.parent
+    
+    # Mode incrémental: ne traiter que les heures ajoutées depuis le dernier passage
+    if config.get('cleaning', {}).get('incremental', False):
+        manifest = read_manifest()
+        if manifest_is_usable(manifest, input_file, config, output_file):
+            run_profile.section("NETTOYAGE INCRÉMENTAL")
+            df_new = clean_increment(input_file, manifest, output_file, config)
+            if df_new is not None:
+                run_profile.processed(*df_new.shape)
+                run_profile.save()
+                return df_new
+    
+    # Instantané de la source avant lecture (filigrane du traitement complet)
+    source_snapshot = snapshot_source(input_file)
+    
+    # Mode hors mémoire: blocs de lignes bornés, écrits au fil de l'eau
+    if out_of_core_settings(config)["out_of_core"]:
+        return clean_out_of_core(input_file, config, run_profile, source_snapshot)
+    
+    # Lire uniquement l'en-tête: la sélection des colonnes est planifiée
+    # avant tout chargement, les colonnes hors focus ne sont jamais parsées
+    run_profile.section("LECTURE DE L'EN-TÊTE")
+    header = read_columns(input_file, config=config)
+    time_col = header[0]
+    initial_cols = len(header)
+    logger.info(f"\n   En-tête: {initial_cols:,} colonnes disponibles")
     
     # ========================================================================
     # 1. FOCUS SUR LES PAYS PRIORITAIRES
     # ========================================================================
+    run_profile.section("1. SÉLECTION DES COLONNES POUR PAYS FOCUS")
     logger.info("\n" + "=" * 80)
     logger.info("1. SÉLECTION DES COLONNES POUR PAYS FOCUS")
     logger.info("=" * 80)
@@ -63,24 +396,39 @@ def clean_data(input_file, config):
     logger.info(f"   Pays focus: {', '.join(focus_countries)}")
     
     # Garder la colonne temporelle + colonnes des pays focus
+    # (pays = premier segment du nom: IT_NORD_FR n'est pas une colonne FR)
+    schema = schema_for(header)
     selected_cols = [time_col]
+    columns_by_country = {}
     
     for country in focus_countries:
-        country_cols = [col for col in df.columns if country in col]
-        selected_cols.extend(country_cols)
-        logger.info(f"   {country}: {len(country_cols)} colonnes")
-    
-    # Supprimer les doublons (si une colonne est comptée plusieurs fois)
-    selected_cols = list(dict.fromkeys(selected_cols))
+        columns_by_country[country] = schema.columns_for(country)
+        logger.info(f"   {country}: {len(columns_by_country[country])} colonnes")
+        selected_cols.extend(columns_by_country[country])
     
     logger.info(f"\n   Total colonnes sélectionnées: {len(selected_cols)}")
-    df_focus = df[selected_cols].copy()
+    
+    # Charger uniquement les colonnes sélectionnées
+    logger.info("\n⏳ Chargement des colonnes sélectionnées...")
+    df_focus = load_timeseries(input_file, columns=selected_cols, config=config)
+    initial_rows = len(df_focus)
+    logger.info(f"✅ {initial_rows:,} lignes × {len(df_focus.columns):,} colonnes chargées")
+    run_profile.processed(*df_focus.shape)
+    ts_ns = timestamps_ns(df_focus[time_col])
+    
+    # Plages de valeurs manquantes: index d'intégrité de l'analyse qualité
+    # s'il correspond encore à la source, sinon extraites pays par pays
+    value_cols = selected_cols[1:]
+    missing_runs = read_missing_runs(input_file, value_cols, initial_rows, integrity_dir(config))
+    if missing_runs is not None:
+        logger.info("   Plages de valeurs manquantes lues depuis l'index d'intégrité")
     
     logger.info(f"   ✅ Réduction: {initial_cols} → {len(df_focus.columns)} colonnes")
     
     # ========================================================================
     # 2. SUPPRESSION DES COLONNES TRÈS INCOMPLÈTES
     # ========================================================================
+    run_profile.section("2. SUPPRESSION DES COLONNES TRÈS INCOMPLÈTES")
     logger.info("\n" + "=" * 80)
     logger.info("2. SUPPRESSION DES COLONNES TRÈS INCOMPLÈTES")
     logger.info("=" * 80)
@@ -88,60 +436,71 @@ def clean_data(input_file, config):
     threshold = config['missing_values_strategy']['threshold_drop']
     logger.info(f"   Seuil: ≥{threshold*100:.0f}% de valeurs manquantes")
     
-    missing_pct = (df_focus.isnull().sum() / len(df_focus))
-    cols_to_drop = missing_pct[missing_pct >= threshold].index.tolist()
+    # Traitement par pays, en parallèle si plusieurs processus sont configurés
+    n_workers = config.get('cleaning', {}).get('n_workers', 1) or os.cpu_count()
+    n_workers = min(n_workers, len(focus_countries))
+    blocks = [df_focus[columns_by_country[country]] for country in focus_countries]
+    runs_by_country = [
+        None if missing_runs is None
+        else missing_runs[missing_runs["column"].isin(columns_by_country[country])]
+        for country in focus_countries
+    ]
+    settings = fill_settings(config)
+    n_blocks = len(blocks)
+    
+    if n_workers > 1:
+        logger.info(f"   Exécution parallèle: {n_workers} processus pour {n_blocks} pays")
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            # map() conserve l'ordre des pays: fusion déterministe
+            results = list(executor.map(clean_country_block, blocks, [threshold] * n_blocks,
+                                        [ts_ns] * n_blocks, runs_by_country, [settings] * n_blocks))
+    else:
+        results = [clean_country_block(block, threshold, ts_ns, runs, settings)
+                   for block, runs in zip(blocks, runs_by_country)]
     
-    # Ne pas supprimer la colonne temporelle
-    if time_col in cols_to_drop:
-        cols_to_drop.remove(time_col)
+    dropped = {col: pct for result in results for col, pct in result["dropped"].items()}
+    cols_to_drop = list(dropped)
     
     logger.info(f"\n   Colonnes à supprimer ({len(cols_to_drop)}):")
     for col in cols_to_drop[:10]:  # Afficher les 10 premières
-        logger.info(f"      • {col} ({missing_pct[col]*100:.1f}% manquant)")
+        logger.info(f"      • {col} ({dropped[col]*100:.1f}% manquant)")
     if len(cols_to_drop) > 10:
         logger.info(f"      ... et {len(cols_to_drop) - 10} autres")
     
-    df_clean = df_focus.drop(columns=cols_to_drop)
+    df_clean = pd.concat([df_focus[[time_col]]] + [result["data"] for result in results], axis=1)
+    del df_focus, blocks
     logger.info(f"\n   ✅ {len(df_clean.columns)} colonnes restantes")
     
     # ========================================================================
     # 3. GESTION DES VALEURS MANQUANTES
     # ========================================================================
+    run_profile.section("3. GESTION DES VALEURS MANQUANTES", *df_clean.shape)
     logger.info("\n" + "=" * 80)
     logger.info("3. GESTION DES VALEURS MANQUANTES")
     logger.info("=" * 80)
     
-    # Identifier les types de colonnes
-    price_cols = [col for col in df_clean.columns if 'price' in col.lower()]
-    gen_cols = [col for col in df_clean.columns if any(x in col.lower() for x in ['solar', 'wind', 'generation'])]
-    load_cols = [col for col in df_clean.columns if 'load' in col.lower()]
-    
     logger.info(f"\n   Types de colonnes identifiées:")
-    logger.info(f"      Prix: {len(price_cols)}")
-    logger.info(f"      Génération: {len(gen_cols)}")
-    logger.info(f"      Charge: {len(load_cols)}")
-    
-    # Forward fill pour séries temporelles (prix, génération, charge)
-    logger.info(f"\n   Application de forward fill pour colonnes temporelles...")
-    timeseries_cols = price_cols + gen_cols + load_cols
-    
-    before_fill = df_clean[timeseries_cols].isnull().sum().sum()
-    df_clean[timeseries_cols] = df_clean[timeseries_cols].fillna(method='ffill')
-    after_fill = df_clean[timeseries_cols].isnull().sum().sum()
-    
-    filled = before_fill - after_fill
-    logger.info(f"   ✅ {filled:,} valeurs remplies via forward fill")
-    
-    # Pour les valeurs encore manquantes au début, utiliser backfill
-    if after_fill > 0:
-        logger.info(f"   Application de backward fill pour valeurs initiales...")
-        df_clean[timeseries_cols] = df_clean[timeseries_cols].fillna(method='bfill')
-        final_missing = df_clean[timeseries_cols].isnull().sum().sum()
-        logger.info(f"   ✅ {after_fill - final_missing:,} valeurs supplémentaires remplies")
+    logger.info(f"      Prix: {sum(result['n_price'] for result in results)}")
+    logger.info(f"      Génération: {sum(result['n_gen'] for result in results)}")
+    logger.info(f"      Charge: {sum(result['n_load'] for result in results)}")
+    
+    # Stratégie par classe de colonnes (missing_values_strategy)
+    strategies = settings["strategies"]
+    logger.info(f"\n   Stratégies:")
+    logger.info(f"      Prix: {strategies['price']}")
+    logger.info(f"      Génération: {strategies['generation']} (≤ {settings['limit_hours']} h)")
+    logger.info(f"      Charge: {strategies['load']} (≤ {settings['limit_hours']} h)")
+    
+    filled = sum(sum(result["filled"].values()) for result in results)
+    logger.info(f"   ✅ {filled:,} valeurs remplies via forward fill borné")
+    price_missing = sum(result["price_missing"] for result in results)
+    if price_missing > 0:
+        logger.info(f"   {price_missing:,} prix manquants conservés en NaN")
     
     # ========================================================================
     # 4. STANDARDISATION DES NOMS DE COLONNES
     # ========================================================================
+    run_profile.section("4. STANDARDISATION DES NOMS DE COLONNES")
     logger.info("\n" + "=" * 80)
     logger.info("4. STANDARDISATION DES NOMS DE COLONNES")
     logger.info("=" * 80)
@@ -162,6 +521,7 @@ def clean_data(input_file, config):
     # ========================================================================
     # 5. CRÉATION DE VARIABLES TEMPORELLES
     # ========================================================================
+    run_profile.section("5. CRÉATION DE VARIABLES TEMPORELLES")
     logger.info("\n" + "=" * 80)
     logger.info("5. CRÉATION DE VARIABLES TEMPORELLES")
     logger.info("=" * 80)
@@ -170,27 +530,31 @@ def clean_data(input_file, config):
     
     logger.info(f"   Extraction des variables temporelles depuis '{timestamp_col}'...")
     
-    df_clean['year'] = df_clean[timestamp_col].dt.year
-    df_clean['month'] = df_clean[timestamp_col].dt.month
-    df_clean['day'] = df_clean[timestamp_col].dt.day
-    df_clean['hour'] = df_clean[timestamp_col].dt.hour
-    df_clean['dayofweek'] = df_clean[timestamp_col].dt.dayofweek  # 0=Lundi, 6=Dimanche
-    df_clean['quarter'] = df_clean[timestamp_col].dt.quarter
-    df_clean['is_weekend'] = df_clean['dayofweek'].isin([5, 6]).astype(int)
+    # Une passe vectorisée sur les timestamps int64: UTC + heure locale par pays
+    n_before = len(df_clean.columns)
+    add_calendar_features(df_clean, timestamp_col, config)
     
-    logger.info(f"   ✅ 7 variables temporelles créées")
-    logger.info(f"      • year, month, day, hour, dayofweek, quarter, is_weekend")
+    logger.info(f"   ✅ {len(df_clean.columns) - n_before} variables temporelles créées")
+    logger.info(f"      • UTC: year, month, day, hour, dayofweek, quarter, is_weekend")
+    settings_calendar = calendar_settings(config)
+    if settings_calendar["local_time"]:
+        logger.info(f"      • Heure locale ({', '.join(focus_countries)}): "
+                    f"{', '.join(settings_calendar['local_fields'])}")
     
     # ========================================================================
     # 6. STATISTIQUES FINALES
     # ========================================================================
+    run_profile.section("6. RÉSUMÉ DU NETTOYAGE", *df_clean.shape)
     logger.info("\n" + "=" * 80)
     logger.info("6. RÉSUMÉ DU NETTOYAGE")
     logger.info("=" * 80)
     
     final_rows = len(df_clean)
     final_cols = len(df_clean.columns)
-    final_missing = df_clean.isnull().sum().sum()
+    # Comptes issus du moteur de remplissage (aucun rescan du DataFrame)
+    still_missing = pd.Series({col: count for result in results
+                               for col, count in result["remaining_missing"].items()}, dtype='int64')
+    final_missing = int(still_missing.sum())
     final_missing_pct = (final_missing / (final_rows * final_cols)) * 100
     
     logger.info(f"\n   Dimensions:")
@@ -201,7 +565,6 @@ def clean_data(input_file, config):
     logger.info(f"      Total: {final_missing:,} ({final_missing_pct:.2f}%)")
     
     # Identifier les colonnes avec encore des valeurs manquantes
-    still_missing = df_clean.isnull().sum()
     cols_with_missing = still_missing[still_missing > 0]
     
     if len(cols_with_missing) > 0:
@@ -215,28 +578,87 @@ def clean_data(input_file, config):
         logger.info(f"\n   ✅ Aucune valeur manquante restante!")
     
     # ========================================================================
-    # 7. SAUVEGARDE DES DONNÉES NETTOYÉES
+    # 7. OPTIMISATION DES TYPES
     # ========================================================================
+    run_profile.section("7. OPTIMISATION DES TYPES")
     logger.info("\n" + "=" * 80)
-    logger.info("7. SAUVEGARDE DES DONNÉES NETTOYÉES")
+    logger.info("7. OPTIMISATION DES TYPES")
+    logger.info("=" * 80)
+    
+    # Informations du filigrane relevées avant l'indexation temporelle
+    watermark = str(df_clean[timestamp_col].max())
+    output_columns = list(df_clean.columns)
+    
+    df_clean, memory_report = optimize_dtypes(df_clean, config, timestamp_col)
+    timestamp_index = isinstance(df_clean.index, pd.DatetimeIndex)
+    
+    logger.info(f"   Mémoire avant: {memory_report['memory_mb_before']:.2f} Mo")
+    logger.info(f"   Mémoire après: {memory_report['memory_mb_after']:.2f} Mo")
+    logger.info(f"   ✅ Économie: {memory_report['saved_mb']:.2f} Mo ({memory_report['saved_pct']:.1f}%)")
+    for dtype, count in df_clean.dtypes.astype(str).value_counts().items():
+        logger.info(f"      {dtype}: {count} colonnes")
+    if timestamp_index:
+        logger.info(f"      Index: {df_clean.index.dtype}")
+    
+    # ========================================================================
+    # 8. SAUVEGARDE DES DONNÉES NETTOYÉES
+    # ========================================================================
+    run_profile.section("8. SAUVEGARDE DES DONNÉES NETTOYÉES")
+    logger.info("\n" + "=" * 80)
+    logger.info("8. SAUVEGARDE DES DONNÉES NETTOYÉES")
     logger.info("=" * 80)
     
-    output_dir = Path("data/processed")
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Sauvegarder en CSV
-    output_file = output_dir / "opsd_clean_focus_countries.csv"
-    df_clean.to_csv(output_file, index=False)
-    logger.info(f"   ✅ CSV sauvegardé: {output_file}")
+    # Format binaire colonnaire (Arrow IPC), lisible par memory-map
+    write_processed(df_clean, output_file)
+    logger.info(f"   ✅ Arrow sauvegardé: {output_file}")
     
     file_size = output_file.stat().st_size / (1024 * 1024)
     logger.info(f"   Taille: {file_size:.2f} Mo")
     
+    # Export CSV optionnel (outils externes)
+    if output_settings["csv_export"]:
+        csv_file = output_file.with_suffix('.csv')
+        df_clean.to_csv(csv_file, index=timestamp_index)
+        logger.info(f"   ✅ Export CSV sauvegardé: {csv_file}")
+    
+    # Index des épisodes de prix négatifs, à côté des données nettoyées
+    episodes_file = episodes_path(config)
+    episodes = write_episode_index(output_file, episodes_file)
+    logger.info(f"   ✅ Index des épisodes de prix négatifs: {episodes_file} ({len(episodes):,} épisodes)")
+    
+    # Cubes d'agrégats (calendrier, jour, mois, fenêtres glissantes) pour les tableaux de bord
+    cubes = write_cubes(output_file, cubes_dir(config))
+    logger.info(f"   ✅ Cubes d'agrégats: {cubes_dir(config)} ({', '.join(cubes)})")
+    
+    # Drapeaux de valeurs aberrantes (bits uint8), même index que les données nettoyées
+    flags = write_outlier_flags(output_file, outlier_flags_path(config), config)
+    logger.info(f"   ✅ Drapeaux de valeurs aberrantes: {outlier_flags_path(config)} "
+                f"({int((flags.to_numpy() != 0).sum()):,} valeurs marquées)")
+    
     # Sauvegarder aussi un échantillon pour tests rapides
     sample_file = output_dir / "opsd_sample_1000.csv"
-    df_clean.sample(min(1000, len(df_clean))).to_csv(sample_file, index=False)
+    df_clean.sample(min(1000, len(df_clean))).to_csv(sample_file, index=timestamp_index)
     logger.info(f"   ✅ Échantillon sauvegardé: {sample_file}")
     
+    # Filigrane pour les prochains traitements incrémentaux
+    fill_cols = [col for result in results for col in result["fill_columns"]]
+    write_manifest({
+        "source": source_snapshot,
+        "config": config_signature(config),
+        "watermark": watermark,
+        "rows": len(df_clean),
+        "raw_columns": [time_col] + [col for result in results for col in result["data"].columns],
+        "fill_columns": fill_cols,
+        "output_columns": output_columns,
+        "last_values": {col: value for result in results for col, value in result["last_values"].items()},
+        "last_timestamps": _timestamps_state(
+            fill_cols, [ts for result in results for ts in result["last_timestamps"].values()]),
+    })
+    logger.info("   ✅ Filigrane incrémental mis à jour")
+    run_profile.save()
+    
     logger.info("\n" + "=" * 80)
     logger.info("NETTOYAGE TERMINÉ")
     logger.info("=" * 80)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Script 5: Ingestion Ciblée des Données Météo
+============================================
+Extrait du fichier météo OPSD (ERA5, plusieurs Go) les seuls pays focus
+sur la période de `temporal_split`, et écrit une table horaire compacte
+alignée sur le `timestamp` du dataset OPSD nettoyé (format Arrow IPC,
+lisible par memory-map comme les données nettoyées).
+
+Utilisation:
+    python scripts/05_weather_ingestion.py
+
+    from processed_data import open_processed
+    weather = open_processed("data/processed/weather_focus_countries.arrow")
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import sys
+import logging
+from pathlib import Path
+
+from opsd_store import load_config
+from processed_data import write_processed
+from run_profile import RunProfile
+from weather_subset import analysis_period, read_weather_subset, weather_settings
+
+# Configuration du logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s: %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def ingest_weather(config):
+    """
+    Extrait et écrit la table météo des pays focus.
+
+    Returns:
+        pd.DataFrame: Table horaire indexée par `timestamp`
+    """
+    settings = weather_settings(config)
+    source_file = Path(settings["source_file"])
+    countries = config['focus_countries']
+    start, end = analysis_period(config)
+
+    logger.info("=" * 80)
+    logger.info("INGESTION DES DONNÉES MÉTÉO (PAYS FOCUS)")
+    logger.info("=" * 80)
+    logger.info(f"\n📂 Source: {source_file} ({source_file.stat().st_size / 1024**2:.1f} Mo)")
+    logger.info(f"   Pays: {', '.join(countries)}")
+    logger.info(f"   Période: {start} → {end}")
+
+    run_profile = RunProfile("05_weather_ingestion")
+    run_profile.section("1. Lecture ciblée (pays × période)")
+    logger.info("\n1. Lecture en flux du fichier météo")
+    df, stats = read_weather_subset(source_file, countries, start, end,
+                                    variables=settings["variables"],
+                                    include_regions=settings["include_regions"],
+                                    chunksize=settings["chunksize"],
+                                    float_dtype=settings["float_dtype"])
+    run_profile.processed(stats["rows_read"], stats["columns_kept"])
+    logger.info(f"   Lignes lues: {stats['rows_read']:,}, conservées: {stats['rows_kept']:,}")
+    logger.info(f"   Colonnes conservées: {stats['columns_kept']}/{stats['columns_source']}")
+
+    # Couverture de la grille horaire
+    logger.info("\n2. Couverture de la grille horaire")
+    logger.info(f"   Heures: {stats['hours']:,}, sans aucune donnée: {stats['hours_missing']:,}")
+    missing_pct = df.isnull().mean() * 100
+    for col in df.columns:
+        if missing_pct[col] > 0:
+            logger.warning(f"   ⚠️  {col}: {missing_pct[col]:.2f}% manquant")
+
+    run_profile.section("3. Écriture de la table météo", rows=len(df), columns=len(df.columns))
+    output = write_processed(df, settings["output"])
+    logger.info(f"\n3. Table météo écrite: {output} ({output.stat().st_size / 1024**2:.1f} Mo, "
+                f"{len(df):,} lignes × {len(df.columns)} colonnes)")
+    run_profile.save()
+    return df
+
+
+def main():
+    """Fonction principale."""
+    config = load_config()
+    source_file = Path(weather_settings(config)["source_file"])
+    if not source_file.exists():
+        logger.error(f"❌ Fichier introuvable: {source_file}")
+        logger.error("   Renseigner data_sources.opsd_weather.files puis exécuter: "
+                     "python scripts/01_download_opsd_data.py")
+        sys.exit(1)
+
+    ingest_weather(config)
+
+    logger.info(f"\n✅ Données météo disponibles dans: data/processed/")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Module: Cubes d'Agrégats Précalculés
+====================================
+Agrégats multi-résolution du dataset nettoyé, calculés à la fin du
+nettoyage pour que les tableaux de bord ne relisent pas la table horaire.
+
+Séries agrégées, par pays:
+- load:  charge réelle du pays
+- solar: génération solaire réelle
+- wind:  génération éolienne réelle (totale, ou onshore + offshore)
+- price: chaque colonne de prix day-ahead (une série par zone de prix),
+  avec la fréquence des heures à prix négatif
+
+Cubes produits (data/processed/cubes/):
+    calendar.parquet   # année × mois × jour de semaine × heure, à l'heure locale du pays
+    daily.parquet      # par jour (UTC)
+    monthly.parquet    # par mois (UTC)
+    rolling.parquet    # moyennes glissantes 24 h / 168 h, heures négatives glissantes
+
+Les clés du cube calendaire sont les variables {pays}_local_* du dataset
+nettoyé (fuseau et heure d'été du pays): l'heure des prix négatifs n'est
+pas décalée d'une à deux heures selon la saison. La colonne `clock` vaut
+'local', ou 'utc' si le nettoyage n'a pas produit les variables locales
+du pays (calendar_features.local_time).
+
+Les cubes calendaire, journalier et mensuel stockent des mesures additives
+(n, somme, min, max, n_negative): toute agrégation plus grossière (ex.
+heure × jour de semaine, tous mois confondus) s'obtient avec `rollup()`
+sans revenir aux données horaires. Les mêmes mesures permettent à
+update_cubes de fusionner les agrégats des seules lignes ajoutées par un
+nettoyage incrémental.
+
+Utilisation:
+    from aggregate_cubes import read_cube, rollup
+    cube = read_cube('calendar', country='DE')
+    rollup(cube[cube.measure == 'price'], ['hour'])     # taux de prix négatifs par heure locale
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from column_schema import schema_for
+from opsd_store import to_utc
+from processed_data import DEFAULT_PROCESSED_FILE, open_processed
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CUBES_DIR = "data/processed/cubes"
+CALENDAR_KEYS = ["year", "month", "dayofweek", "hour"]
+CLOCK_KEY = "clock"   # 'local' ou 'utc': référence des clés du cube calendaire
+ROLLING_WINDOWS = {"24h": "24h", "168h": "168h"}
+
+# Mesure → (variable, métrique) des colonnes OPSD
+MEASURES = {"load": ("load", "actual"), "solar": ("solar", "generation_actual"),
+            "wind": ("wind", "generation_actual")}
+
+KEY_DTYPES = {"year": "int16", "month": "int8", "dayofweek": "int8", "hour": "int8"}
+
+
+def cubes_dir(config=None):
+    """Répertoire des cubes (section processed_output de la configuration)."""
+    if config:
+        return config.get('processed_output', {}).get('cubes_dir') or DEFAULT_CUBES_DIR
+    return DEFAULT_CUBES_DIR
+
+
+def _country_columns(schema, country, variable, metric):
+    """Colonne nationale d'une variable, ou ses composantes (ex. wind_onshore + wind_offshore)."""
+    columns = [
+        name for name in schema.columns_for(country)
+        if schema.info[name].zone_type == "country" and schema.info[name].metric == metric
+        and schema.info[name].variable.startswith(variable)
+    ]
+    total = [name for name in columns if schema.info[name].variable == variable]
+    return total[:1] or columns
+
+
+def cube_series(data, start=0):
+    """
+    Séries agrégées du dataset nettoyé (à partir de la ligne `start`).
+
+    Returns:
+        list: (country, zone, measure, np.ndarray float64)
+    """
+    schema = schema_for(data.columns)
+    series = []
+    for country in schema.countries:
+        for measure, (variable, metric) in MEASURES.items():
+            names = _country_columns(schema, country, variable, metric)
+            if not names:
+                continue
+            values = np.vstack([np.asarray(data.column(name)[start:], dtype=np.float64)
+                                for name in names])
+            total = np.nansum(values, axis=0)
+            total[np.isnan(values).all(axis=0)] = np.nan
+            series.append((country, country, measure, total))
+        for name in schema.columns_for(country, role="price", metric="day_ahead"):
+            series.append((country, schema.info[name].zone, "price",
+                           np.asarray(data.column(name)[start:], dtype=np.float64)))
+    return series
+
+
+def _calendar_keys(data, start=0):
+    """
+    Clés calendaires d'un pays à partir de la ligne `start`: variables
+    {pays}_local_* si le dataset les contient, sinon variables UTC.
+
+    Returns:
+        callable: pays → DataFrame (CALENDAR_KEYS + clock)
+    """
+    def keys(country):
+        local = [f"{country}_local_{key}" for key in CALENDAR_KEYS]
+        names, clock = (local, "local") if set(local) <= set(data.columns) else (CALENDAR_KEYS, "utc")
+        frame = pd.DataFrame({key: data.column(name)[start:] for key, name in zip(CALENDAR_KEYS, names)})
+        frame[CLOCK_KEY] = clock
+        return frame
+    return keys
+
+
+def _aggregate(keys, series):
+    """
+    Mesures additives de chaque série, groupées par des clés.
+
+    Args:
+        keys: DataFrame de clés commun à toutes les séries, ou fonction
+            pays → DataFrame de clés (clés calendaires locales)
+    """
+    frames = []
+    by_country = {}
+    for country, zone, measure, values in series:
+        if callable(keys):
+            if country not in by_country:
+                by_country[country] = keys(country)
+            country_keys = by_country[country]
+        else:
+            country_keys = keys
+        # Fréquence des heures négatives: uniquement pour les prix
+        frame = country_keys.assign(value=values, negative=(values < 0) & (measure == "price"))
+        grouped = frame.groupby(list(country_keys.columns), observed=True, sort=True).agg(
+            n=("value", "count"), sum=("value", "sum"), min=("value", "min"),
+            max=("value", "max"), n_negative=("negative", "sum"))
+        grouped = grouped.reset_index()
+        grouped.insert(0, "measure", measure)
+        grouped.insert(0, "zone", zone)
+        grouped.insert(0, "country", country)
+        frames.append(grouped)
+    return _compact(pd.concat(frames, ignore_index=True))
+
+
+def _merge(cube, keys):
+    """Regroupe les lignes de mêmes clés d'un cube (mesures additives)."""
+    return cube.groupby(["country", "zone", "measure"] + keys, observed=True, sort=True).agg(
+        n=("n", "sum"), sum=("sum", "sum"), min=("min", "min"), max=("max", "max"),
+        n_negative=("n_negative", "sum")).reset_index()
+
+
+def _monthly(daily):
+    """Cube mensuel agrégé depuis le cube journalier (mesures additives)."""
+    monthly = daily.assign(period=daily["period"].dt.to_period('M').dt.to_timestamp())
+    return _compact(_merge(monthly, ["period"]))
+
+
+def _compact(cube):
+    """Types compacts: clés catégorielles / petits entiers, extrema en float32."""
+    for key in ("country", "zone", "measure", CLOCK_KEY):
+        if key in cube.columns:
+            cube[key] = cube[key].astype('category')
+    cube = cube.astype({key: dtype for key, dtype in KEY_DTYPES.items() if key in cube.columns})
+    return cube.astype({"n": "int32", "n_negative": "int32", "min": "float32", "max": "float32"})
+
+
+def _rolling(index, series):
+    """Moyennes glissantes (fenêtres temporelles, robustes aux gaps) et heures négatives."""
+    columns = {}
+    for country, zone, measure, values in series:
+        values = pd.Series(values, index=index)
+        for label, window in ROLLING_WINDOWS.items():
+            columns[f"{zone}_{measure}_mean_{label}"] = (
+                values.rolling(window, min_periods=1).mean().astype('float32'))
+            if measure == "price":
+                columns[f"{zone}_negative_hours_{label}"] = (
+                    (values < 0).astype('int16').rolling(window).sum().astype('int16'))
+    return pd.DataFrame(columns, index=index)
+
+
+def build_cubes(processed_path=DEFAULT_PROCESSED_FILE):
+    """
+    Calcule les cubes à partir du fichier nettoyé (seules les colonnes des
+    séries et les variables calendaires sont lues).
+
+    Returns:
+        dict: nom du cube → DataFrame
+    """
+    data = open_processed(processed_path)
+    try:
+        index = data.index()
+        series = cube_series(data)
+        calendar = _aggregate(_calendar_keys(data), series)
+        daily = _aggregate(pd.DataFrame({"period": index.floor('D').tz_localize(None)}), series)
+        rolling = _rolling(index, series)
+    finally:
+        data.close()
+
+    return {"calendar": calendar, "daily": daily, "monthly": _monthly(daily), "rolling": rolling}
+
+
+def write_cubes(processed_path=DEFAULT_PROCESSED_FILE, directory=DEFAULT_CUBES_DIR):
+    """Calcule et sauvegarde les cubes (Parquet)."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    cubes = build_cubes(processed_path)
+    for name, cube in cubes.items():
+        cube.to_parquet(directory / f"{name}.parquet", index=(name == "rolling"))
+    return cubes
+
+
+def update_cubes(processed_path=DEFAULT_PROCESSED_FILE, directory=DEFAULT_CUBES_DIR,
+                 watermark=None):
+    """
+    Complète les cubes après un ajout de lignes au dataset nettoyé.
+
+    Les lignes postérieures au filigrane sont agrégées seules puis
+    fusionnées aux cubes existants (n, somme et n_negative s'additionnent,
+    min/max se combinent): un jour ou un mois à cheval sur le filigrane est
+    complété. Les fenêtres glissantes ne sont recalculées que pour les
+    nouvelles lignes, avec la plus longue fenêtre d'historique.
+
+    Args:
+        watermark: Dernier timestamp déjà agrégé (filigrane du nettoyage)
+
+    Returns:
+        dict: nom du cube → DataFrame
+    """
+    directory = Path(directory)
+    if watermark is None or not all((directory / f"{name}.parquet").exists()
+                                    for name in ("calendar", "daily", "monthly", "rolling")):
+        return write_cubes(processed_path, directory)
+    if CLOCK_KEY not in read_cube("calendar", directory).columns:
+        # Cube calendaire en heure UTC d'une version précédente: recalcul complet
+        return write_cubes(processed_path, directory)
+    watermark = to_utc(watermark)
+    history = max(pd.Timedelta(window) for window in ROLLING_WINDOWS.values())
+
+    data = open_processed(processed_path)
+    try:
+        index = data.index()
+        first_new = int(index.searchsorted(watermark, side='right'))
+        context = int(index.searchsorted(index[first_new] - history, side='left')) \
+            if first_new < len(index) else first_new
+        new_index = index[first_new:]
+        series = cube_series(data, first_new)
+        calendar = _aggregate(_calendar_keys(data, first_new), series)
+        daily = _aggregate(pd.DataFrame({"period": new_index.floor('D').tz_localize(None)}), series)
+        rolling = _rolling(index[context:], cube_series(data, context)).iloc[first_new - context:]
+    finally:
+        data.close()
+
+    cubes = {}
+    for name, keys, part in (("calendar", CALENDAR_KEYS + [CLOCK_KEY], calendar),
+                             ("daily", ["period"], daily),
+                             ("monthly", ["period"], _monthly(daily))):
+        existing = read_cube(name, directory)
+        cubes[name] = _compact(_merge(pd.concat([existing, part], ignore_index=True), keys))
+    cubes["rolling"] = pd.concat([read_cube("rolling", directory), rolling])
+
+    for name, cube in cubes.items():
+        cube.to_parquet(directory / f"{name}.parquet", index=(name == "rolling"))
+    return cubes
+
+
+def read_cube(name, directory=DEFAULT_CUBES_DIR, country=None, columns=None):
+    """
+    Lit un cube ('calendar', 'daily', 'monthly', 'rolling').
+
+    Args:
+        country: Filtre pays (cubes calendaire, journalier et mensuel)
+        columns: Colonnes à lire (projection Parquet)
+    """
+    filters = [("country", "==", country)] if country is not None and name != "rolling" else None
+    return pd.read_parquet(Path(directory) / f"{name}.parquet", columns=columns, filters=filters)
+
+
+def rollup(cube, by):
+    """
+    Agrège un cube sur des clés plus grossières.
+
+    Args:
+        cube: Cube calendaire, journalier ou mensuel (éventuellement filtré)
+        by: Clés conservées, ex. ['hour'] ou ['month', 'dayofweek']
+
+    Returns:
+        pd.DataFrame: n, mean, min, max, negative_rate par série et clé
+        (avec `clock` pour le cube calendaire: heure locale ou UTC)
+    """
+    keys = ["country", "zone", "measure"] + list(by)
+    if CLOCK_KEY in cube.columns and CLOCK_KEY not in keys:
+        keys.insert(3, CLOCK_KEY)
+    grouped = cube.groupby(keys, observed=True, sort=True).agg(
+        n=("n", "sum"), sum=("sum", "sum"), min=("min", "min"), max=("max", "max"),
+        n_negative=("n_negative", "sum"))
+    grouped["mean"] = grouped["sum"] / grouped["n"].where(grouped["n"] > 0)
+    grouped["negative_rate"] = grouped["n_negative"] / grouped["n"].where(grouped["n"] > 0)
+    return grouped.drop(columns=["sum", "n_negative"]).reset_index()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Module: Jointure Temporelle Alignée Sans Copie
+=============================================
+Assemble des séries horaires issues de fichiers différents (dataset OPSD
+nettoyé, table météo, futures extractions ENTSO-E), de couvertures
+différentes, sans fusionner de DataFrames.
+
+Chaque source est repérée sur un index horaire entier: heures écoulées
+depuis l'epoch (UTC). Pour une source régulière (une ligne par heure,
+sans trou), l'heure h correspond à la ligne `h - début`: aligner deux
+sources revient à décaler des bornes, et chaque colonne de la vue
+combinée est une tranche (slice) du tableau d'origine, sans copie. Les
+colonnes des fichiers Arrow ouverts par memory-map restent donc sur
+disque jusqu'à leur lecture effective.
+
+Une copie n'a lieu que pour une colonne qui ne couvre pas toute la vue
+(jointure externe: complétée par des NaN) ou dont la source a des trous
+(placement ligne à ligne), et uniquement pour la colonne demandée.
+
+Utilisation:
+    from aligned_join import open_aligned
+    view = open_aligned(config)                  # nettoyé + météo si présente
+    prices = view.column('DE_LU_price_day_ahead')
+    X = view.feature_matrix(['DE_temperature', 'DE_solar_generation_actual'])
+
+    from aligned_join import HourlySource, AlignedView
+    view = AlignedView([HourlySource.from_frame("opsd", df_clean),
+                        HourlySource.from_processed("meteo", weather_path)], how="outer")
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from opsd_store import to_utc
+from processed_data import open_processed, processed_settings
+from temporal_integrity import HOUR_NS, timestamps_ns
+from weather_subset import weather_settings
+
+
+def epoch_hours(timestamps):
+    """Heures écoulées depuis l'epoch (UTC) d'une série ou d'un index temporel."""
+    return timestamps_ns(timestamps) // HOUR_NS
+
+
+class HourlySource:
+    """Colonnes d'une source, repérées sur l'index horaire entier."""
+
+    def __init__(self, name, hours, columns):
+        """
+        Args:
+            name: Nom de la source (messages d'erreur)
+            hours: Heures depuis l'epoch de chaque ligne (strictement croissantes)
+            columns: dict nom de colonne → np.ndarray (une valeur par ligne)
+        """
+        hours = np.asarray(hours, dtype=np.int64)
+        if len(hours) > 1 and not (np.diff(hours) > 0).all():
+            raise ValueError(f"Source {name}: index horaire non strictement croissant "
+                             f"(doublons ou pas infra-horaire)")
+        for col, values in columns.items():
+            if len(values) != len(hours):
+                raise ValueError(f"Source {name}: {col} a {len(values)} lignes, index {len(hours)}")
+        self.name = name
+        self.columns = columns
+        self.start = int(hours[0]) if len(hours) else 0
+        offsets = hours - self.start
+        self.regular = bool(len(hours) == 0 or offsets[-1] == len(hours) - 1)
+        # Position (heure relative) de chaque ligne, utile seulement en présence de trous
+        self.offsets = None if self.regular else offsets
+        self.end = self.start + (int(offsets[-1]) + 1 if len(hours) else 0)  # exclusive
+
+    @classmethod
+    def from_frame(cls, name, df, columns=None):
+        """
+        Source depuis un DataFrame indexé par le temps (sortie de clean_data)
+        ou ayant une colonne 'timestamp'. Les colonnes numériques sont des
+        vues sur les blocs du DataFrame quand pandas le permet.
+        """
+        timestamps = df.index if isinstance(df.index, pd.DatetimeIndex) else df['timestamp']
+        names = [col for col in (columns or df.columns) if col != 'timestamp']
+        return cls(name, epoch_hours(timestamps), {col: df[col].to_numpy() for col in names})
+
+    @classmethod
+    def from_processed(cls, name, data, columns=None):
+        """
+        Source depuis un fichier Arrow nettoyé (chemin ou ProcessedData):
+        colonnes en vues memory-map, sans copie.
+        """
+        if not hasattr(data, 'column'):
+            data = open_processed(data)
+        names = [col for col in (data.columns if columns is None else columns) if col != 'timestamp']
+        return cls(name, epoch_hours(data.index()), {col: data.column(col) for col in names})
+
+
+class AlignedView:
+    """
+    Vue combinée de plusieurs sources sur une plage horaire commune.
+
+    how='inner': heures couvertes par toutes les sources (colonnes de
+    sources régulières toujours sans copie); how='outer': union des
+    couvertures, complétée par des NaN.
+    """
+
+    def __init__(self, sources, how="inner", start=None, end=None):
+        if how not in ("inner", "outer"):
+            raise ValueError(f"how doit valoir 'inner' ou 'outer': {how}")
+        sources = [source for source in sources if source.end > source.start]
+        if not sources:
+            raise ValueError("Aucune source non vide à aligner")
+        self.sources = sources
+        self._owner = {}
+        for source in sources:
+            for col in source.columns:
+                if col in self._owner:
+                    raise ValueError(f"Colonne {col} présente dans {self._owner[col].name} "
+                                     f"et {source.name}")
+                self._owner[col] = source
+
+        pick = max if how == "inner" else min
+        self.start = pick(source.start for source in sources)
+        self.end = (min if how == "inner" else max)(source.end for source in sources)
+        if start is not None:
+            self.start = max(self.start, int(to_utc(start).value // HOUR_NS))
+        if end is not None:  # borne inclusive, comme le reste du pipeline
+            self.end = min(self.end, int(to_utc(end).value // HOUR_NS) + 1)
+        self.end = max(self.end, self.start)
+
+    def __len__(self):
+        return self.end - self.start
+
+    @property
+    def columns(self):
+        return list(self._owner)
+
+    @property
+    def hours(self):
+        """Heures depuis l'epoch de chaque ligne de la vue."""
+        return np.arange(self.start, self.end, dtype=np.int64)
+
+    def index(self):
+        """Index temporel de la vue (DatetimeIndex UTC nommé 'timestamp')."""
+        return pd.DatetimeIndex(pd.to_datetime(self.hours * HOUR_NS, utc=True), name='timestamp')
+
+    def is_view(self, name):
+        """La colonne est-elle exposée sans copie?"""
+        source = self._owner[name]
+        return (source.regular and self.start >= source.start and self.end <= source.end)
+
+    def column(self, name):
+        """
+        Valeurs d'une colonne sur la plage de la vue.
+
+        Tranche du tableau source (sans copie) si la source couvre la vue
+        sans trou; sinon tableau flottant complété par des NaN.
+        """
+        source = self._owner[name]
+        values = source.columns[name]
+        lo, hi = self.start - source.start, self.end - source.start
+        if self.is_view(name):
+            return values[lo:hi]
+
+        out = np.full(len(self), np.nan, dtype=np.result_type(values.dtype, np.float32))
+        if source.regular:
+            first, last = max(lo, 0), min(hi, len(values))
+            if first < last:
+                out[first - lo:last - lo] = values[first:last]
+        else:
+            positions = source.offsets - lo
+            inside = (positions >= 0) & (positions < len(self))
+            out[positions[inside]] = values[inside]
+        return out
+
+    def feature_matrix(self, columns=None, dtype=np.float32):
+        """
+        Matrice (heures × colonnes) pour la modélisation, allouée une seule
+        fois et remplie colonne par colonne: la mémoire se limite au résultat.
+        """
+        columns = self.columns if columns is None else list(columns)
+        matrix = np.empty((len(self), len(columns)), dtype=dtype)
+        for j, col in enumerate(columns):
+            matrix[:, j] = self.column(col)
+        return matrix
+
+    def to_pandas(self, columns=None):
+        """Matérialise un DataFrame indexé par 'timestamp' (copie des colonnes)."""
+        columns = self.columns if columns is None else list(columns)
+        return pd.DataFrame({col: self.column(col) for col in columns}, index=self.index())
+
+
+def open_aligned(config=None, how="inner", start=None, end=None):
+    """
+    Vue alignée du dataset nettoyé et, si elle a été produite, de la table
+    météo (scripts/05_weather_ingestion.py).
+    """
+    sources = [HourlySource.from_processed("opsd", processed_settings(config)["path"])]
+    weather_path = Path(weather_settings(config)["output"])
+    if weather_path.exists():
+        sources.append(HourlySource.from_processed("meteo", weather_path))
+    return AlignedView(sources, how=how, start=start, end=end)
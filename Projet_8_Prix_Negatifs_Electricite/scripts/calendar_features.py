@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Module: Variables Calendaires
+=============================
+Calcule toutes les variables calendaires en une passe vectorisée sur le
+tableau int64 des timestamps (ns UTC), sans accesseur `.dt`:
+
+- UTC: year, month, day, hour, dayofweek, quarter, is_weekend
+- heure locale de chaque pays focus: {pays}_local_{variable}, plus
+  {pays}_local_is_holiday (jours fériés nationaux)
+
+L'heure locale suit les fuseaux européens (heure d'été du dernier dimanche
+de mars au dernier dimanche d'octobre, 01:00 UTC, règle en vigueur depuis
+1996). Le fuseau de chaque pays vient de `calendar_features.timezones`,
+à défaut de la table COUNTRY_TIMEZONES. Les champs sont calculés
+une seule fois par fuseau: DE, DK et FR partagent le même calcul CET, seuls
+les jours fériés diffèrent.
+
+Les jours fériés proviennent d'une table hors ligne (dates fixes et fêtes
+mobiles relatives à Pâques), sans dépendance externe.
+
+Toutes les variables sont produites en petits entiers (int16 pour l'année,
+int8 pour les autres).
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from temporal_integrity import HOUR_NS, eu_dst_transitions, timestamps_ns
+
+logger = logging.getLogger(__name__)
+
+DAY_NS = 24 * HOUR_NS
+FIELDS = ["year", "month", "day", "hour", "dayofweek", "quarter", "is_weekend"]
+LOCAL_FIELDS = FIELDS + ["is_holiday"]
+
+DEFAULT_CALENDAR_SETTINGS = {
+    "local_time": True,
+    "local_fields": LOCAL_FIELDS,
+    "timezones": {},            # Fuseau par pays (WET, CET, EET), prioritaire sur COUNTRY_TIMEZONES
+}
+
+# Fuseaux européens: décalage d'hiver (heures), heure d'été européenne
+TIMEZONES = {"WET": 0, "CET": 1, "EET": 2}
+COUNTRY_TIMEZONES = {
+    "GB": "WET", "IE": "WET", "PT": "WET",
+    "BG": "EET", "EE": "EET", "FI": "EET", "GR": "EET", "LT": "EET", "LV": "EET", "RO": "EET",
+    **{country: "CET" for country in (
+        "AT", "BE", "CH", "CZ", "DE", "DK", "ES", "FR", "HR", "HU", "IT", "LU",
+        "ME", "NL", "NO", "PL", "RS", "SE", "SI", "SK")},
+}
+
+# Jours fériés nationaux: (mois, jour) fixe ou décalage en jours par rapport
+# à Pâques; années de validité optionnelles (première, dernière)
+HOLIDAYS = {
+    "DE": [
+        ("Neujahr", (1, 1)), ("Karfreitag", -2), ("Ostermontag", 1),
+        ("Tag der Arbeit", (5, 1)), ("Christi Himmelfahrt", 39), ("Pfingstmontag", 50),
+        ("Tag der Deutschen Einheit", (10, 3)), ("Reformationstag 2017", (10, 31), (2017, 2017)),
+        ("1. Weihnachtstag", (12, 25)), ("2. Weihnachtstag", (12, 26)),
+    ],
+    "DK": [
+        ("Nytårsdag", (1, 1)), ("Skærtorsdag", -3), ("Langfredag", -2), ("2. påskedag", 1),
+        ("Store bededag", 26, (None, 2023)), ("Kristi himmelfartsdag", 39), ("2. pinsedag", 50),
+        ("Juledag", (12, 25)), ("2. juledag", (12, 26)),
+    ],
+    "FR": [
+        ("Jour de l'an", (1, 1)), ("Lundi de Pâques", 1), ("Fête du Travail", (5, 1)),
+        ("Victoire 1945", (5, 8)), ("Ascension", 39), ("Lundi de Pentecôte", 50),
+        ("Fête nationale", (7, 14)), ("Assomption", (8, 15)), ("Toussaint", (11, 1)),
+        ("Armistice", (11, 11)), ("Noël", (12, 25)),
+    ],
+}
+
+
+def calendar_settings(config=None):
+    """Section `calendar_features` de la configuration, avec valeurs par défaut."""
+    settings = dict(DEFAULT_CALENDAR_SETTINGS)
+    if config and config.get('calendar_features'):
+        settings.update(config['calendar_features'])
+    settings["timezones"] = dict(settings["timezones"] or {})
+    return settings
+
+
+def country_timezone(country, timezones=None):
+    """
+    Fuseau d'un pays: celui de la configuration (`calendar_features.timezones`),
+    sinon celui de la table COUNTRY_TIMEZONES; None si inconnu.
+    """
+    timezone = (timezones or {}).get(country, COUNTRY_TIMEZONES.get(country))
+    if timezone is not None and timezone not in TIMEZONES:
+        raise ValueError(f"Fuseau {timezone} inconnu pour {country} "
+                         f"(valeurs possibles: {', '.join(TIMEZONES)})")
+    return timezone
+
+
+def easter(year):
+    """Date de Pâques (calendrier grégorien, algorithme anonyme)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return pd.Timestamp(year=year, month=month, day=day)
+
+
+def holiday_table(countries, years):
+    """
+    Jours fériés des pays pour les années demandées.
+
+    Returns:
+        pd.DataFrame: country, date, name
+    """
+    rows = []
+    for country in countries:
+        for year in years:
+            easter_day = easter(year)
+            for entry in HOLIDAYS.get(country, []):
+                name, rule = entry[0], entry[1]
+                first, last = entry[2] if len(entry) > 2 else (None, None)
+                if (first is not None and year < first) or (last is not None and year > last):
+                    continue
+                if isinstance(rule, tuple):
+                    date = pd.Timestamp(year=year, month=rule[0], day=rule[1])
+                else:
+                    date = easter_day + pd.Timedelta(days=rule)
+                rows.append((country, date, name))
+    return pd.DataFrame(rows, columns=["country", "date", "name"])
+
+
+def _holiday_days(country, years):
+    """Jours fériés en jours depuis l'epoch (int64)."""
+    dates = holiday_table([country], years)["date"]
+    return (pd.DatetimeIndex(dates).asi8 // DAY_NS).astype(np.int64)
+
+
+def civil_from_days(days):
+    """
+    Année, mois, jour d'un nombre de jours depuis 1970-01-01 (vectorisé,
+    algorithme de H. Hinnant, calendrier grégorien proleptique).
+    """
+    z = days + 719468
+    era = np.floor_divide(z, 146097)
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = np.where(mp < 10, mp + 3, mp - 9)
+    year = yoe + era * 400 + (month <= 2)
+    return year, month, day
+
+
+def calendar_fields(ts_ns):
+    """
+    Variables calendaires d'un tableau de timestamps (ns, déjà décalés
+    dans le fuseau voulu).
+
+    Returns:
+        dict: variable → np.ndarray (int16 / int8), plus 'days' (int64)
+    """
+    ts_ns = np.asarray(ts_ns, dtype=np.int64)
+    days = np.floor_divide(ts_ns, DAY_NS)
+    year, month, day = civil_from_days(days)
+    dayofweek = (days + 3) % 7  # 1970-01-01 était un jeudi (lundi = 0)
+    return {
+        "year": year.astype(np.int16),
+        "month": month.astype(np.int8),
+        "day": day.astype(np.int8),
+        "hour": (np.floor_divide(ts_ns, HOUR_NS) % 24).astype(np.int8),
+        "dayofweek": dayofweek.astype(np.int8),
+        "quarter": ((month - 1) // 3 + 1).astype(np.int8),
+        "is_weekend": (dayofweek >= 5).astype(np.int8),
+        "days": days,
+    }
+
+
+def local_offsets_ns(ts_ns, timezone):
+    """Décalage UTC → heure locale (ns) de chaque instant, heure d'été européenne incluse."""
+    ts_ns = np.asarray(ts_ns, dtype=np.int64)
+    offset = np.full(len(ts_ns), TIMEZONES[timezone] * HOUR_NS, dtype=np.int64)
+    if len(ts_ns):
+        # Transitions triées (mars, octobre, ...): heure d'été après un nombre impair
+        transitions = eu_dst_transitions(ts_ns.min(), ts_ns.max())
+        summer = np.searchsorted(transitions, ts_ns, side='right') % 2 == 1
+        offset += summer * HOUR_NS
+    return offset
+
+
+def calendar_frame(ts_ns, countries=(), local_fields=LOCAL_FIELDS, index=None, timezones=None):
+    """
+    Toutes les variables calendaires (UTC et heure locale par pays).
+
+    Args:
+        ts_ns: Timestamps (ns UTC)
+        countries: Pays pour les variantes en heure locale
+        local_fields: Variables locales à produire
+        index: Index du DataFrame produit
+        timezones: Fuseaux par pays de la configuration (voir country_timezone)
+
+    Returns:
+        pd.DataFrame: colonnes UTC puis {pays}_local_{variable}
+    """
+    ts_ns = np.asarray(ts_ns, dtype=np.int64)
+    utc = calendar_fields(ts_ns)
+    columns = {field: utc[field] for field in FIELDS}
+
+    by_timezone = {}
+    for country in countries:
+        timezone = country_timezone(country, timezones)
+        if timezone is None:
+            logger.warning(f"   ⚠️  Fuseau inconnu pour {country}: variables locales ignorées")
+            continue
+        if timezone not in by_timezone:
+            by_timezone[timezone] = calendar_fields(ts_ns + local_offsets_ns(ts_ns, timezone))
+        local = by_timezone[timezone]
+        for field in local_fields:
+            if field == "is_holiday":
+                if country not in HOLIDAYS:
+                    logger.warning(f"   ⚠️  Pas de table de jours fériés pour {country}")
+                years = range(int(local["year"].min()), int(local["year"].max()) + 1) if len(ts_ns) else []
+                values = np.isin(local["days"], _holiday_days(country, years)).astype(np.int8)
+            else:
+                values = local[field]
+            columns[f"{country}_local_{field}"] = values
+    return pd.DataFrame(columns, index=index)
+
+
+def add_calendar_features(df, timestamp_col, config=None):
+    """Ajoute les variables calendaires (UTC et locales) depuis la colonne temporelle."""
+    settings = calendar_settings(config)
+    countries = config['focus_countries'] if config and settings["local_time"] else ()
+    ts_ns = timestamps_ns(df[timestamp_col])
+    features = calendar_frame(ts_ns, countries, settings["local_fields"], index=df.index,
+                              timezones=settings["timezones"])
+    df[list(features.columns)] = features
+    return df
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Module: Schéma des Colonnes OPSD
+=================================
+Analyse les noms de colonnes OPSD `{zone}_{variable}_{attribut}` une seule
+fois et les indexe par pays, zone, rôle et métrique.
+
+Exemples:
+    DE_LU_price_day_ahead                → pays DE, zone de prix DE_LU, prix day-ahead
+    DE_50hertz_wind_onshore_generation_actual
+                                         → pays DE, GRT 50hertz, génération éolienne terrestre
+    FR_load_actual_entsoe_transparency   → pays FR, charge réelle, source ENTSO-E
+    IT_NORD_FR_price_day_ahead           → pays IT (et non FR), zone IT_NORD_FR
+
+Contrairement à un test de sous-chaîne (`'FR' in col`), le pays est le
+premier segment du nom: IT_NORD_FR_price_day_ahead n'est pas une colonne
+française.
+
+Utilisation:
+    schema = schema_for(df.columns)
+    schema.columns_for('DE', role='price')
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+# Version de la classification (invalide les filigranes incrémentaux si elle change)
+SCHEMA_VERSION = 1
+
+VARIABLES = ("price", "load", "solar", "wind")
+WIND_TYPES = ("onshore", "offshore")
+SOURCES = ("entsoe_transparency", "tso")
+TSOS = ("50hertz", "amprion", "tennet", "transnetbw")
+
+# Rôle d'une variable dans le pipeline (prix, génération renouvelable, charge)
+ROLES = {"price": "price", "load": "load", "solar": "generation", "wind": "generation"}
+
+ColumnInfo = namedtuple(
+    "ColumnInfo",
+    ["name", "country", "zone", "zone_type", "variable", "metric", "source", "role"],
+)
+
+
+@lru_cache(maxsize=None)
+def parse_column(name):
+    """
+    Décompose un nom de colonne OPSD.
+
+    Returns:
+        ColumnInfo: country (ex. 'DE'), zone (ex. 'DE_LU'), zone_type
+        ('country', 'bidding_zone', 'tso'), variable (ex. 'wind_onshore'),
+        metric (ex. 'generation_actual'), source (ex. 'entsoe_transparency'),
+        role ('price', 'generation', 'load', 'timestamp', 'other')
+    """
+    if name.endswith("timestamp"):
+        return ColumnInfo(name, None, None, None, None, None, None, "timestamp")
+
+    tokens = name.split("_")
+    position = next((i for i, token in enumerate(tokens) if i > 0 and token in VARIABLES), None)
+    country = tokens[0]
+    if position is None or len(country) != 2 or not country.isalpha() or not country.isupper():
+        return ColumnInfo(name, None, None, None, None, None, None, "other")
+
+    zone_tokens = tokens[:position]
+    if len(zone_tokens) == 1:
+        zone_type = "country"
+    elif zone_tokens[1] in TSOS:
+        zone_type = "tso"
+    else:
+        zone_type = "bidding_zone"
+
+    variable = tokens[position]
+    rest = tokens[position + 1:]
+    if variable == "wind" and rest and rest[0] in WIND_TYPES:
+        variable = f"wind_{rest[0]}"
+        rest = rest[1:]
+
+    metric = "_".join(rest)
+    source = None
+    for candidate in SOURCES:
+        if metric.endswith("_" + candidate):
+            source = candidate
+            metric = metric[:-len(candidate) - 1]
+            break
+
+    return ColumnInfo(name, country, "_".join(zone_tokens), zone_type, variable,
+                      metric, source, ROLES[tokens[position]])
+
+
+class ColumnSchema:
+    """Index des colonnes par pays, rôle et (pays, rôle), dans l'ordre de l'en-tête."""
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.info = {col: parse_column(col) for col in self.columns}
+        self._by_key = {}
+        for col, info in self.info.items():
+            for key in ((info.country, None), (None, info.role), (info.country, info.role)):
+                self._by_key.setdefault(key, []).append(col)
+
+    @property
+    def countries(self):
+        """Codes pays présents, dans l'ordre de l'en-tête."""
+        return list(dict.fromkeys(info.country for info in self.info.values() if info.country))
+
+    @property
+    def timestamp_columns(self):
+        return self.columns_for(role="timestamp")
+
+    def columns_for(self, country=None, role=None, metric=None):
+        """
+        Colonnes d'un pays et/ou d'un rôle (recherche directe dans l'index).
+
+        Args:
+            country: Code pays (ex. 'DE'), None = tous
+            role: 'price', 'generation', 'load', 'timestamp', None = tous
+            metric: Filtre optionnel sur la métrique (ex. 'day_ahead')
+        """
+        if country is None and role is None:
+            columns = list(self.columns)
+        else:
+            columns = list(self._by_key.get((country, role), []))
+        if metric is not None:
+            columns = [col for col in columns if self.info[col].metric == metric]
+        return columns
+
+
+@lru_cache(maxsize=8)
+def _cached_schema(columns):
+    return ColumnSchema(columns)
+
+
+def schema_for(columns):
+    """Schéma d'un en-tête, construit une seule fois puis mis en cache."""
+    return _cached_schema(tuple(columns))
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Module: Profil Commun du Dataset Brut
+=====================================
+Moteur de profilage partagé par l'exploration initiale (script 02) et
+l'analyse de qualité (script 03): le dataset est parcouru une seule fois et
+le profil contient l'union des agrégats des deux rapports.
+
+- dimensions, mémoire, types de données, taille du fichier
+- valeurs manquantes par colonne (déduites des plages manquantes de
+  l'index d'intégrité temporelle)
+- période, gaps, doublons et anomalies DST
+- statistiques des prix: colonnes day-ahead des pays focus (qualité) et
+  deux premières colonnes de prix de chaque pays focus (exploration)
+- aperçu des premières lignes
+- comptes de valeurs aberrantes (outlier_flags) des colonnes
+  prix/charge/génération des pays focus, si demandés (analyse de qualité)
+
+Deux modes produisent le même profil: en mémoire (DataFrame chargé) ou en
+flux, par blocs de lignes, sans jamais matérialiser le dataset complet.
+
+Utilisation:
+    from dataset_profile import profile_dataset, write_exploration_report
+    profile = profile_dataset(file_path, ['DE', 'DK', 'FR'], config)
+    write_exploration_report(profile)
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from column_schema import schema_for
+from opsd_store import iter_timeseries, load_timeseries, read_columns
+from outlier_flags import OutlierFlagTracker, flag_frame, outlier_columns, summarize_flags
+from streaming_stats import BlockMoments, QuantileSketch, price_block_stats
+from temporal_integrity import (MissingRunTracker, TimestampRunTracker, add_run_timestamps,
+                                missing_counts, timestamp_runs, timestamps_ns)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPLORATION_REPORT = "reports/initial_exploration.txt"
+PREVIEW_ROWS = 5
+
+
+def _focus_price_columns(columns, focus_countries):
+    """
+    Colonnes de prix suivies, par pays focus.
+
+    Returns:
+        tuple: (colonnes day-ahead par pays pour le rapport de qualité,
+                deux premières colonnes de prix par pays pour l'exploration)
+    """
+    schema = schema_for(columns)
+    quality = {country: schema.columns_for(country, role='price', metric='day_ahead')
+               for country in focus_countries}
+    exploration = {country: schema.columns_for(country, role='price')[:2]
+                   for country in focus_countries}
+    return quality, exploration
+
+
+def _tracked_columns(quality, exploration):
+    """Union ordonnée des colonnes de prix des deux rapports."""
+    tracked = [col for cols in list(quality.values()) + list(exploration.values()) for col in cols]
+    return list(dict.fromkeys(tracked))
+
+
+def _outlier_focus_columns(columns, focus_countries):
+    """Colonnes prix/charge/génération des pays focus (drapeaux de valeurs aberrantes)."""
+    schema = schema_for(columns)
+    return outlier_columns([col for country in focus_countries
+                            for col in schema.columns_for(country)])
+
+
+def _preview_columns(columns, focus_countries):
+    """Colonne temporelle et première colonne de prix de chaque pays focus."""
+    schema = schema_for(columns)
+    display = [columns[0]]
+    for country in focus_countries:
+        price_cols = schema.columns_for(country, role='price')
+        if price_cols:
+            display.append(price_cols[0])
+    return display
+
+
+def _price_report(columns, arrays, n_rows):
+    """
+    Convertit les tableaux du noyau de statistiques en entrées du rapport.
+
+    Args:
+        columns: Colonnes de prix, dans l'ordre des tableaux
+        arrays: Sortie de price_block_stats (une valeur par colonne)
+        n_rows: Nombre total de lignes
+
+    Returns:
+        dict: {colonne: statistiques} (None si aucune donnée non-nulle)
+    """
+    report = {}
+    for j, col in enumerate(columns):
+        count = int(arrays["count"][j])
+        if count == 0:
+            report[col] = None
+            continue
+
+        stats = {
+            "count": count,
+            "missing": int(arrays["missing"][j]),
+            "missing_pct": round(float(arrays["missing"][j]) / n_rows * 100, 2),
+            "min": round(float(arrays["min"][j]), 2),
+            "max": round(float(arrays["max"][j]), 2),
+            "mean": round(float(arrays["mean"][j]), 2),
+            "median": round(float(arrays["median"][j]), 2),
+            "std": round(float(arrays["std"][j]), 2)
+        }
+
+        # Prix négatifs (le plus négatif est le minimum de la colonne)
+        negative_count = int(arrays["negative_count"][j])
+        stats["negative_count"] = negative_count
+        stats["negative_pct"] = round(negative_count / count * 100, 2)
+        if negative_count > 0:
+            stats["most_negative"] = stats["min"]
+
+        # Outliers extrêmes (> 3 écart-types)
+        stats["outliers_high_count"] = int(arrays["outliers_high_count"][j])
+        stats["outliers_low_count"] = int(arrays["outliers_low_count"][j])
+
+        report[col] = stats
+    return report
+
+
+def _value_columns(columns):
+    """Colonnes de mesures (hors colonnes horodatées)."""
+    schema = schema_for(columns)
+    return [col for col in columns[1:] if schema.info[col].role != 'timestamp']
+
+
+def _temporal_profile(runs, missing_runs):
+    """Agrégats temporels du rapport, déduits de l'index d'intégrité."""
+    gaps = runs["gaps"]
+    durations = gaps["end"] - gaps["start"]
+    return {
+        "period_start": runs["start"],
+        "period_end": runs["end"],
+        "gaps_count": len(gaps),
+        "max_gap": durations.max() if len(gaps) > 0 else None,
+        "first_gaps": list(zip(gaps["end"].head(), durations.head())),
+        "duplicates": int((runs["duplicates"]["occurrences"] - 1).sum()),
+        "timestamp_runs": runs,
+        "missing_runs": missing_runs,
+    }
+
+
+def _price_sections(price_stats, quality, exploration):
+    """Statistiques de prix regroupées par pays pour chacun des deux rapports."""
+    return {
+        "price_stats": {
+            country: {col: price_stats[col] for col in cols}
+            for country, cols in quality.items() if cols
+        },
+        "exploration_price_stats": {
+            country: {col: price_stats[col] for col in cols}
+            for country, cols in exploration.items() if cols
+        },
+    }
+
+
+def profile_in_memory(df, focus_countries, chunksize=100_000, outliers=None):
+    """
+    Calcule le profil sur un DataFrame chargé.
+
+    Le DataFrame n'est ni trié ni copié en entier: l'analyse temporelle
+    porte sur le tableau int64 des timestamps, les plages de valeurs
+    manquantes sont extraites par blocs de lignes.
+
+    Args:
+        outliers: outlier_settings() pour compter les valeurs aberrantes
+            sur le même DataFrame, ou None
+
+    Returns:
+        dict: Agrégats consommés par les scripts 02 et 03
+    """
+    columns = list(df.columns)
+    time_col = columns[0]
+    value_cols = _value_columns(columns)
+
+    # Plages de valeurs manquantes (et comptes par colonne)
+    tracker = MissingRunTracker(value_cols)
+    positions = [df.columns.get_loc(col) for col in value_cols]
+    for first in range(0, len(df), chunksize):
+        tracker.update(df.iloc[first:first + chunksize, positions].to_numpy(dtype='float64'))
+    missing_runs = tracker.finish()
+    other_cols = [col for col in columns if col not in set(value_cols)]
+    missing = pd.concat([df[other_cols].isnull().sum(), missing_counts(missing_runs, value_cols)])
+    ts_ns = timestamps_ns(df[time_col])
+
+    # Toutes les colonnes de prix en un seul bloc NumPy pour le noyau vectorisé
+    quality, exploration = _focus_price_columns(columns, focus_countries)
+    tracked = _tracked_columns(quality, exploration)
+    price_stats = _price_report(tracked, price_block_stats(df[tracked].to_numpy(dtype='float64')), len(df))
+
+    outlier_profile = {}
+    if outliers is not None:
+        outlier_cols = _outlier_focus_columns(columns, focus_countries)
+        outlier_profile = {
+            "outlier_columns": outlier_cols,
+            "outlier_flags": summarize_flags(flag_frame(df[outlier_cols], ts_ns, outliers)),
+        }
+
+    return {
+        "rows": len(df),
+        "columns": columns,
+        "memory_mb": round(df.memory_usage(deep=True).sum() / (1024**2), 2),
+        "dtypes": df.dtypes.astype(str).value_counts().to_dict(),
+        "missing": missing.reindex(columns),
+        "preview": df[_preview_columns(columns, focus_countries)].head(PREVIEW_ROWS),
+        **_temporal_profile(timestamp_runs(ts_ns), add_run_timestamps(missing_runs, ts_ns)),
+        **_price_sections(price_stats, quality, exploration),
+        **outlier_profile,
+    }
+
+
+def profile_streaming(file_path, focus_countries, config=None, chunksize=100_000, outliers=None):
+    """
+    Calcule le même profil que profile_in_memory en une seule passe par
+    blocs, sans jamais matérialiser le dataset complet.
+
+    Les comptes et moments sont exacts; médianes et outliers proviennent
+    d'un histogramme quantifié au centime (exact pour les prix OPSD). Les
+    valeurs aberrantes sont comptées pendant la même passe
+    (OutlierFlagTracker).
+
+    Returns:
+        dict: Agrégats consommés par les scripts 02 et 03
+    """
+    columns = read_columns(file_path, config=config)
+    time_col = columns[0]
+    value_cols = _value_columns(columns)
+    other_cols = [col for col in columns if col not in set(value_cols)]
+    quality, exploration = _focus_price_columns(columns, focus_countries)
+    tracked = _tracked_columns(quality, exploration)
+
+    rows = 0
+    memory_bytes = 0
+    dtypes = None
+    preview = None
+    other_missing = pd.Series(0, index=other_cols, dtype='int64')
+    timestamp_tracker = TimestampRunTracker()
+    tracker = MissingRunTracker(value_cols)
+    moments = BlockMoments(len(tracked))
+    sketches = [QuantileSketch() for _ in tracked]
+    outlier_cols = _outlier_focus_columns(columns, focus_countries)
+    flag_tracker = OutlierFlagTracker(outlier_cols, outliers) if outliers is not None else None
+
+    for chunk in iter_timeseries(file_path, chunksize=chunksize, config=config):
+        if preview is None:
+            # Types et aperçu: identiques d'un bloc à l'autre, relevés sur le premier
+            dtypes = chunk.dtypes.astype(str).value_counts().to_dict()
+            preview = chunk[_preview_columns(columns, focus_countries)].head(PREVIEW_ROWS)
+        rows += len(chunk)
+        memory_bytes += chunk.memory_usage(deep=True).sum()
+        other_missing += chunk[other_cols].isnull().sum()
+        # Gaps, doublons et bornes des plages manquantes relevés au fil des blocs
+        ts_ns = timestamps_ns(chunk[time_col])
+        timestamp_tracker.update(ts_ns)
+        tracker.update(chunk[value_cols].to_numpy(dtype='float64'), ts_ns)
+        block = chunk[tracked].to_numpy(dtype='float64')
+        moments.update(block)
+        for j, sketch in enumerate(sketches):
+            column = block[:, j]
+            sketch.update(column[~np.isnan(column)])
+        if flag_tracker is not None:
+            flag_tracker.update(ts_ns, chunk[outlier_cols].to_numpy(dtype='float64'))
+
+    missing_runs = tracker.finish()
+    missing = pd.concat([other_missing, missing_counts(missing_runs, value_cols)]).reindex(columns)
+
+    # Mêmes tableaux que price_block_stats, reconstruits depuis les accumulateurs
+    std = moments.std
+    arrays = {
+        "count": moments.count,
+        "missing": missing[tracked].to_numpy(),
+        "min": moments.min,
+        "max": moments.max,
+        "mean": moments.mean,
+        "median": np.array([sketch.median() for sketch in sketches]),
+        "std": std,
+        "negative_count": moments.negative_count,
+        "outliers_high_count": np.array([
+            sketch.count_above(mean + 3*sd) for sketch, mean, sd in zip(sketches, moments.mean, std)
+        ]),
+        "outliers_low_count": np.array([
+            sketch.count_below(mean - 3*sd) for sketch, mean, sd in zip(sketches, moments.mean, std)
+        ]),
+    }
+    price_stats = _price_report(tracked, arrays, rows)
+    outlier_profile = {}
+    if flag_tracker is not None:
+        outlier_profile = {"outlier_columns": outlier_cols, "outlier_flags": flag_tracker.finish()}
+
+    return {
+        "rows": rows,
+        "columns": columns,
+        "memory_mb": round(memory_bytes / (1024**2), 2),
+        "dtypes": dtypes or {},
+        "missing": missing,
+        "preview": preview,
+        **_temporal_profile(timestamp_tracker.finish(), missing_runs),
+        **_price_sections(price_stats, quality, exploration),
+        **outlier_profile,
+    }
+
+
+def profile_dataset(file_path, focus_countries, config=None, streaming=False, chunksize=100_000,
+                    outliers=None):
+    """
+    Profil complet du dataset brut, en une seule lecture.
+
+    Args:
+        file_path: Chemin vers le fichier CSV OPSD
+        focus_countries: Liste des codes pays prioritaires
+        config: Configuration du pipeline (magasin colonnaire)
+        streaming: Profilage par blocs en mémoire constante
+        chunksize: Nombre de lignes par bloc
+        outliers: outlier_settings() pour compter aussi les valeurs
+            aberrantes pendant la même lecture, ou None
+
+    Returns:
+        dict: Agrégats des rapports d'exploration et de qualité
+    """
+    if streaming:
+        logger.info(f"\n⏳ Analyse en flux (blocs de {chunksize:,} lignes)...")
+        profile = profile_streaming(file_path, focus_countries, config, chunksize, outliers)
+    else:
+        logger.info("\n⏳ Chargement des données...")
+        df = load_timeseries(file_path, config=config)
+        profile = profile_in_memory(df, focus_countries, chunksize, outliers)
+        del df
+    profile["file_path"] = str(file_path)
+    profile["file_size_mb"] = os.path.getsize(file_path) / (1024 * 1024)
+    return profile
+
+
+def write_exploration_report(profile, report_file=DEFAULT_EXPLORATION_REPORT):
+    """Écrit le rapport texte d'exploration initiale à partir du profil."""
+    report_file = Path(report_file)
+    report_file.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write("=" * 80 + "\n")
+        f.write("RAPPORT D'EXPLORATION INITIALE - OPSD TIME SERIES\n")
+        f.write("=" * 80 + "\n\n")
+        f.write(f"Fichier: {profile['file_path']}\n")
+        f.write(f"Taille: {profile['file_size_mb']:.2f} Mo\n")
+        f.write(f"Lignes: {profile['rows']:,}\n")
+        f.write(f"Colonnes: {len(profile['columns']):,}\n")
+        f.write(f"Période: {profile['period_start']} à {profile['period_end']}\n\n")
+
+        f.write("Liste complète des colonnes:\n")
+        f.write("-" * 80 + "\n")
+        for i, col in enumerate(profile["columns"], 1):
+            f.write(f"{i:4d}. {col}\n")
+    return report_file
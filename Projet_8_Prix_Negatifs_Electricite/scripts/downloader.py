@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Module: Téléchargement Reprenable par Plages HTTP
+==================================================
+Téléchargeur non interactif pour les gros fichiers OPSD:
+
+- Requêtes HTTP Range en parallèle (plusieurs parties simultanées)
+- Reprise d'un téléchargement interrompu (fichier .part + état JSON,
+  sauvegardé après chaque plage terminée et tous les CHECKPOINT_BYTES:
+  un arrêt brutal ne perd que les octets reçus depuis le dernier point)
+- Vérification de l'empreinte (md5/sha1/sha256) publiée par OPSD
+- Aucun travail si ETag/Last-Modified montrent que rien n'a changé
+
+Fichiers produits à côté de la destination:
+    time_series_60min_singleindex.csv            # Fichier final
+    time_series_60min_singleindex.csv.meta.json  # ETag, Last-Modified, taille, empreinte
+    time_series_60min_singleindex.csv.part       # Pendant le téléchargement seulement
+    time_series_60min_singleindex.csv.part.json  # État de reprise par partie
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+from tqdm import tqdm
+
+logger = logging.getLogger(__name__)
+
+# Algorithme d'empreinte déduit de la longueur hexadécimale
+HASH_ALGORITHMS = {32: 'md5', 40: 'sha1', 64: 'sha256'}
+CHECKPOINT_BYTES = 64 * 1024 * 1024   # Octets reçus par plage entre deux sauvegardes de l'état
+
+
+class ChecksumError(Exception):
+    """Empreinte du fichier reçu différente de l'empreinte publiée."""
+
+
+class ResourceChanged(requests.exceptions.RequestException):
+    """La ressource a changé pendant un téléchargement par plages (reprise impossible)."""
+
+
+def _no_throttle(url):
+    """Aucune limite de débit."""
+
+
+def _read_json(path):
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(path, data):
+    """Écriture atomique (fichier temporaire puis renommage)."""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _sidecar(path, suffix):
+    return path.with_name(path.name + suffix)
+
+
+def remote_info(session, url, timeout=30, throttle=_no_throttle):
+    """
+    Interroge le serveur (HEAD) sans télécharger le contenu.
+
+    Returns:
+        dict: size, accept_ranges, etag, last_modified
+    """
+    throttle(url)
+    response = session.head(url, allow_redirects=True, timeout=timeout)
+    response.raise_for_status()
+    headers = response.headers
+    return {
+        "size": int(headers.get('content-length', 0)),
+        "accept_ranges": headers.get('accept-ranges', '').lower() == 'bytes',
+        "etag": headers.get('etag'),
+        "last_modified": headers.get('last-modified'),
+    }
+
+
+def _validator(remote):
+    """Validateur fort pour If-Range (un ETag faible n'est pas accepté)."""
+    etag = remote.get("etag")
+    if etag and not etag.startswith('W/'):
+        return etag
+    return remote.get("last_modified")
+
+
+def _is_unchanged(meta, remote, destination_path):
+    """Le fichier local correspond-il toujours à la ressource distante?"""
+    if meta is None or not destination_path.exists():
+        return False
+    if remote["size"] and destination_path.stat().st_size != remote["size"]:
+        return False
+    if remote["etag"] and meta.get("etag"):
+        return remote["etag"] == meta["etag"]
+    if remote["last_modified"] and meta.get("last_modified"):
+        return remote["last_modified"] == meta["last_modified"]
+    return False
+
+
+def fetch_checksum(checksum_url, filename, session=None, timeout=30, throttle=_no_throttle):
+    """
+    Récupère l'empreinte publiée pour `filename` dans un fichier de sommes
+    de contrôle (une ligne par fichier, nom et empreinte hexadécimale).
+
+    Returns:
+        str | None: Empreinte hexadécimale, ou None si introuvable
+    """
+    session = session or requests.Session()
+    throttle(checksum_url)
+    try:
+        response = session.get(checksum_url, timeout=timeout)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"   ⚠️  Sommes de contrôle indisponibles ({e}), vérification ignorée")
+        return None
+
+    for line in response.text.splitlines():
+        if filename in line:
+            match = re.search(r'\b([0-9a-fA-F]{64}|[0-9a-fA-F]{40}|[0-9a-fA-F]{32})\b', line)
+            if match:
+                return match.group(1).lower()
+    logger.warning(f"   ⚠️  Aucune empreinte publiée pour {filename}, vérification ignorée")
+    return None
+
+
+def file_digest(path, algorithm, chunk_size=1024 * 1024):
+    """Calcule l'empreinte hexadécimale d'un fichier."""
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def verify_checksum(path, expected):
+    """Compare l'empreinte du fichier à l'empreinte attendue."""
+    algorithm = HASH_ALGORITHMS.get(len(expected))
+    if algorithm is None:
+        raise ValueError(f"Empreinte de longueur inattendue: {expected}")
+    actual = file_digest(path, algorithm)
+    if actual != expected.lower():
+        logger.error(f"   ❌ Empreinte {algorithm} invalide: {actual} ≠ {expected}")
+        return False
+    logger.info(f"   ✅ Empreinte {algorithm} vérifiée")
+    return True
+
+
+def _split_ranges(size, parts):
+    """Découpe [0, size) en `parts` plages [début, fin inclusive, octets reçus]."""
+    parts = max(1, min(parts, size))
+    step = -(-size // parts)
+    return [[start, min(start + step, size) - 1, 0] for start in range(0, size, step)]
+
+
+def _download_ranges(session, url, part_path, remote, parts, chunk_size, timeout,
+                     throttle=_no_throttle):
+    """Télécharge les plages en parallèle dans un fichier pré-alloué, avec reprise."""
+    size = remote["size"]
+    validator = _validator(remote)
+    state_path = _sidecar(part_path, '.json')
+    state = _read_json(state_path)
+
+    if (state is None or not part_path.exists()
+            or state.get("url") != url
+            or state.get("size") != size
+            or state.get("validator") != validator):
+        state = {"url": url, "size": size, "validator": validator,
+                 "ranges": _split_ranges(size, parts)}
+        with open(part_path, 'wb') as f:
+            f.truncate(size)
+        _write_json(state_path, state)
+    else:
+        resumed = sum(done for _, _, done in state["ranges"])
+        logger.info(f"   Reprise du téléchargement: {resumed / (1024*1024):.2f} Mo déjà reçus")
+
+    lock = threading.Lock()
+    progress = tqdm(total=size, initial=sum(done for _, _, done in state["ranges"]),
+                    unit='B', unit_scale=True, desc=part_path.name)
+
+    def fetch(index):
+        start, end, done = state["ranges"][index]
+        if start + done > end:
+            return
+        headers = {'Range': f'bytes={start + done}-{end}'}
+        if validator:
+            headers['If-Range'] = validator
+        throttle(url)
+        with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                # La ressource a changé entre-temps: la reprise n'est plus valable
+                raise ResourceChanged(
+                    f"Réponse {response.status_code} au lieu de 206 pour une requête Range")
+            with open(part_path, 'r+b') as f:
+                f.seek(start + done)
+                received = done
+                since_checkpoint = 0
+
+                def checkpoint():
+                    # Octets sur disque avant de les déclarer reçus dans l'état
+                    f.flush()
+                    os.fsync(f.fileno())
+                    with lock:
+                        state["ranges"][index][2] = received
+                        _write_json(state_path, state)
+
+                try:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        if chunk:
+                            f.write(chunk)
+                            received += len(chunk)
+                            since_checkpoint += len(chunk)
+                            with lock:
+                                progress.update(len(chunk))
+                            if since_checkpoint >= CHECKPOINT_BYTES:
+                                checkpoint()
+                                since_checkpoint = 0
+                finally:
+                    # Plage terminée ou interrompue: un nouvel essai reprendra ici
+                    checkpoint()
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(state["ranges"])) as executor:
+            list(executor.map(fetch, range(len(state["ranges"]))))
+    finally:
+        progress.close()
+
+    state_path.unlink()
+
+
+def _download_stream(session, url, part_path, chunk_size, timeout, throttle=_no_throttle):
+    """Téléchargement séquentiel (serveur sans support des requêtes Range)."""
+    throttle(url)
+    with session.get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        total_size = int(response.headers.get('content-length', 0))
+        with open(part_path, 'wb') as f:
+            with tqdm(total=total_size, unit='B', unit_scale=True, desc=part_path.name) as pbar:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        f.write(chunk)
+                        pbar.update(len(chunk))
+
+
+def download_file(url, destination_path, parts=4, chunk_size=1024 * 1024,
+                  checksum=None, force=False, timeout=30, session=None, throttle=_no_throttle):
+    """
+    Télécharge un fichier de façon reprenable et non interactive.
+
+    Les erreurs sont levées avec leur cause: l'appelant décide de ce qui
+    mérite une nouvelle tentative (réseau, 429/5xx) ou non (4xx, empreinte).
+
+    Args:
+        url (str): URL du fichier à télécharger
+        destination_path (Path): Chemin de destination
+        parts (int): Nombre de plages téléchargées en parallèle
+        chunk_size (int): Taille des blocs de lecture réseau
+        checksum (str): Empreinte attendue (md5/sha1/sha256), optionnelle
+        force (bool): Re-télécharger même si le fichier est à jour
+        timeout (int): Délai réseau en secondes
+        session (requests.Session): Session HTTP à réutiliser
+        throttle (callable): Appelé avec l'URL avant chaque requête HTTP
+            (HEAD et chaque plage), ex. limite de débit par hôte
+
+    Returns:
+        bool: True si le fichier a été téléchargé, False s'il était déjà à jour
+
+    Raises:
+        requests.exceptions.RequestException: Erreur réseau ou HTTP (le
+            fichier .part et son état sont conservés pour la reprise)
+        ChecksumError: Empreinte invalide (le fichier .part est supprimé)
+    """
+    destination_path = Path(destination_path)
+    meta_path = _sidecar(destination_path, '.meta.json')
+    part_path = _sidecar(destination_path, '.part')
+    session = session or requests.Session()
+
+    logger.info(f"Téléchargement depuis: {url}")
+    logger.info(f"Destination: {destination_path}")
+    destination_path.parent.mkdir(parents=True, exist_ok=True)
+
+    remote = remote_info(session, url, timeout, throttle)
+    if not force and _is_unchanged(_read_json(meta_path), remote, destination_path):
+        logger.info("   Fichier à jour (ETag/Last-Modified inchangés), téléchargement ignoré")
+        return False
+
+    if remote["size"] and remote["accept_ranges"]:
+        _download_ranges(session, url, part_path, remote, parts, chunk_size, timeout, throttle)
+    else:
+        logger.info("   Serveur sans support Range: téléchargement séquentiel")
+        _download_stream(session, url, part_path, chunk_size, timeout, throttle)
+
+    if checksum and not verify_checksum(part_path, checksum):
+        part_path.unlink()
+        raise ChecksumError(f"empreinte invalide pour {url}")
+
+    os.replace(part_path, destination_path)
+    _write_json(meta_path, {
+        "url": url,
+        "etag": remote["etag"],
+        "last_modified": remote["last_modified"],
+        "size": destination_path.stat().st_size,
+        "checksum": checksum,
+    })
+
+    file_size = destination_path.stat().st_size
+    logger.info(f"Fichier téléchargé: {file_size / (1024*1024):.2f} Mo")
+    return True
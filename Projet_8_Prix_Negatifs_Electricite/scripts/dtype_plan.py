@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Module: Plan de Types Compacts
+==============================
+Optimise les types du dataset nettoyé selon la section `dtype_plan` de la
+configuration:
+
+- float32 pour génération, charge, capacités et profils
+- float64 conservé pour les prix (précision au centime)
+- petits entiers pour les variables calendaires
+- index temporel DatetimeIndex avec fuseau (UTC)
+
+La mémoire est mesurée comme le `memory_mb` du rapport de qualité
+(memory_usage(deep=True), en Mo).
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import pandas as pd
+
+from column_schema import parse_column
+
+DEFAULT_DTYPE_PLAN = {
+    "enabled": True,
+    "float_dtype": "float32",
+    "price_dtype": "float64",
+    "calendar_dtypes": {
+        "year": "int16",
+        "month": "int8",
+        "day": "int8",
+        "hour": "int8",
+        "dayofweek": "int8",
+        "quarter": "int8",
+        "is_weekend": "int8",
+    },
+    "timestamp_index": True,
+    "timezone": "UTC",
+}
+
+
+def dtype_settings(config=None):
+    """Plan de types de la configuration, complété par les valeurs par défaut."""
+    settings = dict(DEFAULT_DTYPE_PLAN)
+    if config and config.get('dtype_plan'):
+        settings.update(config['dtype_plan'])
+    return settings
+
+
+def memory_mb(df):
+    """Mémoire occupée en Mo (même mesure que le rapport de qualité)."""
+    return round(df.memory_usage(deep=True).sum() / (1024**2), 2)
+
+
+def column_dtype(col, settings):
+    """Type cible d'une colonne selon son rôle (None = inchangé)."""
+    calendar = settings["calendar_dtypes"]
+    if col in calendar:
+        return calendar[col]
+    if parse_column(col).role == 'price':
+        return settings["price_dtype"]
+    return settings["float_dtype"]
+
+
+def optimize_dtypes(df, config=None, timestamp_col='timestamp'):
+    """
+    Applique le plan de types au dataset nettoyé.
+
+    Args:
+        df: DataFrame nettoyé (colonne temporelle + mesures + calendrier)
+        config: Configuration du pipeline (section 'dtype_plan')
+        timestamp_col: Nom de la colonne temporelle
+
+    Returns:
+        tuple: (DataFrame optimisé, rapport mémoire)
+    """
+    settings = dtype_settings(config)
+    before = memory_mb(df)
+    if not settings["enabled"]:
+        return df, {"memory_mb_before": before, "memory_mb_after": before,
+                    "saved_mb": 0.0, "saved_pct": 0.0}
+
+    if settings["timestamp_index"] and timestamp_col in df.columns:
+        timestamps = pd.to_datetime(df[timestamp_col], utc=True).dt.tz_convert(settings["timezone"])
+        df = df.drop(columns=[timestamp_col])
+        df.index = pd.DatetimeIndex(timestamps, name=timestamp_col)
+
+    targets = {}
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        # Entiers hors plan calendaire (variables locales): déjà compacts
+        if pd.api.types.is_integer_dtype(df[col]) and col not in settings["calendar_dtypes"]:
+            continue
+        target = column_dtype(col, settings)
+        if target and df[col].dtype != target:
+            targets[col] = target
+    df = df.astype(targets)
+
+    after = memory_mb(df)
+    saved = round(before - after, 2)
+    return df, {
+        "memory_mb_before": before,
+        "memory_mb_after": after,
+        "saved_mb": saved,
+        "saved_pct": round(saved / before * 100, 1) if before else 0.0,
+    }
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Module: Moteur de Remplissage des Valeurs Manquantes
+=====================================================
+Forward fill borné dans le temps, par classe de colonnes, selon la section
+`missing_values_strategy` de la configuration:
+
+- charge et génération (`timeseries: forward_fill`): une valeur manquante
+  reprend la dernière observation de la colonne si celle-ci date d'au plus
+  `data_quality.timestamp_gap_tolerance` heures. La limite est mesurée sur
+  les timestamps, pas en nombre de lignes: une ligne absente (gap) compte.
+- prix (`price: keep_nan`): les NaN sont conservés (absence de marché)
+
+Les valeurs manquantes en début de série (aucune observation antérieure)
+restent NaN: aucune donnée n'est extrapolée vers le passé.
+
+Le remplissage travaille en place sur un tableau NumPy 2-D, à partir des
+plages de valeurs manquantes (index d'intégrité temporelle): aucun masque
+n'est recalculé avant ou après le remplissage.
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from column_schema import schema_for
+from temporal_integrity import HOUR_NS, MissingRunTracker
+
+logger = logging.getLogger(__name__)
+
+# Classe de stratégie de chaque rôle de colonne
+STRATEGY_KEYS = {"price": "price", "generation": "timeseries", "load": "timeseries"}
+
+
+def fill_settings(config):
+    """Stratégie par rôle et limite de remplissage (heures)."""
+    strategy = config.get('missing_values_strategy', {})
+    return {
+        "strategies": {role: strategy.get(key, "forward_fill") for role, key in STRATEGY_KEYS.items()},
+        "limit_hours": config.get('data_quality', {}).get('timestamp_gap_tolerance', 2),
+    }
+
+
+def fill_plan(columns, settings):
+    """
+    Colonnes à remplir par forward fill, et colonnes laissées telles quelles.
+
+    Returns:
+        dict: rôle → liste de colonnes, et 'forward_fill' (colonnes à remplir)
+    """
+    schema = schema_for(columns)
+    plan = {role: schema.columns_for(role=role) for role in STRATEGY_KEYS}
+    plan["forward_fill"] = [
+        col for col in columns
+        if settings["strategies"].get(schema.info[col].role) == "forward_fill"
+    ]
+    return plan
+
+
+def missing_runs_of(block, columns):
+    """Plages de valeurs manquantes d'un bloc (si l'index persisté est indisponible)."""
+    tracker = MissingRunTracker(columns)
+    tracker.update(block)
+    runs = tracker.finish()
+    runs["column"] = runs["column"].astype(str)
+    return runs
+
+
+def forward_fill(block, columns, ts_ns, runs, limit_hours, initial_values=None, initial_ts=None):
+    """
+    Forward fill borné, en place.
+
+    Args:
+        block: np.ndarray float (lignes × colonnes), modifié en place
+        columns: Noms des colonnes du bloc
+        ts_ns: Timestamps des lignes (ns UTC, triés)
+        runs: Plages manquantes (column, start_row, end_row) du bloc
+        limit_hours: Âge maximal de l'observation recopiée
+        initial_values, initial_ts: Dernière observation de chaque colonne
+            avant le bloc (traitement incrémental), NaN / -1 sinon
+
+    Returns:
+        dict: filled (valeurs remplies par colonne), last_values et last_ts
+        (dernière observation réelle de chaque colonne, pour le bloc suivant)
+    """
+    n_rows, n_cols = block.shape
+    ts_ns = np.asarray(ts_ns, dtype=np.int64)
+    limit_ns = int(limit_hours * HOUR_NS)
+    if initial_values is None:
+        initial_values = np.full(n_cols, np.nan)
+        initial_ts = np.full(n_cols, -1, dtype=np.int64)
+
+    col = pd.Index(columns).get_indexer(runs["column"])
+    start = runs["start_row"].to_numpy(dtype=np.int64)
+    end = runs["end_row"].to_numpy(dtype=np.int64)
+    keep = col >= 0
+    col, start, end = col[keep], start[keep], end[keep]
+
+    # Observation recopiée: ligne précédant la plage, ou état initial
+    has_previous = start > 0
+    source_row = np.where(has_previous, start - 1, 0)
+    source_value = np.where(has_previous, block[source_row, col], initial_values[col])
+    source_ts = np.where(has_previous, ts_ns[source_row], initial_ts[col])
+    usable = ~np.isnan(source_value)
+
+    # Fin du remplissage: premier timestamp au-delà de la limite
+    if n_rows > 1 and np.any(np.diff(ts_ns) < 0):
+        logger.warning("   ⚠️  Timestamps non triés: limite appliquée en nombre de lignes")
+        bound = start + int(limit_hours)
+    else:
+        bound = np.searchsorted(ts_ns, source_ts + limit_ns, side='right')
+    fill_end = np.where(usable, np.minimum(end, bound), start)
+    length = np.maximum(fill_end - start, 0)
+
+    # Affectation vectorisée de toutes les cellules remplies
+    total = int(length.sum())
+    if total:
+        run_of_cell = np.repeat(np.arange(len(length)), length)
+        offset = np.arange(total) - np.repeat(np.cumsum(length) - length, length)
+        block[start[run_of_cell] + offset, col[run_of_cell]] = source_value[run_of_cell]
+    filled = np.bincount(col, weights=length, minlength=n_cols).astype(np.int64)
+
+    # État pour le bloc suivant: dernière observation réelle de chaque colonne
+    last_values = block[-1].astype(np.float64).copy() if n_rows else initial_values.copy()
+    last_ts = np.full(n_cols, ts_ns[-1] if n_rows else -1, dtype=np.int64)
+    trailing = end == n_rows
+    last_values[col[trailing]] = source_value[trailing]
+    last_ts[col[trailing]] = np.where(np.isnan(source_value[trailing]), -1, source_ts[trailing])
+
+    return {"filled": filled, "last_values": last_values, "last_ts": last_ts}
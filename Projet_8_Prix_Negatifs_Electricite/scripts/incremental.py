@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Module: Ingestion Incrémentale
+==============================
+Filigrane (watermark) du dernier traitement de nettoyage: dernier
+timestamp traité, nombre d'octets du CSV source déjà consommés et empreinte
+SHA-256 de ce préfixe. Si le préfixe est inchangé, seules les lignes
+ajoutées depuis sont relues (par décalage d'octets, sans re-parser
+l'historique). Si l'historique a été révisé, un traitement complet est
+nécessaire.
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import hashlib
+import io
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from calendar_features import calendar_settings
+from column_schema import SCHEMA_VERSION
+from dtype_plan import dtype_settings
+from fill_engine import fill_settings
+from outlier_flags import outlier_settings
+from processed_data import processed_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MANIFEST = "data/processed/_clean_manifest.json"
+
+
+def source_digests(path, prefix_length, total_length, chunk_size=8 * 1024 * 1024):
+    """
+    Empreintes SHA-256 du préfixe et du fichier complet, en une seule lecture.
+
+    Returns:
+        tuple: (empreinte des `prefix_length` premiers octets,
+                empreinte des `total_length` premiers octets)
+    """
+    digest = hashlib.sha256()
+    prefix_hex = None
+    position = 0
+    with open(path, 'rb') as f:
+        for boundary in (prefix_length, total_length):
+            while position < boundary:
+                block = f.read(min(chunk_size, boundary - position))
+                if not block:
+                    break
+                digest.update(block)
+                position += len(block)
+            if prefix_hex is None:
+                prefix_hex = digest.copy().hexdigest()
+    return prefix_hex, digest.hexdigest()
+
+
+def complete_length(path):
+    """Nombre d'octets jusqu'à la dernière ligne complète (fin de ligne incluse)."""
+    size = Path(path).stat().st_size
+    with open(path, 'rb') as f:
+        f.seek(max(0, size - 1))
+        if f.read(1) == b'\n':
+            return size
+        # Dernière ligne incomplète (écriture en cours): l'ignorer
+        f.seek(0)
+        return f.read().rfind(b'\n') + 1
+
+
+def config_signature(config):
+    """Paramètres de configuration qui invalident le filigrane s'ils changent."""
+    return {
+        "focus_countries": list(config['focus_countries']),
+        "threshold_drop": config['missing_values_strategy']['threshold_drop'],
+        "schema_version": SCHEMA_VERSION,
+        "fill": fill_settings(config),
+        "calendar": calendar_settings(config),
+        "outliers": outlier_settings(config),
+        # Types et fichiers de sortie: les nouvelles lignes doivent suivre le même plan
+        "dtype_plan": dtype_settings(config),
+        "processed_output": processed_settings(config),
+    }
+
+
+def snapshot_source(path):
+    """Position et empreinte du CSV source au moment du traitement."""
+    length = complete_length(path)
+    _, digest = source_digests(path, 0, length)
+    return {"path": str(path), "bytes": length, "sha256": digest}
+
+
+def read_manifest(manifest_path=DEFAULT_MANIFEST):
+    """Lit le filigrane, ou None s'il n'existe pas."""
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_manifest(manifest, manifest_path=DEFAULT_MANIFEST):
+    """Écrit le filigrane (les NaN sont stockés comme null)."""
+    manifest = dict(manifest)
+    manifest["last_values"] = {
+        col: (None if value is None or np.isnan(value) else float(value))
+        for col, value in manifest["last_values"].items()
+    }
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+def manifest_is_usable(manifest, input_file, config, output_file):
+    """Le filigrane permet-il un traitement incrémental?"""
+    if manifest is None or not Path(output_file).exists():
+        return False
+    if manifest["config"] != config_signature(config):
+        logger.info("   Configuration modifiée depuis le dernier traitement: traitement complet")
+        return False
+    if manifest["source"]["path"] != str(input_file):
+        return False
+    return True
+
+
+def read_appended_rows(input_file, manifest):
+    """
+    Lit uniquement les lignes ajoutées au CSV source depuis le filigrane.
+
+    Args:
+        input_file: Chemin vers le CSV brut
+        manifest: Filigrane du dernier traitement
+
+    Returns:
+        tuple: (nouvelles lignes avec les colonnes brutes retenues, ou None si
+        l'historique déjà traité a changé; nouvel instantané de la source)
+    """
+    source = manifest["source"]
+    length = complete_length(input_file)
+    prefix_hex, full_hex = source_digests(input_file, source["bytes"], length)
+    snapshot = {"path": str(input_file), "bytes": length, "sha256": full_hex}
+    if length < source["bytes"] or prefix_hex != source["sha256"]:
+        logger.warning("   ⚠️  L'historique du fichier source a changé: traitement complet requis")
+        return None, snapshot
+
+    raw_columns = manifest["raw_columns"]
+    if length == source["bytes"]:
+        return pd.DataFrame(columns=raw_columns), snapshot
+
+    header = pd.read_csv(input_file, nrows=0).columns.tolist()
+    with open(input_file, 'rb') as f:
+        f.seek(source["bytes"])
+        tail = io.BytesIO(f.read(length - source["bytes"]))
+    new_rows = pd.read_csv(tail, header=None, names=header, usecols=raw_columns,
+                           parse_dates=[0], low_memory=False)
+    new_rows = new_rows[raw_columns]
+
+    # Sécurité: ne garder que les timestamps postérieurs au filigrane
+    time_col = raw_columns[0]
+    watermark = pd.Timestamp(manifest["watermark"])
+    return new_rows[new_rows[time_col] > watermark].reset_index(drop=True), snapshot
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Module: Téléchargement Concurrent Multi-Sources
+===============================================
+Récupère en parallèle toutes les ressources déclarées dans la section
+`data_sources` de la configuration:
+
+- opsd_timeseries: fichier principal (plages HTTP, reprise, empreinte)
+- opsd_weather: fichiers listés dans `files` (ex. extractions par pays)
+- entsoe: pages de l'API Transparency listées dans `requests`
+  (jeton lu dans la variable d'environnement `token_env`)
+
+Boucle asyncio: chaque transfert s'exécute dans un thread
+(asyncio.to_thread) avec la bibliothèque requests, sous les contraintes:
+
+- concurrence bornée (sémaphore `max_concurrency`)
+- réutilisation des connexions (une session, pool dimensionné)
+- limite de débit par hôte (`requests_per_second`), appliquée à chaque
+  requête HTTP (HEAD, chaque plage, sommes de contrôle)
+- reprises avec backoff exponentiel (et Retry-After pour 429/503), pour les
+  seules erreurs transitoires: réseau, 429 et 5xx (pas les autres 4xx ni
+  une empreinte invalide)
+
+Chaque réponse est écrite au fil de l'eau sur disque (fichier .part puis
+renommage atomique): aucune ressource n'est gardée en mémoire.
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from downloader import ChecksumError, ResourceChanged, download_file, fetch_checksum
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FETCHER_SETTINGS = {
+    "max_concurrency": 4,
+    "requests_per_second": 2.0,
+    "retries": 3,
+    "backoff_s": 1.0,
+    "max_backoff_s": 30.0,
+}
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchJob:
+    """Ressource à récupérer."""
+    name: str
+    url: str
+    destination: Path
+    kind: str = "file"                  # 'file' (plages HTTP) ou 'api' (GET paramétré)
+    params: dict = field(default_factory=dict)
+    checksum_url: str = None
+    parts: int = 1
+    required: bool = False              # Échec bloquant pour le pipeline
+
+
+def fetcher_settings(config=None):
+    """Section `fetcher` de la configuration, avec valeurs par défaut."""
+    settings = dict(DEFAULT_FETCHER_SETTINGS)
+    if config and config.get('fetcher'):
+        settings.update(config['fetcher'])
+    return settings
+
+
+def fetch_jobs(config):
+    """Ressources déclarées dans `data_sources`."""
+    sources = config['data_sources']
+    download_config = config.get('download', {})
+    jobs = []
+
+    opsd = sources['opsd_timeseries']
+    jobs.append(FetchJob(
+        name="opsd_timeseries",
+        url=opsd['url'],
+        destination=Path(opsd['destination']) / opsd['filename'],
+        checksum_url=opsd.get('checksum_url'),
+        parts=download_config.get('parallel_parts', 4),
+        required=True,
+    ))
+
+    weather = sources.get('opsd_weather', {})
+    for filename in weather.get('files') or []:
+        jobs.append(FetchJob(
+            name=f"opsd_weather:{filename}",
+            url=urljoin(weather['url_base'], filename),
+            destination=Path(weather['destination']) / Path(filename).name,
+            parts=download_config.get('parallel_parts', 4),
+        ))
+
+    entsoe = sources.get('entsoe', {})
+    pages = entsoe.get('requests') or []
+    token = os.environ.get(entsoe.get('token_env', 'ENTSOE_TOKEN'))
+    if pages and not token:
+        logger.warning(f"   ⚠️  ENTSO-E: jeton absent ({entsoe.get('token_env', 'ENTSOE_TOKEN')}), "
+                       f"{len(pages)} requêtes ignorées")
+    elif pages:
+        for page in pages:
+            jobs.append(FetchJob(
+                name=f"entsoe:{page['name']}",
+                url=entsoe['api_url'],
+                destination=Path(entsoe['destination']) / f"{page['name']}.xml",
+                kind="api",
+                params={**page['params'], "securityToken": token},
+            ))
+    return jobs
+
+
+class RateLimiter:
+    """
+    Intervalle minimal entre deux requêtes vers un même hôte.
+
+    Appelé depuis les threads de transfert avant chaque requête HTTP (les
+    plages d'un même fichier partagent la limite).
+    """
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        time.sleep(slot - now)
+
+
+class RetryableError(Exception):
+    """Échec transitoire (réseau, 429, 5xx): la requête sera retentée."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _retry_after(response):
+    """Délai Retry-After en secondes (forme numérique uniquement)."""
+    value = response.headers.get('retry-after', '')
+    return float(value) if value.replace('.', '', 1).isdigit() else None
+
+
+def _fetch_api(session, job, limiter, chunk_size, timeout):
+    """GET paramétré écrit au fil de l'eau dans un fichier .part."""
+    part_path = job.destination.with_name(job.destination.name + '.part')
+    job.destination.parent.mkdir(parents=True, exist_ok=True)
+    limiter.wait(job.url)
+    try:
+        with session.get(job.url, params=job.params, stream=True, timeout=timeout) as response:
+            if response.status_code in RETRY_STATUS:
+                raise RetryableError(f"HTTP {response.status_code}", _retry_after(response))
+            response.raise_for_status()
+            with open(part_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        f.write(chunk)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        raise RetryableError(str(e)) from None
+    os.replace(part_path, job.destination)
+
+
+def _fetch_file(session, job, limiter, chunk_size, timeout, force):
+    """Fichier complet via le téléchargeur reprenable (plages HTTP, empreinte)."""
+    checksum = fetch_checksum(job.checksum_url, job.destination.name, session, timeout,
+                              limiter.wait) if job.checksum_url else None
+    # Erreurs transitoires seulement: le fichier .part est conservé, la tentative suivante reprend
+    try:
+        download_file(job.url, job.destination, parts=job.parts, chunk_size=chunk_size,
+                      checksum=checksum, force=force, timeout=timeout, session=session,
+                      throttle=limiter.wait)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError, ResourceChanged) as e:
+        raise RetryableError(str(e)) from None
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code in RETRY_STATUS:
+            raise RetryableError(f"HTTP {e.response.status_code}", _retry_after(e.response)) from None
+        raise
+
+
+async def _run_job(job, session, semaphore, limiter, settings, chunk_size, timeout, force):
+    """Exécute un transfert avec reprises; renvoie (nom, succès, durée)."""
+    start = time.perf_counter()
+    for attempt in range(settings["retries"] + 1):
+        async with semaphore:
+            try:
+                if job.kind == "api":
+                    await asyncio.to_thread(_fetch_api, session, job, limiter, chunk_size, timeout)
+                else:
+                    await asyncio.to_thread(_fetch_file, session, job, limiter, chunk_size,
+                                            timeout, force)
+                logger.info(f"   ✅ {job.name} → {job.destination}")
+                return job.name, True, round(time.perf_counter() - start, 2)
+            except RetryableError as e:
+                error, retry_after = e, e.retry_after
+            except (requests.exceptions.RequestException, ChecksumError, OSError) as e:
+                # Erreur définitive (4xx, empreinte invalide): aucune nouvelle tentative
+                logger.error(f"   ❌ {job.name}: {e}")
+                break
+        if attempt == settings["retries"]:
+            break
+        # Backoff exponentiel avec gigue, hors sémaphore (les autres transferts continuent)
+        delay = retry_after or min(settings["max_backoff_s"],
+                                   settings["backoff_s"] * 2 ** attempt) * random.uniform(0.5, 1.0)
+        logger.warning(f"   ⚠️  {job.name}: {error} — nouvelle tentative dans {delay:.1f} s "
+                       f"({attempt + 1}/{settings['retries']})")
+        await asyncio.sleep(delay)
+    logger.error(f"   ❌ {job.name}: abandon")
+    return job.name, False, round(time.perf_counter() - start, 2)
+
+
+async def fetch_all_async(jobs, settings=None, chunk_size=1024 * 1024, timeout=30, force=False):
+    """Version asynchrone de fetch_all (à appeler depuis une boucle existante)."""
+    settings = {**DEFAULT_FETCHER_SETTINGS, **(settings or {})}
+    semaphore = asyncio.Semaphore(settings["max_concurrency"])
+    limiter = RateLimiter(settings["requests_per_second"])
+
+    # Une session partagée: connexions réutilisées entre ressources d'un même hôte
+    pool_size = settings["max_concurrency"] * max([job.parts for job in jobs] or [1])
+    with requests.Session() as session:
+        adapter = HTTPAdapter(pool_connections=settings["max_concurrency"], pool_maxsize=pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        results = await asyncio.gather(*(
+            _run_job(job, session, semaphore, limiter, settings, chunk_size, timeout, force)
+            for job in jobs
+        ))
+    return {name: {"ok": ok, "duration_s": duration} for name, ok, duration in results}
+
+
+def fetch_all(jobs, settings=None, chunk_size=1024 * 1024, timeout=30, force=False):
+    """
+    Récupère toutes les ressources en parallèle.
+
+    Args:
+        jobs: Liste de FetchJob (voir fetch_jobs)
+        settings: Paramètres du fetcher (fetcher_settings)
+        chunk_size: Taille des blocs écrits sur disque
+        timeout: Délai réseau en secondes
+        force: Re-télécharger les fichiers même s'ils sont à jour
+
+    Returns:
+        dict: nom → {'ok': bool, 'duration_s': float}
+    """
+    return asyncio.run(fetch_all_async(jobs, settings, chunk_size, timeout, force))
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Module: Magasin Colonnaire OPSD
+================================
+Convertit une seule fois le CSV brut OPSD Time Series en un magasin Parquet
+partitionné par année, avec des types compacts. Les scripts 02 à 04 lisent
+ensuite uniquement les colonnes et plages temporelles dont ils ont besoin,
+au lieu de re-parser le CSV complet à chaque étape.
+
+Structure du magasin:
+    data/interim/opsd_store/
+    ├── _manifest.json      # Colonnes, types, partitions, empreinte de la source
+    ├── year=2014.parquet
+    ├── year=2015.parquet
+    └── ...
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import yaml
+
+from column_schema import parse_column
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = "data/interim/opsd_store"
+MANIFEST_NAME = "_manifest.json"
+
+
+def load_config(config_path='config/pipeline_config.yaml'):
+    """Charge la configuration du pipeline."""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def storage_settings(config=None):
+    """
+    Retourne les paramètres de stockage avec valeurs par défaut.
+
+    Args:
+        config: Configuration du pipeline (section 'storage' optionnelle)
+
+    Returns:
+        dict: store_dir, float_dtype, chunksize
+    """
+    settings = {
+        "store_dir": DEFAULT_STORE_DIR,
+        "float_dtype": "float32",
+        "chunksize": 100_000,
+    }
+    if config and config.get('storage'):
+        settings.update({k: v for k, v in config['storage'].items() if v is not None})
+    return settings
+
+
+def read_csv_header(csv_path):
+    """Lit uniquement l'en-tête du CSV (aucune ligne de données n'est parsée)."""
+    return pd.read_csv(csv_path, nrows=0).columns.tolist()
+
+
+def source_fingerprint(csv_path):
+    """Empreinte légère de la source (taille + date de modification)."""
+    stat = Path(csv_path).stat()
+    return {"path": str(csv_path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def to_utc(value):
+    """Convertit une date (str, Timestamp naïf ou avec fuseau) en Timestamp UTC."""
+    ts = pd.Timestamp(value)
+    return ts.tz_localize('UTC') if ts.tz is None else ts.tz_convert('UTC')
+
+
+def read_manifest(store_dir=DEFAULT_STORE_DIR):
+    """Lit le manifeste du magasin, ou None s'il n'existe pas."""
+    manifest_file = Path(store_dir) / MANIFEST_NAME
+    if not manifest_file.exists():
+        return None
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def store_is_fresh(csv_path, store_dir=DEFAULT_STORE_DIR):
+    """Indique si le magasin existe et correspond toujours au CSV source."""
+    manifest = read_manifest(store_dir)
+    if manifest is None or not Path(csv_path).exists():
+        return False
+    return manifest.get("source") == source_fingerprint(csv_path)
+
+
+def store_dtypes(header, float_dtype="float32"):
+    """Types des colonnes du magasin (hors colonne temporelle, en premier dans `header`)."""
+    # Les autres colonnes horodatées (ex: cet_cest_timestamp) restent textuelles,
+    # les prix restent en float64 pour des statistiques exactes au centime
+    text_cols = [col for col in header[1:] if col.endswith('timestamp')]
+    dtypes = {col: float_dtype for col in header[1:] if col not in text_cols}
+    dtypes.update({col: 'float64' for col in dtypes if parse_column(col).role == 'price'})
+    dtypes.update({col: 'string' for col in text_cols})
+    return dtypes
+
+
+def build_store(csv_path, store_dir=DEFAULT_STORE_DIR, float_dtype="float32", chunksize=100_000):
+    """
+    Convertit le CSV OPSD en magasin Parquet partitionné par année.
+
+    Le CSV est lu par blocs de `chunksize` lignes: la mémoire reste bornée
+    même pour les séries 15 minutes.
+
+    Args:
+        csv_path: Chemin vers le CSV brut OPSD
+        store_dir: Dossier du magasin colonnaire
+        float_dtype: Type des colonnes numériques hors prix ('float32' ou 'float64')
+        chunksize: Nombre de lignes par bloc de lecture
+
+    Returns:
+        dict: Manifeste du magasin
+    """
+    store_path = Path(store_dir)
+    store_path.mkdir(parents=True, exist_ok=True)
+
+    header = read_csv_header(csv_path)
+    time_col = header[0]
+    dtypes = store_dtypes(header, float_dtype)
+
+    # Nettoyer les anciennes partitions
+    for old_file in store_path.glob("year=*.parquet"):
+        old_file.unlink()
+
+    writers = {}
+    partitions = {}
+    schema = None
+    try:
+        reader = pd.read_csv(csv_path, dtype=dtypes, chunksize=chunksize)
+        for chunk in reader:
+            chunk[time_col] = pd.to_datetime(chunk[time_col], utc=True)
+            for year, part in chunk.groupby(chunk[time_col].dt.year, sort=True):
+                table = pa.Table.from_pandas(part, schema=schema, preserve_index=False)
+                if schema is None:
+                    schema = table.schema
+                if year not in writers:
+                    part_file = store_path / f"year={year}.parquet"
+                    writers[year] = pq.ParquetWriter(part_file, schema)
+                    partitions[year] = {
+                        "file": part_file.name,
+                        "rows": 0,
+                        "start": str(part[time_col].min()),
+                        "end": str(part[time_col].max()),
+                    }
+                writers[year].write_table(table)
+                partitions[year]["rows"] += len(part)
+                partitions[year]["end"] = str(part[time_col].max())
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    manifest = {
+        "source": source_fingerprint(csv_path),
+        "time_column": time_col,
+        "columns": header,
+        "float_dtype": float_dtype,
+        "rows": sum(p["rows"] for p in partitions.values()),
+        "partitions": [partitions[year] for year in sorted(partitions)],
+    }
+    with open(store_path / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    logger.info(f"   ✅ Magasin colonnaire: {manifest['rows']:,} lignes, "
+                f"{len(manifest['partitions'])} partitions → {store_path}")
+    return manifest
+
+
+def read_store(store_dir=DEFAULT_STORE_DIR, columns=None, start=None, end=None):
+    """
+    Lit un sous-ensemble du magasin colonnaire.
+
+    Seules les partitions qui recouvrent [start, end] sont ouvertes, et seules
+    les colonnes demandées sont décodées. La colonne temporelle est toujours
+    incluse en première position.
+
+    Args:
+        store_dir: Dossier du magasin colonnaire
+        columns: Liste de colonnes à lire (None = toutes)
+        start: Borne inférieure inclusive (str ou Timestamp, UTC)
+        end: Borne supérieure inclusive (str ou Timestamp, UTC)
+
+    Returns:
+        pd.DataFrame
+    """
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"Magasin colonnaire introuvable: {store_dir}")
+
+    time_col = manifest["time_column"]
+    if columns is None:
+        columns = manifest["columns"]
+    columns = [time_col] + [col for col in columns if col != time_col]
+
+    start = to_utc(start) if start is not None else None
+    end = to_utc(end) if end is not None else None
+
+    filters = []
+    if start is not None:
+        filters.append((time_col, '>=', start))
+    if end is not None:
+        filters.append((time_col, '<=', end))
+
+    tables = []
+    for partition in manifest["partitions"]:
+        if start is not None and pd.Timestamp(partition["end"]) < start:
+            continue
+        if end is not None and pd.Timestamp(partition["start"]) > end:
+            continue
+        part_file = Path(store_dir) / partition["file"]
+        tables.append(pq.read_table(part_file, columns=columns, filters=filters or None))
+
+    if not tables:
+        # Aucune partition retenue (ou magasin vide): colonnes et types du manifeste
+        dtypes = store_dtypes(manifest["columns"], manifest.get("float_dtype", "float32"))
+        dtypes[time_col] = 'datetime64[ns, UTC]'
+        return pd.DataFrame({col: pd.Series(dtype=dtypes[col]) for col in columns})
+
+    return pa.concat_tables(tables).to_pandas()
+
+
+def read_columns(csv_path, config=None):
+    """
+    Retourne la liste des colonnes disponibles sans charger de données.
+
+    Utilise le manifeste du magasin colonnaire s'il est à jour, sinon
+    l'en-tête du CSV brut.
+
+    Args:
+        csv_path: Chemin vers le CSV brut OPSD
+        config: Configuration du pipeline (section 'storage')
+
+    Returns:
+        list: Noms de colonnes, colonne temporelle en premier
+    """
+    store_dir = storage_settings(config)["store_dir"]
+    if store_is_fresh(csv_path, store_dir):
+        return read_manifest(store_dir)["columns"]
+    return read_csv_header(csv_path)
+
+
+def load_timeseries(csv_path, columns=None, start=None, end=None, config=None):
+    """
+    Point d'entrée commun des scripts 02 à 04 pour charger les séries OPSD.
+
+    Utilise le magasin colonnaire s'il est à jour, sinon retombe sur la
+    lecture du CSV (avec projection des colonnes si demandée).
+
+    Args:
+        csv_path: Chemin vers le CSV brut OPSD
+        columns: Colonnes à charger (None = toutes)
+        start: Borne inférieure inclusive
+        end: Borne supérieure inclusive
+        config: Configuration du pipeline (section 'storage')
+
+    Returns:
+        pd.DataFrame
+    """
+    store_dir = storage_settings(config)["store_dir"]
+    if store_is_fresh(csv_path, store_dir):
+        logger.info(f"   Lecture depuis le magasin colonnaire: {store_dir}")
+        return read_store(store_dir, columns=columns, start=start, end=end)
+
+    logger.warning("   ⚠️  Magasin colonnaire absent ou périmé, lecture du CSV brut")
+    logger.warning("      Pour accélérer: python scripts/opsd_store.py")
+    usecols = None
+    if columns is not None:
+        time_col = read_csv_header(csv_path)[0]
+        usecols = [time_col] + [col for col in columns if col != time_col]
+    df = pd.read_csv(csv_path, usecols=usecols, parse_dates=[0], low_memory=False)
+    if usecols is not None:
+        df = df[usecols]
+
+    time_col = df.columns[0]
+    if start is not None:
+        df = df[df[time_col] >= to_utc(start)]
+    if end is not None:
+        df = df[df[time_col] <= to_utc(end)]
+    return df
+
+
+def iter_timeseries(csv_path, columns=None, chunksize=100_000, config=None):
+    """
+    Parcourt les séries OPSD par blocs de lignes, en mémoire bornée.
+
+    Utilise les lots du magasin colonnaire s'il est à jour, sinon la lecture
+    par blocs du CSV brut.
+
+    Args:
+        csv_path: Chemin vers le CSV brut OPSD
+        columns: Colonnes à lire (None = toutes)
+        chunksize: Nombre de lignes par bloc
+        config: Configuration du pipeline (section 'storage')
+
+    Yields:
+        pd.DataFrame: Blocs successifs, colonne temporelle en premier
+    """
+    store_dir = storage_settings(config)["store_dir"]
+    if store_is_fresh(csv_path, store_dir):
+        manifest = read_manifest(store_dir)
+        time_col = manifest["time_column"]
+        if columns is None:
+            columns = manifest["columns"]
+        columns = [time_col] + [col for col in columns if col != time_col]
+        for partition in manifest["partitions"]:
+            parquet_file = pq.ParquetFile(Path(store_dir) / partition["file"])
+            for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+                yield batch.to_pandas()
+        return
+
+    usecols = None
+    if columns is not None:
+        time_col = read_csv_header(csv_path)[0]
+        usecols = [time_col] + [col for col in columns if col != time_col]
+    for chunk in pd.read_csv(csv_path, usecols=usecols, parse_dates=[0],
+                             chunksize=chunksize, low_memory=False):
+        yield chunk[usecols] if usecols is not None else chunk
+
+
+def main():
+    """Construit (ou reconstruit) le magasin colonnaire depuis le CSV brut."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s: %(message)s'
+    )
+    config = load_config()
+    opsd_config = config['data_sources']['opsd_timeseries']
+    csv_path = Path(opsd_config['destination']) / opsd_config['filename']
+
+    if not csv_path.exists():
+        logger.error(f"❌ Fichier introuvable: {csv_path}")
+        logger.error("   Veuillez d'abord exécuter: python scripts/01_download_opsd_data.py")
+        sys.exit(1)
+
+    settings = storage_settings(config)
+    logger.info(f"⏳ Conversion de {csv_path} en magasin colonnaire...")
+    build_store(csv_path, settings["store_dir"],
+                float_dtype=settings["float_dtype"],
+                chunksize=settings["chunksize"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Module: Nettoyage Hors Mémoire (Out-of-Core)
+============================================
+Nettoyage par blocs de lignes de taille bornée, pour les datasets plus
+grands que la mémoire (séries OPSD 15 min, extraits multi-pays):
+
+1. passe légère: en-tête + comptage des valeurs manquantes par colonne,
+   bloc par bloc; la décision de suppression (seuil `threshold_drop`) est
+   prise sur le dataset complet, comme en mémoire
+2. passe de nettoyage: chaque bloc est rempli (forward fill borné),
+   enrichi des variables calendaires, typé selon le plan de types puis
+   écrit immédiatement dans le fichier Arrow de sortie
+
+L'état du forward fill (dernière observation et son timestamp, par
+colonne) est transmis d'un bloc au suivant: le résultat est identique au
+nettoyage en mémoire. Au plus deux blocs sont présents en mémoire.
+
+Configuration (section `cleaning`):
+    out_of_core: true
+    block_rows: 100000
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from calendar_features import add_calendar_features
+from dtype_plan import optimize_dtypes
+from fill_engine import fill_plan, forward_fill, missing_runs_of
+from opsd_store import iter_timeseries
+from temporal_integrity import timestamps_ns
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUT_OF_CORE = {"out_of_core": False, "block_rows": 100_000}
+
+
+def out_of_core_settings(config=None):
+    """Mode hors mémoire et taille des blocs (section `cleaning`)."""
+    cleaning = (config or {}).get('cleaning', {})
+    return {key: cleaning.get(key, default) for key, default in DEFAULT_OUT_OF_CORE.items()}
+
+
+def null_count_pass(input_file, columns, block_rows, config=None):
+    """
+    Première passe: nombre de lignes et de valeurs manquantes par colonne.
+
+    Returns:
+        tuple: (nombre de lignes, pd.Series des comptes de valeurs manquantes)
+    """
+    rows = 0
+    missing = pd.Series(0, index=columns, dtype='int64')
+    for chunk in iter_timeseries(input_file, columns=columns, chunksize=block_rows, config=config):
+        rows += len(chunk)
+        missing += chunk[columns].isnull().sum()
+    return rows, missing
+
+
+class BlockCleaner:
+    """
+    Nettoyage bloc par bloc d'un ensemble de colonnes retenues.
+
+    L'état du forward fill est conservé entre deux appels à `clean()`:
+    les blocs doivent être fournis dans l'ordre chronologique.
+    """
+
+    def __init__(self, time_col, kept, settings, config):
+        self.time_col = time_col
+        self.kept = list(kept)
+        self.config = config
+        self.limit_hours = settings["limit_hours"]
+        self.plan = fill_plan(self.kept, settings)
+        self.fill_columns = self.plan["forward_fill"]
+        n_fill = len(self.fill_columns)
+        self.last_values = np.full(n_fill, np.nan)
+        self.last_ts = np.full(n_fill, -1, dtype=np.int64)
+        self.filled = np.zeros(n_fill, dtype=np.int64)
+        self.remaining = pd.Series(0, index=self.kept, dtype='int64')
+        self.output_columns = None
+        self.watermark = None
+        self.rows = 0
+
+    def clean(self, chunk):
+        """
+        Nettoie un bloc brut (colonne temporelle + colonnes retenues).
+
+        Returns:
+            pd.DataFrame: Bloc prêt à être écrit (variables calendaires,
+            plan de types, index temporel)
+        """
+        chunk = chunk[[self.time_col] + self.kept]
+        ts_ns = timestamps_ns(chunk[self.time_col])
+
+        # Forward fill borné, repris depuis la dernière observation du bloc précédent
+        block = chunk[self.fill_columns].to_numpy(dtype='float64')
+        result = forward_fill(block, self.fill_columns, ts_ns,
+                              missing_runs_of(block, self.fill_columns), self.limit_hours,
+                              self.last_values, self.last_ts)
+        self.last_values, self.last_ts = result["last_values"], result["last_ts"]
+        self.filled += result["filled"]
+        chunk[self.fill_columns] = block
+        self.remaining += chunk[self.kept].isnull().sum()
+
+        if self.time_col != 'timestamp':
+            chunk = chunk.rename(columns={self.time_col: 'timestamp'})
+        add_calendar_features(chunk, 'timestamp', self.config)
+        self.output_columns = list(chunk.columns)
+        if len(chunk):
+            self.watermark = str(chunk['timestamp'].max())
+        self.rows += len(chunk)
+
+        chunk, _ = optimize_dtypes(chunk, self.config)
+        return chunk
+
+    def blocks(self, input_file, block_rows):
+        """Blocs nettoyés successifs du fichier source."""
+        columns = [self.time_col] + self.kept
+        for chunk in iter_timeseries(input_file, columns=columns, chunksize=block_rows,
+                                     config=self.config):
+            yield self.clean(chunk)
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Module: Détection des Valeurs Aberrantes (Statistiques Robustes)
+================================================================
+Marque les valeurs suspectes de chaque colonne de prix, de charge et de
+génération, avec des statistiques robustes plutôt qu'un seuil global
+μ ± 3σ (faussé par les pics et les épisodes de prix négatifs):
+
+- FLAG_ROLLING: z-score robuste par rapport à la médiane et au MAD
+  glissants de la même heure du jour (fenêtre centrée de
+  `outlier_window_hours`): écart à la tendance récente, sans que le cycle
+  journalier (solaire, charge) ne soit pris pour une anomalie
+- FLAG_HOURLY: z-score robuste par rapport à la médiane et au MAD de la
+  même heure du jour sur toute la période
+- FLAG_PRICE_FLOOR: prix sous `price_outlier_threshold` (EUR/MWh)
+- FLAG_NEGATIVE_GENERATION: génération négative
+  (si `generation_negative_check`)
+
+z robuste = 0.6745 · (x − médiane) / MAD; une valeur est marquée si
+|z| > `outlier_z_threshold`. Un MAD nul (série constante sur la fenêtre)
+ne marque rien. L'heure du jour est l'heure locale du pays de la colonne
+(fuseaux de `calendar_features.timezones`, comme les variables calendaires).
+Les calculs sont vectorisés sur un lot de colonnes à la fois (une fenêtre
+glissante pandas par heure du jour pour tout le lot).
+
+Le résultat est un masque de bits uint8 par cellule (mêmes colonnes et
+même index temporel que les données), sauvegardé au format Arrow à côté
+des données nettoyées: nettoyage et modélisation masquent les valeurs
+sans recalcul. Les médianes et MAD par heure du jour sont sauvegardés à
+côté (outlier_flags_hourly.parquet). Après un nettoyage incrémental,
+update_outlier_flags ne refait le calcul glissant que pour les lignes
+proches des nouvelles données; les statistiques par heure et FLAG_HOURLY
+sont remis à jour sur toute la période. En mode streaming (analyse de
+qualité), OutlierFlagTracker ne produit que les comptes, pendant la
+passe unique du profil, en mémoire bornée.
+
+Utilisation:
+    from outlier_flags import FLAG_PRICE_FLOOR, FLAG_ROLLING, outlier_mask, read_outlier_flags
+    flags = read_outlier_flags()
+    suspect = outlier_mask(flags, 'DE_LU_price_day_ahead', FLAG_ROLLING | FLAG_PRICE_FLOOR)
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from calendar_features import calendar_settings, country_timezone, local_offsets_ns
+from column_schema import schema_for
+from processed_data import DEFAULT_PROCESSED_FILE, open_processed, write_processed
+from streaming_stats import QuantileSketch
+from temporal_integrity import HOUR_NS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLAGS_FILE = "data/processed/outlier_flags.arrow"
+
+FLAG_ROLLING = 1
+FLAG_HOURLY = 2
+FLAG_PRICE_FLOOR = 4
+FLAG_NEGATIVE_GENERATION = 8
+FLAG_NAMES = {
+    "rolling": FLAG_ROLLING,
+    "hourly": FLAG_HOURLY,
+    "price_floor": FLAG_PRICE_FLOOR,
+    "negative_generation": FLAG_NEGATIVE_GENERATION,
+}
+ALL_FLAGS = FLAG_ROLLING | FLAG_HOURLY | FLAG_PRICE_FLOOR | FLAG_NEGATIVE_GENERATION
+
+MAD_SCALE = 0.6745      # MAD → écart-type pour une loi normale
+BATCH_COLUMNS = 32      # Colonnes traitées ensemble (mémoire bornée)
+
+DEFAULT_OUTLIER_SETTINGS = {
+    "price_outlier_threshold": -1000,
+    "generation_negative_check": True,
+    "outlier_window_hours": 720,
+    "outlier_z_threshold": 5.0,
+}
+
+
+def outlier_settings(config=None):
+    """Seuils de la section `data_quality`, avec valeurs par défaut."""
+    quality = (config or {}).get('data_quality', {})
+    settings = {key: quality.get(key, default) for key, default in DEFAULT_OUTLIER_SETTINGS.items()}
+    # Heure du jour locale: mêmes fuseaux que les variables calendaires
+    settings["timezones"] = calendar_settings(config)["timezones"]
+    return settings
+
+
+def outlier_flags_path(config=None):
+    """Fichier des drapeaux (section processed_output de la configuration)."""
+    if config:
+        return config.get('processed_output', {}).get('outlier_flags_path') or DEFAULT_FLAGS_FILE
+    return DEFAULT_FLAGS_FILE
+
+
+def outlier_columns(columns):
+    """Colonnes de prix, de charge et de génération."""
+    schema = schema_for(columns)
+    return [col for col in columns
+            if col in schema.info and schema.info[col].role in ("price", "load", "generation")]
+
+
+def robust_z(values, center, mad):
+    """z-score robuste; NaN si le MAD est nul ou indéfini."""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(mad > 0, MAD_SCALE * (values - center) / mad, np.nan)
+
+
+def hour_of_day(ts_ns, country=None, timezones=None):
+    """Heure locale du pays (UTC si le fuseau du pays est inconnu)."""
+    timezone = country_timezone(country, timezones)
+    if timezone is not None:
+        ts_ns = ts_ns + local_offsets_ns(ts_ns, timezone)
+    return (ts_ns // HOUR_NS) % 24
+
+
+def _rolling_flags(block, hours, window_days, threshold):
+    """FLAG_ROLLING d'un bloc (médiane et MAD glissants de la même heure du jour)."""
+    z_rolling = _rolling_z(block, hours, window_days)
+    with np.errstate(invalid='ignore'):
+        return np.where(np.abs(z_rolling) > threshold, FLAG_ROLLING, 0).astype(np.uint8)
+
+
+def _threshold_flags(values, infos, settings):
+    """Seuils fixes de la configuration (prix plancher, génération négative)."""
+    flags = np.zeros(values.shape, dtype=np.uint8)
+    with np.errstate(invalid='ignore'):
+        for j, info in enumerate(infos):
+            if info is None:
+                continue
+            if info.role == "price":
+                flags[values[:, j] < settings["price_outlier_threshold"], j] |= FLAG_PRICE_FLOOR
+            elif info.role == "generation" and settings["generation_negative_check"]:
+                flags[values[:, j] < 0, j] |= FLAG_NEGATIVE_GENERATION
+    return flags
+
+
+def _hourly_flags(block, hours, center, mad, threshold):
+    """FLAG_HOURLY d'un bloc: z robuste par rapport aux médianes et MAD (24 × colonnes) de l'heure."""
+    z_period = robust_z(block, center[hours], mad[hours])
+    with np.errstate(invalid='ignore'):
+        return np.where(np.abs(z_period) > threshold, FLAG_HOURLY, 0).astype(np.uint8)
+
+
+def _window_days(settings):
+    """Fenêtre glissante en jours (même heure du jour), au moins 3."""
+    return max(3, settings["outlier_window_hours"] // 24)
+
+
+def _rolling_z(block, hours, window_days):
+    """z robustes par rapport à la médiane et au MAD glissants de la même heure du jour."""
+    z_rolling = np.full(block.shape, np.nan)
+    min_periods = max(1, window_days // 4)
+    with np.errstate(invalid='ignore'):
+        for hour in range(24):
+            rows = hours == hour
+            if not rows.any():
+                continue
+            values = block[rows]
+
+            # Médiane et MAD glissants: toutes les colonnes du lot en une fenêtre
+            center = pd.DataFrame(values).rolling(window_days, center=True,
+                                                  min_periods=min_periods).median().to_numpy()
+            mad = pd.DataFrame(np.abs(values - center)).rolling(
+                window_days, center=True, min_periods=min_periods).median().to_numpy()
+            z_rolling[rows] = robust_z(values, center, mad)
+    return z_rolling
+
+
+def hourly_median_mad(block, hours):
+    """
+    Médiane et MAD de chaque colonne par heure du jour, sur toute la période.
+
+    Returns:
+        tuple: (médianes, MAD), tableaux 24 × colonnes (NaN si heure sans valeur)
+    """
+    center = np.full((24, block.shape[1]), np.nan)
+    mad = np.full((24, block.shape[1]), np.nan)
+    for hour in range(24):
+        values = block[hours == hour]
+        observed = ~np.isnan(values).all(axis=0)
+        if not observed.any():
+            continue
+        center[hour, observed] = np.nanmedian(values[:, observed], axis=0)
+        mad[hour, observed] = np.nanmedian(np.abs(values[:, observed] - center[hour, observed]),
+                                           axis=0)
+    return center, mad
+
+
+def _columns_by_country(columns):
+    """Schéma des colonnes et positions regroupées par pays (même heure locale)."""
+    schema = schema_for(columns)
+    infos = [schema.info.get(col) for col in columns]
+    by_country = {}
+    for j, info in enumerate(infos):
+        by_country.setdefault(info.country if info else None, []).append(j)
+    return infos, by_country
+
+
+def compute_flags(values, ts_ns, columns, settings=None, period_stats=None):
+    """
+    Drapeaux d'un lot de colonnes.
+
+    Args:
+        values: np.ndarray (lignes × colonnes), NaN pour les valeurs manquantes
+        ts_ns: Timestamps des lignes (int64, ns UTC, triés)
+        columns: Noms des colonnes (rôle et pays lus dans le schéma)
+        settings: outlier_settings()
+        period_stats: (médianes, MAD) par heure du jour (24 × colonnes) sur
+            toute la période; calculés sur `values` si absents
+
+    Returns:
+        np.ndarray: Masque de bits uint8 (lignes × colonnes)
+    """
+    settings = settings or dict(DEFAULT_OUTLIER_SETTINGS)
+    values = np.asarray(values, dtype=np.float64)
+    ts_ns = np.asarray(ts_ns, dtype=np.int64)
+    threshold = settings["outlier_z_threshold"]
+    window_days = _window_days(settings)
+    flags = np.zeros(values.shape, dtype=np.uint8)
+
+    # z robustes par heure du jour: colonnes regroupées par pays (même heure locale)
+    infos, by_country = _columns_by_country(columns)
+    for country, positions in by_country.items():
+        block = values[:, positions]
+        hours = hour_of_day(ts_ns, country, settings.get("timezones"))
+        if period_stats is None:
+            center, mad = hourly_median_mad(block, hours)
+        else:
+            center, mad = period_stats[0][:, positions], period_stats[1][:, positions]
+        flags[:, positions] |= _rolling_flags(block, hours, window_days, threshold)
+        flags[:, positions] |= _hourly_flags(block, hours, center, mad, threshold)
+    return flags | _threshold_flags(values, infos, settings)
+
+
+def flag_frame(df, ts_ns, settings=None):
+    """Drapeaux des colonnes prix/charge/génération d'un DataFrame, par lots de colonnes."""
+    columns = outlier_columns(list(df.columns))
+    flags = {}
+    for i in range(0, len(columns), BATCH_COLUMNS):
+        batch = columns[i:i + BATCH_COLUMNS]
+        values = compute_flags(df[batch].to_numpy(dtype='float64'), ts_ns, batch, settings)
+        flags.update(zip(batch, values.T))
+    return pd.DataFrame(flags, index=df.index, columns=columns)
+
+
+def hourly_stats_path(flags_path=DEFAULT_FLAGS_FILE):
+    """Médianes et MAD par heure du jour, sauvegardés à côté des drapeaux."""
+    flags_path = Path(flags_path)
+    return flags_path.with_name(f"{flags_path.stem}_hourly.parquet")
+
+
+def _period_stats(values, ts_ns, columns, timezones=None):
+    """Médianes et MAD par heure locale du pays de chaque colonne (24 × colonnes)."""
+    center = np.full((24, len(columns)), np.nan)
+    mad = np.full((24, len(columns)), np.nan)
+    _, by_country = _columns_by_country(columns)
+    for country, positions in by_country.items():
+        center[:, positions], mad[:, positions] = hourly_median_mad(
+            values[:, positions], hour_of_day(ts_ns, country, timezones))
+    return center, mad
+
+
+def _stats_columns():
+    """Colonnes d'identification du fichier de statistiques (une ligne par statistique et heure)."""
+    return {"statistic": ["median"] * 24 + ["mad"] * 24, "hour": list(range(24)) * 2}
+
+
+def _flags_and_hourly_stats(processed_path, config):
+    """Drapeaux du dataset nettoyé et statistiques par heure du jour (référence de FLAG_HOURLY)."""
+    settings = outlier_settings(config)
+    data = open_processed(processed_path)
+    try:
+        index = data.index()
+        ts_ns = index.asi8
+        columns = outlier_columns(data.columns)
+        flags = {}
+        stats = _stats_columns()
+        for i in range(0, len(columns), BATCH_COLUMNS):
+            batch = columns[i:i + BATCH_COLUMNS]
+            values = np.column_stack([data.column(col) for col in batch]).astype(np.float64)
+            center, mad = _period_stats(values, ts_ns, batch, settings["timezones"])
+            flags.update(zip(batch, compute_flags(values, ts_ns, batch, settings, (center, mad)).T))
+            stats.update(zip(batch, np.vstack([center, mad]).T))
+    finally:
+        data.close()
+    flags = pd.DataFrame(flags, index=pd.DatetimeIndex(index, name='timestamp'), columns=columns)
+    return flags, pd.DataFrame(stats)
+
+
+def build_outlier_flags(processed_path=DEFAULT_PROCESSED_FILE, config=None):
+    """
+    Drapeaux de toutes les colonnes prix/charge/génération du dataset nettoyé.
+
+    Les colonnes sont lues par lots depuis le fichier mappé.
+
+    Returns:
+        pd.DataFrame: uint8, même index temporel que les données
+    """
+    return _flags_and_hourly_stats(processed_path, config)[0]
+
+
+def summarize_flags(flags):
+    """Nombre de valeurs marquées par colonne et par drapeau (colonnes marquées seulement)."""
+    summary = {}
+    for col in flags.columns:
+        values = flags[col].to_numpy()
+        counts = {name: int(np.count_nonzero(values & bit)) for name, bit in FLAG_NAMES.items()}
+        if any(counts.values()):
+            summary[col] = counts
+    return summary
+
+
+class OutlierFlagTracker:
+    """
+    Comptes de summarize_flags accumulés bloc par bloc, en une seule passe
+    et en mémoire bornée (profil en flux de l'analyse de qualité).
+
+    - FLAG_ROLLING: exact; chaque bloc est évalué quand assez de lignes des
+      blocs suivants sont arrivées pour sa médiane et son MAD centrés
+    - FLAG_HOURLY: médiane, MAD et comptes lus dans un QuantileSketch par
+      heure du jour et par colonne; exacts pour des valeurs au centime
+      (précision des séries OPSD), à la résolution du sketch près sinon
+    - FLAG_PRICE_FLOOR, FLAG_NEGATIVE_GENERATION: exacts
+    """
+
+    def __init__(self, columns, settings=None):
+        self.columns = list(columns)
+        self.settings = settings or dict(DEFAULT_OUTLIER_SETTINGS)
+        self.rows = 0
+        self._infos, self._by_country = _columns_by_country(self.columns)
+        self._window_days = _window_days(self.settings)
+        # Lignes de contexte: médiane puis MAD centrés, plus une marge de deux jours
+        self._context = 24 * (2 * (self._window_days // 2) + 2)
+        self._sketches = [[QuantileSketch() for _ in self.columns] for _ in range(24)]
+        self._counts = np.zeros((len(self.columns), len(FLAG_NAMES)), dtype=np.int64)
+        self._ts = np.empty(0, dtype=np.int64)
+        self._values = np.empty((0, len(self.columns)))
+        self._start = 0   # Première ligne du tampon pas encore comptée
+
+    def _count(self, flags):
+        for b, bit in enumerate(FLAG_NAMES.values()):
+            self._counts[:, b] += np.count_nonzero(flags & bit, axis=0)
+
+    def _count_rolling(self, end):
+        """Compte FLAG_ROLLING des lignes [début, end) du tampon."""
+        threshold = self.settings["outlier_z_threshold"]
+        flags = np.zeros((end - self._start, len(self.columns)), dtype=np.uint8)
+        for country, positions in self._by_country.items():
+            hours = hour_of_day(self._ts, country, self.settings.get("timezones"))
+            flags[:, positions] = _rolling_flags(self._values[:, positions], hours,
+                                                 self._window_days, threshold)[self._start:end]
+        self._count(flags)
+        self._start = end
+
+    def update(self, ts_ns, values):
+        """Ajoute un bloc (timestamps int64 ns UTC, valeurs lignes × colonnes)."""
+        ts_ns = np.asarray(ts_ns, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        self.rows += len(ts_ns)
+        self._count(_threshold_flags(values, self._infos, self.settings))
+        for country, positions in self._by_country.items():
+            hours = hour_of_day(ts_ns, country, self.settings.get("timezones"))
+            for hour in range(24):
+                block = values[hours == hour]
+                for j in positions:
+                    column = block[:, j]
+                    self._sketches[hour][j].update(column[~np.isnan(column)])
+
+        # Lignes dont le contexte suivant est complet: comptées puis retirées du tampon
+        self._ts = np.concatenate([self._ts, ts_ns])
+        self._values = np.concatenate([self._values, values])
+        ready = len(self._ts) - self._context
+        if ready > self._start:
+            self._count_rolling(ready)
+            cut = max(0, ready - self._context)
+            self._ts, self._values = self._ts[cut:], self._values[cut:]
+            self._start -= cut
+
+    def finish(self):
+        """
+        Returns:
+            dict: Comptes par colonne et par drapeau (colonnes marquées seulement)
+        """
+        if len(self._ts) > self._start:
+            self._count_rolling(len(self._ts))
+        threshold = self.settings["outlier_z_threshold"]
+        hourly = list(FLAG_NAMES).index("hourly")
+        for row in self._sketches:
+            for j, sketch in enumerate(row):
+                center = sketch.median()
+                mad = sketch.median_absolute_deviation(center)
+                if mad > 0:
+                    limit = threshold * mad / MAD_SCALE
+                    self._counts[j, hourly] += (sketch.count_above(center + limit)
+                                                + sketch.count_below(center - limit))
+        return {col: dict(zip(FLAG_NAMES, map(int, row)))
+                for col, row in zip(self.columns, self._counts) if row.any()}
+
+
+def write_outlier_flags(processed_path=DEFAULT_PROCESSED_FILE, output_path=DEFAULT_FLAGS_FILE,
+                        config=None):
+    """Calcule et sauvegarde les drapeaux (Arrow IPC, lisible par memory-map)."""
+    flags, stats = _flags_and_hourly_stats(processed_path, config)
+    write_processed(flags, output_path)
+    stats.to_parquet(hourly_stats_path(output_path), index=False)
+    return flags
+
+
+def update_outlier_flags(processed_path=DEFAULT_PROCESSED_FILE, output_path=DEFAULT_FLAGS_FILE,
+                         config=None):
+    """
+    Complète les drapeaux après un ajout de lignes au dataset nettoyé.
+
+    Seules les lignes dont la fenêtre glissante (médiane puis MAD centrés)
+    atteint les nouvelles lignes passent par le calcul glissant, avec
+    l'historique utile à leurs fenêtres. Les médianes et MAD par heure du
+    jour sont recalculés sur toute la période (nouvelles lignes comprises),
+    sauvegardés, et FLAG_HOURLY est réévalué sur tout l'historique: le
+    résultat est identique à un calcul complet. Le fichier de drapeaux
+    (uint8) est réécrit. Calcul complet si les drapeaux existants ne
+    correspondent pas au début du dataset.
+
+    Returns:
+        int: Nombre de lignes dont les drapeaux glissants ont été recalculés
+    """
+    if not Path(output_path).exists():
+        return len(write_outlier_flags(processed_path, output_path, config))
+
+    settings = outlier_settings(config)
+    threshold = settings["outlier_z_threshold"]
+    existing = open_processed(output_path)
+    data = open_processed(processed_path)
+    try:
+        index = data.index()
+        old_index = existing.index()
+        columns = existing.columns
+        consistent = (columns == outlier_columns(data.columns) and len(old_index) <= len(index)
+                      and (len(old_index) == 0 or old_index[-1] == index[len(old_index) - 1]))
+        if consistent:
+            # Lignes touchées par les nouvelles valeurs, puis historique de leurs fenêtres
+            reach = 24 * (2 * (_window_days(settings) // 2) + 1)
+            keep = max(0, len(old_index) - reach)
+            start = max(0, keep - reach)
+            ts_ns = index.asi8
+            flags = {}
+            stats = _stats_columns()
+            for i in range(0, len(columns), BATCH_COLUMNS):
+                batch = columns[i:i + BATCH_COLUMNS]
+                values = np.column_stack([data.column(col) for col in batch]).astype(np.float64)
+                center, mad = _period_stats(values, ts_ns, batch, settings["timezones"])
+                stats.update(zip(batch, np.vstack([center, mad]).T))
+                tail = compute_flags(values[start:], ts_ns[start:], batch, settings,
+                                     (center, mad))[keep - start:]
+
+                # Lignes conservées: bits glissants et seuils fixes inchangés, FLAG_HOURLY réévalué
+                kept = np.column_stack([existing.column(col)[:keep] for col in batch])
+                kept = kept & np.uint8(ALL_FLAGS & ~FLAG_HOURLY)
+                _, by_country = _columns_by_country(batch)
+                for country, positions in by_country.items():
+                    hours = hour_of_day(ts_ns[:keep], country, settings["timezones"])
+                    kept[:, positions] |= _hourly_flags(values[:keep, positions], hours,
+                                                        center[:, positions], mad[:, positions],
+                                                        threshold)
+                flags.update(zip(batch, np.vstack([kept, tail]).T))
+            flags = pd.DataFrame(flags, index=pd.DatetimeIndex(index, name='timestamp'),
+                                 columns=columns)
+    finally:
+        data.close()
+        existing.close()
+    if not consistent:
+        return len(write_outlier_flags(processed_path, output_path, config))
+    write_processed(flags, output_path)
+    pd.DataFrame(stats).to_parquet(hourly_stats_path(output_path), index=False)
+    return len(index) - keep
+
+
+def read_outlier_flags(path=DEFAULT_FLAGS_FILE):
+    """Ouvre les drapeaux par memory-map (colonnes uint8 sans copie)."""
+    return open_processed(path)
+
+
+def outlier_mask(flags, column, bits=ALL_FLAGS):
+    """
+    Masque booléen des valeurs marquées d'une colonne.
+
+    Args:
+        flags: Drapeaux (read_outlier_flags() ou DataFrame de build_outlier_flags)
+        column: Colonne de données
+        bits: Drapeaux à considérer (ex. FLAG_ROLLING | FLAG_PRICE_FLOOR)
+    """
+    values = flags.column(column) if hasattr(flags, 'column') else flags[column].to_numpy()
+    return (values & bits) != 0
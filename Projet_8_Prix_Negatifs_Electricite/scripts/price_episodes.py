@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Module: Index des Épisodes de Prix Négatifs
+============================================
+Transforme chaque colonne de prix day-ahead du dataset nettoyé en une table
+compacte d'épisodes: suites d'heures consécutives à prix strictement
+négatif. Une heure manquante (NaN ou timestamp absent) interrompt
+l'épisode.
+
+Pour chaque épisode:
+- start, end: première et dernière heure négative (UTC)
+- duration_h: nombre d'heures
+- min_price, mean_price: prix minimal et moyen (EUR/MWh)
+- weighted_price: profondeur pondérée par l'énergie (prix moyen pondéré
+  par la charge réelle de la zone, à défaut du pays)
+- energy_mwh: énergie consommée pendant l'épisode (charge cumulée)
+- mean_wind_mw, mean_solar_mw: génération moyenne de la zone (à défaut du pays)
+
+L'index est calculé à la fin du nettoyage et sauvegardé à côté des données
+nettoyées: les requêtes sur les épisodes parcourent quelques centaines de
+lignes au lieu des séries horaires complètes. Après un nettoyage
+incrémental, update_episode_index ne parcourt que les nouvelles lignes
+(et l'épisode resté ouvert au filigrane).
+
+Utilisation:
+    from price_episodes import read_episodes
+    episodes = read_episodes(country='DE')
+    episodes[episodes.mean_wind_mw > 20_000].nlargest(10, 'duration_h')
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from column_schema import schema_for
+from opsd_store import to_utc
+from processed_data import DEFAULT_PROCESSED_FILE, open_processed
+from temporal_integrity import HOUR_NS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EPISODES_FILE = "data/processed/negative_price_episodes.parquet"
+
+
+def episodes_path(config=None):
+    """Fichier de l'index d'épisodes (section processed_output de la configuration)."""
+    if config:
+        return config.get('processed_output', {}).get('episodes_path') or DEFAULT_EPISODES_FILE
+    return DEFAULT_EPISODES_FILE
+
+
+def _companion_columns(schema, price_info, variable, metric):
+    """
+    Colonnes associées à une colonne de prix: même zone de prix si
+    disponible, sinon niveau pays. Une variable totale (ex. 'wind') est
+    préférée à la somme de ses composantes (onshore + offshore).
+    """
+    candidates = [
+        info for info in (schema.info[name] for name in schema.columns_for(price_info.country))
+        if info.metric == metric and info.variable.startswith(variable)
+    ]
+    for zone_match in (lambda info: info.zone == price_info.zone,
+                       lambda info: info.zone_type == "country"):
+        matching = [info for info in candidates if zone_match(info)]
+        if not matching:
+            continue
+        total = [info.name for info in matching if info.variable == variable]
+        return total[:1] or [info.name for info in matching]
+    return []
+
+
+def _sum_columns(data, names, start=0):
+    """Somme des colonnes à partir de la ligne `start` (NaN si toutes manquantes), ou None."""
+    if not names:
+        return None
+    values = np.vstack([np.asarray(data.column(name)[start:], dtype=np.float64) for name in names])
+    total = np.nansum(values, axis=0)
+    total[np.isnan(values).all(axis=0)] = np.nan
+    return total
+
+
+def _reduce(ufunc, values, starts, ends):
+    """Réduction de `values` sur chaque épisode [start, end] (un seul reduceat)."""
+    # Sentinelle: end + 1 reste un indice valide pour le dernier épisode
+    padded = np.append(np.asarray(values, dtype=np.float64), 0.0)
+    bounds = np.empty(2 * len(starts), dtype=np.int64)
+    bounds[0::2] = starts
+    bounds[1::2] = ends + 1
+    return ufunc.reduceat(padded, bounds)[0::2]
+
+
+def _mean(values, starts, ends):
+    """Moyenne de `values` sur chaque épisode (NaN ignorés)."""
+    if values is None:
+        return np.full(len(starts), np.nan)
+    valid = ~np.isnan(values)
+    sums = _reduce(np.add, np.where(valid, values, 0.0), starts, ends)
+    counts = _reduce(np.add, valid, starts, ends)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def price_episodes(prices, ts_ns, load=None, wind=None, solar=None):
+    """
+    Épisodes de prix négatifs d'une série horaire.
+
+    Args:
+        prices: Prix (np.ndarray), NaN pour les heures manquantes
+        ts_ns: Timestamps (ns UTC, triés)
+        load, wind, solar: Séries associées alignées sur `prices` (ou None)
+
+    Returns:
+        pd.DataFrame: un épisode par ligne (voir en-tête du module)
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    ts_ns = np.asarray(ts_ns, dtype=np.int64)
+    negative = prices < 0
+
+    # Un épisode se poursuit si l'heure précédente est négative et contiguë
+    contiguous = np.diff(ts_ns) == HOUR_NS
+    continues = np.concatenate([[False], negative[:-1] & contiguous])
+    goes_on = np.concatenate([negative[1:] & contiguous, [False]])
+    starts = np.flatnonzero(negative & ~continues)
+    ends = np.flatnonzero(negative & ~goes_on)
+
+    duration = (ends - starts + 1).astype(np.int32)
+    mean_price = _reduce(np.add, prices, starts, ends) / np.maximum(duration, 1)
+
+    # Profondeur pondérée par l'énergie; moyenne simple si la charge manque
+    weighted_price = mean_price
+    energy = np.full(len(starts), np.nan)
+    if load is not None:
+        weights = np.where(np.isnan(load), 0.0, load)
+        total = _reduce(np.add, weights, starts, ends)
+        weighted = _reduce(np.add, weights * np.where(negative, prices, 0.0), starts, ends)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weighted_price = np.where(total > 0, weighted / total, mean_price)
+        energy = np.where(total > 0, total, np.nan)
+
+    return pd.DataFrame({
+        "start": pd.to_datetime(ts_ns[starts], utc=True),
+        "end": pd.to_datetime(ts_ns[ends], utc=True),
+        "duration_h": duration,
+        "min_price": _reduce(np.minimum, prices, starts, ends),
+        "mean_price": mean_price,
+        "weighted_price": weighted_price,
+        "energy_mwh": energy,
+        "mean_wind_mw": _mean(wind, starts, ends),
+        "mean_solar_mw": _mean(solar, starts, ends),
+    })
+
+
+def _price_series(data, schema, name, start=0):
+    """
+    Prix d'une colonne day-ahead et séries associées, à partir de la ligne `start`.
+
+    Returns:
+        tuple: (prix, dict load/wind/solar → np.ndarray ou None)
+    """
+    info = schema.info[name]
+    companions = {
+        key: _sum_columns(data, _companion_columns(schema, info, variable, metric), start)
+        for key, variable, metric in (("load", "load", "actual"),
+                                      ("wind", "wind", "generation_actual"),
+                                      ("solar", "solar", "generation_actual"))
+    }
+    return data.column(name)[start:], companions
+
+
+def _labelled(episodes, name, info):
+    """Ajoute les colonnes d'identification (colonne de prix, pays, zone)."""
+    episodes.insert(0, "zone", info.zone)
+    episodes.insert(0, "country", info.country)
+    episodes.insert(0, "column", name)
+    return episodes
+
+
+def _as_index(frames):
+    """Assemble les épisodes de toutes les colonnes (clés catégorielles)."""
+    if not frames:
+        return pd.DataFrame()
+    episodes = pd.concat(frames, ignore_index=True)
+    for key in ("column", "country", "zone"):
+        episodes[key] = episodes[key].astype('category')
+    return episodes
+
+
+def build_episode_index(processed_path=DEFAULT_PROCESSED_FILE):
+    """
+    Index des épisodes de toutes les colonnes de prix day-ahead du dataset nettoyé.
+
+    Returns:
+        pd.DataFrame: column, country, zone + colonnes de `price_episodes`
+    """
+    data = open_processed(processed_path)
+    try:
+        schema = schema_for(data.columns)
+        ts_ns = data.index().asi8
+        frames = []
+        for name in schema.columns_for(role="price", metric="day_ahead"):
+            prices, companions = _price_series(data, schema, name)
+            frames.append(_labelled(price_episodes(prices, ts_ns, **companions),
+                                    name, schema.info[name]))
+    finally:
+        data.close()
+    return _as_index(frames)
+
+
+def write_episode_index(processed_path=DEFAULT_PROCESSED_FILE, output_path=DEFAULT_EPISODES_FILE):
+    """Calcule et sauvegarde l'index des épisodes (Parquet)."""
+    episodes = build_episode_index(processed_path)
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    episodes.to_parquet(output_path, index=False)
+    return episodes
+
+
+def update_episode_index(processed_path=DEFAULT_PROCESSED_FILE, output_path=DEFAULT_EPISODES_FILE,
+                         watermark=None):
+    """
+    Complète l'index après un ajout de lignes au dataset nettoyé.
+
+    Les épisodes encore ouverts au dernier filigrane (dernière heure
+    traitée négative) sont retirés, puis le parcours reprend au début de
+    l'épisode ouvert, ou à la première nouvelle ligne: seules ces lignes
+    passent par `price_episodes`.
+
+    Args:
+        watermark: Dernier timestamp de l'index existant (filigrane du nettoyage)
+
+    Returns:
+        pd.DataFrame: Index complet
+    """
+    output_path = Path(output_path)
+    if watermark is None or not output_path.exists():
+        return write_episode_index(processed_path, output_path)
+    existing = pd.read_parquet(output_path)
+    if "column" not in existing.columns:
+        return write_episode_index(processed_path, output_path)
+    watermark = to_utc(watermark)
+
+    data = open_processed(processed_path)
+    try:
+        schema = schema_for(data.columns)
+        ts_ns = data.index().asi8
+        first_new = int(np.searchsorted(ts_ns, watermark.value, side='right'))
+        frames = []
+        for name in schema.columns_for(role="price", metric="day_ahead"):
+            old = existing[existing["column"] == name]
+            still_open = (old["end"] == watermark).to_numpy()
+            resume = first_new
+            if still_open.any():
+                resume = int(np.searchsorted(ts_ns, old["start"][still_open].iloc[0].value))
+            # Seules les lignes à partir de la reprise sont lues et parcourues
+            prices, companions = _price_series(data, schema, name, resume)
+            frames.append(old[~still_open].astype({key: object for key in ("column", "country", "zone")}))
+            frames.append(_labelled(price_episodes(prices, ts_ns[resume:], **companions),
+                                    name, schema.info[name]))
+    finally:
+        data.close()
+    episodes = _as_index(frames)
+    episodes.to_parquet(output_path, index=False)
+    return episodes
+
+
+def read_episodes(path=DEFAULT_EPISODES_FILE, country=None, column=None, min_duration=None):
+    """
+    Lit l'index des épisodes (filtres appliqués à la lecture Parquet).
+
+    Args:
+        path: Fichier de l'index
+        country: Code pays (ex. 'DE')
+        column: Colonne de prix (ex. 'DK_1_price_day_ahead')
+        min_duration: Durée minimale en heures
+    """
+    filters = []
+    if country is not None:
+        filters.append(("country", "==", country))
+    if column is not None:
+        filters.append(("column", "==", column))
+    if min_duration is not None:
+        filters.append(("duration_h", ">=", min_duration))
+    return pd.read_parquet(path, filters=filters or None)
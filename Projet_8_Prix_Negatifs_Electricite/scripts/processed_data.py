@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Module: Données Nettoyées (Format Binaire Mappé en Mémoire)
+============================================================
+Écriture et lecture du dataset nettoyé au format Arrow IPC non compressé.
+Le fichier est ouvert par memory-map: plusieurs processus d'analyse sur la
+même machine partagent la même copie disque (cache de pages), et les
+colonnes sont exposées comme vues NumPy sans copie.
+
+Les NaN sont stockés comme valeurs flottantes (pas de masque de validité),
+ce qui rend les vues sans copie possibles pour toutes les colonnes.
+
+Les lignes ajoutées par un nettoyage incrémental sont écrites dans des
+segments séparés (<fichier>.segments/), relus à la suite du fichier
+principal: un ajout n'écrit que les nouvelles lignes. Au-delà de
+MAX_SEGMENTS segments, le tout est compacté en un seul lot.
+
+Utilisation:
+    from processed_data import open_processed
+    data = open_processed()
+    prices = data.column('DE_LU_price_day_ahead')   # np.ndarray, sans copie
+    df = data.to_pandas(['DE_load_actual_entsoe_transparency'])
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+DEFAULT_PROCESSED_FILE = "data/processed/opsd_clean_focus_countries.arrow"
+INDEX_METADATA_KEY = b"index_column"
+BASE_ID_METADATA_KEY = b"base_id"   # Relie les segments au fichier principal qu'ils complètent
+MAX_SEGMENTS = 16                   # Segments d'ajout avant compactage
+
+
+def processed_settings(config=None):
+    """Paramètres de sortie du nettoyage avec valeurs par défaut."""
+    settings = {"path": DEFAULT_PROCESSED_FILE, "csv_export": False}
+    if config and config.get('processed_output'):
+        settings.update(config['processed_output'])
+    return settings
+
+
+def _to_table(df):
+    """DataFrame (index temporel optionnel) → table Arrow sans masque de validité."""
+    columns = {}
+    metadata = {}
+    if isinstance(df.index, pd.DatetimeIndex):
+        name = df.index.name or 'timestamp'
+        columns[name] = pa.Array.from_pandas(df.index)
+        metadata[INDEX_METADATA_KEY] = name.encode()
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series):
+            # from_pandas=False: les NaN restent des NaN (pas de nulls)
+            columns[col] = pa.array(series.to_numpy(), from_pandas=False)
+        else:
+            columns[col] = pa.Array.from_pandas(series)
+    table = pa.table(columns)
+    return table.replace_schema_metadata(metadata)
+
+
+def segments_dir(path=DEFAULT_PROCESSED_FILE):
+    """Répertoire des segments d'ajout d'un fichier."""
+    path = Path(path)
+    return path.with_name(path.name + '.segments')
+
+
+def _with_base_id(schema):
+    """Schéma d'un nouveau fichier principal, avec un identifiant neuf."""
+    metadata = dict(schema.metadata or {})
+    metadata[BASE_ID_METADATA_KEY] = uuid.uuid4().hex.encode()
+    return schema.with_metadata(metadata)
+
+
+def _write_tmp(table, path):
+    """Écrit une table en un seul lot (record batch) dans un fichier temporaire."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with pa.OSFile(str(tmp_path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table.combine_chunks(), max_chunksize=None)
+    return tmp_path
+
+
+def _publish(tmp_path, path):
+    """Remplace le fichier principal; ses anciens segments sont supprimés."""
+    os.replace(tmp_path, path)
+    # Segments d'un autre fichier principal: déjà ignorés à la lecture (base_id)
+    shutil.rmtree(segments_dir(path), ignore_errors=True)
+
+
+def _write_table(table, path):
+    """Écriture atomique d'une table en un seul lot (nouveau fichier principal)."""
+    table = table.replace_schema_metadata(_with_base_id(table.schema).metadata)
+    _publish(_write_tmp(table, path), path)
+
+
+def write_processed(df, path=DEFAULT_PROCESSED_FILE):
+    """Écrit le dataset nettoyé au format Arrow IPC non compressé."""
+    _write_table(_to_table(df), path)
+    return Path(path)
+
+
+def write_processed_blocks(frames, path=DEFAULT_PROCESSED_FILE):
+    """
+    Écrit le dataset nettoyé bloc par bloc (un lot Arrow par bloc), sans
+    jamais le matérialiser en entier. Le schéma est celui du premier bloc.
+
+    Les colonnes sont alors réparties sur plusieurs lots: `column()` les
+    assemble (copie de la seule colonne demandée).
+
+    Args:
+        frames: Itérable de DataFrames de même structure
+
+    Returns:
+        int: Nombre de lignes écrites
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    rows = 0
+    with pa.OSFile(str(tmp_path), 'wb') as sink:
+        writer = schema = None
+        for df in frames:
+            table = _to_table(df)
+            if writer is None:
+                schema = _with_base_id(table.schema)
+                writer = pa.ipc.new_file(sink, schema)
+            writer.write_table(table.cast(schema).combine_chunks(), max_chunksize=None)
+            rows += table.num_rows
+        if writer is None:
+            raise ValueError("Aucun bloc à écrire")
+        writer.close()
+    _publish(tmp_path, path)
+    return rows
+
+
+def append_processed(df, path=DEFAULT_PROCESSED_FILE):
+    """
+    Ajoute des lignes au dataset nettoyé.
+
+    Seules les nouvelles lignes sont écrites, dans un segment séparé
+    (écriture atomique). Au-delà de MAX_SEGMENTS segments, ou si le fichier
+    principal n'a pas d'identifiant, tout est réécrit en un seul lot pour
+    que les colonnes redeviennent contiguës (vues sans copie); l'existant
+    est lu par memory-map, sans aucun parsing.
+    """
+    path = Path(path)
+    data = open_processed(path)
+    try:
+        schema = data.table.schema
+        new_table = _to_table(df).cast(schema).replace_schema_metadata(schema.metadata)
+        if data.base_id is None or data.segments >= MAX_SEGMENTS:
+            # Compactage: le fichier mappé est fermé avant son remplacement
+            table = pa.concat_tables([data.table, new_table])
+            tmp_path = _write_tmp(table.replace_schema_metadata(_with_base_id(schema).metadata), path)
+        else:
+            tmp_path = None
+    finally:
+        data.close()
+    if tmp_path is not None:
+        _publish(tmp_path, path)
+        return path
+
+    directory = segments_dir(path)
+    directory.mkdir(exist_ok=True)
+    numbers = [int(p.stem) for p in directory.glob('*.arrow') if p.stem.isdigit()]
+    segment = directory / f"{max(numbers, default=0) + 1:06d}.arrow"
+    os.replace(_write_tmp(new_table, segment), segment)
+    return path
+
+
+class ProcessedData:
+    """Dataset nettoyé ouvert par memory-map."""
+
+    def __init__(self, path=DEFAULT_PROCESSED_FILE):
+        self.path = Path(path)
+        self._sources = [pa.memory_map(str(self.path), 'r')]
+        base = pa.ipc.open_file(self._sources[0]).read_all()
+        metadata = base.schema.metadata or {}
+        self.index_column = metadata.get(INDEX_METADATA_KEY, b'').decode() or None
+        self.base_id = metadata.get(BASE_ID_METADATA_KEY)
+
+        # Segments d'ajout de ce fichier principal, dans l'ordre d'écriture
+        tables = [base]
+        if self.base_id is not None:
+            for segment in sorted(segments_dir(self.path).glob('*.arrow')):
+                source = pa.memory_map(str(segment), 'r')
+                table = pa.ipc.open_file(source).read_all()
+                if (table.schema.metadata or {}).get(BASE_ID_METADATA_KEY) != self.base_id:
+                    source.close()
+                    continue
+                self._sources.append(source)
+                tables.append(table)
+        self.segments = len(tables) - 1
+        self.table = pa.concat_tables(tables) if self.segments else base
+
+    @property
+    def columns(self):
+        """Colonnes de données (hors index temporel)."""
+        return [name for name in self.table.column_names if name != self.index_column]
+
+    def __len__(self):
+        return self.table.num_rows
+
+    def column(self, name):
+        """Vue NumPy d'une colonne, sans copie (lecture seule; copie si segments)."""
+        chunked = self.table.column(name)
+        if chunked.num_chunks == 1:
+            return chunked.chunk(0).to_numpy(zero_copy_only=True)
+        return chunked.to_numpy()
+
+    def index(self):
+        """Index temporel (DatetimeIndex avec fuseau), ou colonne 'timestamp' à défaut."""
+        name = self.index_column
+        if name is None:
+            if 'timestamp' not in self.table.column_names:
+                return None
+            name = 'timestamp'
+        return pd.DatetimeIndex(self.table.column(name).to_pandas(), name=name)
+
+    def take(self, rows):
+        """Matérialise uniquement les lignes demandées (positions)."""
+        df = self.table.take(rows).to_pandas()
+        if self.index_column is not None:
+            df = df.set_index(self.index_column)
+        return df
+
+    def to_pandas(self, columns=None):
+        """Matérialise un DataFrame (toutes les colonnes ou une sélection)."""
+        names = self.columns if columns is None else list(columns)
+        if self.index_column is not None:
+            names = [self.index_column] + [name for name in names if name != self.index_column]
+        df = self.table.select(names).to_pandas()
+        if self.index_column is not None:
+            df = df.set_index(self.index_column)
+        return df
+
+    def close(self):
+        for source in self._sources:
+            source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_processed(path=DEFAULT_PROCESSED_FILE):
+    """Ouvre le dataset nettoyé par memory-map."""
+    return ProcessedData(path)
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Module: Requêtes Différées sur les Données Nettoyées
+====================================================
+Couche de requêtes paresseuse au-dessus du fichier Arrow nettoyé
+(processed_data.py). Une requête décrit une sélection (pays, métriques,
+période) et un filtre; rien n'est lu avant `collect()`.
+
+Le plan est établi sur le seul schéma du fichier, avant toute lecture:
+- projection: seules les colonnes sélectionnées et celles du filtre
+- élagage temporel: la plage de lignes [start, end) est trouvée par
+  recherche dichotomique sur la colonne temporelle (triée)
+
+Le fichier étant ouvert par memory-map, seules les pages des colonnes et
+des lignes retenues sont effectivement lues sur disque.
+
+Utilisation:
+    from processed_query import select, price, col
+
+    query = select(['DE'], ['price'], start='2019-01-01', end='2020-01-01').where(price < 0)
+    query.plan()       # colonnes et plage de lignes, sans I/O
+    df = query.collect()
+
+    select(['DK'], ['wind'], start='2019-06').where(col('DK_1_price_day_ahead') < 0).count()
+
+Métriques: une métrique désigne le rôle ('price', 'generation', 'load'),
+la variable ('solar', 'wind_onshore'...), la mesure ('day_ahead',
+'capacity'...) ou la combinaison variable_mesure ('solar_generation_actual').
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import operator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from column_schema import schema_for
+from processed_data import DEFAULT_PROCESSED_FILE, INDEX_METADATA_KEY, open_processed
+
+OPERATORS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt,
+    ">=": operator.ge, "==": operator.eq, "!=": operator.ne,
+}
+
+
+# ============================================================================
+# EXPRESSIONS DE FILTRE
+# ============================================================================
+
+class Field:
+    """
+    Référence à une colonne (`col`) ou à toutes les colonnes d'un rôle de la
+    sélection (`role`). Une condition sur un rôle est vraie si elle l'est
+    pour au moins une de ses colonnes.
+    """
+
+    def __init__(self, name, is_role=False):
+        self.name = name
+        self.is_role = is_role
+
+    def _compare(self, symbol, value):
+        return Condition(self, symbol, value)
+
+    def __lt__(self, value):
+        return self._compare("<", value)
+
+    def __le__(self, value):
+        return self._compare("<=", value)
+
+    def __gt__(self, value):
+        return self._compare(">", value)
+
+    def __ge__(self, value):
+        return self._compare(">=", value)
+
+    def __eq__(self, value):
+        return self._compare("==", value)
+
+    def __ne__(self, value):
+        return self._compare("!=", value)
+
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        return f"{'role' if self.is_role else 'col'}({self.name!r})"
+
+
+class Predicate:
+    """Combinaison de conditions (&, |, ~)."""
+
+    def __and__(self, other):
+        return Combined("&", self, other)
+
+    def __or__(self, other):
+        return Combined("|", self, other)
+
+    def __invert__(self):
+        return Negated(self)
+
+
+class Condition(Predicate):
+    def __init__(self, field, symbol, value):
+        self.field = field
+        self.symbol = symbol
+        self.value = value
+
+    def fields(self):
+        return [self.field]
+
+    def evaluate(self, columns_of, read):
+        mask = None
+        for name in columns_of(self.field):
+            result = OPERATORS[self.symbol](read(name), self.value)
+            mask = result if mask is None else mask | result
+        return mask
+
+    def __repr__(self):
+        return f"{self.field!r} {self.symbol} {self.value!r}"
+
+
+class Combined(Predicate):
+    def __init__(self, symbol, left, right):
+        self.symbol = symbol
+        self.left = left
+        self.right = right
+
+    def fields(self):
+        return self.left.fields() + self.right.fields()
+
+    def evaluate(self, columns_of, read):
+        left = self.left.evaluate(columns_of, read)
+        right = self.right.evaluate(columns_of, read)
+        return (left & right) if self.symbol == "&" else (left | right)
+
+    def __repr__(self):
+        return f"({self.left!r} {self.symbol} {self.right!r})"
+
+
+class Negated(Predicate):
+    def __init__(self, inner):
+        self.inner = inner
+
+    def fields(self):
+        return self.inner.fields()
+
+    def evaluate(self, columns_of, read):
+        return ~self.inner.evaluate(columns_of, read)
+
+    def __repr__(self):
+        return f"~{self.inner!r}"
+
+
+def col(name):
+    """Colonne désignée par son nom."""
+    return Field(name)
+
+
+def role(name):
+    """Toutes les colonnes d'un rôle ('price', 'generation', 'load') de la sélection."""
+    return Field(name, is_role=True)
+
+
+price = role("price")
+generation = role("generation")
+load = role("load")
+
+
+# ============================================================================
+# REQUÊTE
+# ============================================================================
+
+def _matches_metric(info, metrics):
+    candidates = {info.role, info.variable, info.metric, f"{info.variable}_{info.metric}"}
+    return not candidates.isdisjoint(metrics)
+
+
+def _utc_timestamp(value):
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_localize('UTC') if timestamp.tzinfo is None else timestamp.tz_convert('UTC')
+
+
+class Query:
+    """
+    Requête différée sur le fichier nettoyé. Chaque méthode renvoie une
+    nouvelle requête; la lecture n'a lieu qu'à `collect()`, `to_arrow()`
+    ou `count()`.
+    """
+
+    def __init__(self, path=DEFAULT_PROCESSED_FILE, countries=None, metrics=None,
+                 start=None, end=None, columns=None, predicate=None):
+        self.path = path
+        self.countries = list(countries) if countries else None
+        self.metrics = set(metrics) if metrics else None
+        self.start = start
+        self.end = end
+        self.columns = list(columns) if columns else []
+        self.predicate = predicate
+
+    def _replace(self, **changes):
+        params = dict(path=self.path, countries=self.countries, metrics=self.metrics,
+                      start=self.start, end=self.end, columns=self.columns,
+                      predicate=self.predicate)
+        params.update(changes)
+        return Query(**params)
+
+    def where(self, predicate):
+        """Ajoute un filtre (combiné par ET avec le filtre existant)."""
+        if self.predicate is not None:
+            predicate = self.predicate & predicate
+        return self._replace(predicate=predicate)
+
+    def between(self, start=None, end=None):
+        """Restreint la période: start inclus, end exclu (UTC si sans fuseau)."""
+        return self._replace(start=start, end=end)
+
+    # ------------------------------------------------------------------
+    # Planification (schéma uniquement)
+    # ------------------------------------------------------------------
+
+    def _file_schema(self):
+        with pa.memory_map(str(self.path), 'r') as source:
+            return pa.ipc.open_file(source).schema
+
+    def plan(self):
+        """
+        Colonnes projetées et colonnes du filtre, établies sur le seul schéma.
+
+        Returns:
+            dict: time_column, columns (sortie), filter_columns (lues en plus),
+            start, end, predicate
+        """
+        file_schema = self._file_schema()
+        metadata = file_schema.metadata or {}
+        index_column = metadata.get(INDEX_METADATA_KEY, b'').decode() or None
+        time_column = index_column or ('timestamp' if 'timestamp' in file_schema.names else None)
+        names = [name for name in file_schema.names if name != time_column]
+        schema = schema_for(names)
+
+        if self.countries is None:
+            candidates = [name for name in names if schema.info[name].country is not None]
+        else:
+            candidates = [name for country in self.countries for name in schema.columns_for(country)]
+        if self.metrics is not None:
+            candidates = [name for name in candidates if _matches_metric(schema.info[name], self.metrics)]
+        selected = list(dict.fromkeys(candidates + self.columns))
+        missing = [name for name in selected if name not in schema.info]
+        if missing:
+            raise KeyError(f"Colonnes absentes du fichier nettoyé: {missing}")
+
+        # Colonnes du filtre: rôle → colonnes de ce rôle dans la sélection,
+        # à défaut dans les pays sélectionnés
+        scope = selected if self.countries is None else [
+            name for country in self.countries for name in schema.columns_for(country)]
+        resolved = {}
+        for field in (self.predicate.fields() if self.predicate is not None else []):
+            if not field.is_role:
+                if field.name not in schema.info:
+                    raise KeyError(f"Colonne de filtre absente du fichier nettoyé: {field.name}")
+                resolved[field] = [field.name]
+                continue
+            in_selection = [name for name in selected if schema.info[name].role == field.name]
+            resolved[field] = in_selection or [
+                name for name in scope if schema.info[name].role == field.name]
+            if not resolved[field]:
+                raise KeyError(f"Aucune colonne de rôle '{field.name}' pour cette requête")
+        filter_columns = list(dict.fromkeys(
+            name for names_ in resolved.values() for name in names_ if name not in selected))
+
+        if time_column is None and (self.start is not None or self.end is not None):
+            raise ValueError("Le fichier nettoyé n'a pas de colonne temporelle: filtre de période impossible")
+
+        return {
+            "time_column": time_column,
+            "columns": selected,
+            "filter_columns": filter_columns,
+            "start": None if self.start is None else _utc_timestamp(self.start),
+            "end": None if self.end is None else _utc_timestamp(self.end),
+            "predicate": self.predicate,
+            "resolved_fields": resolved,
+        }
+
+    # ------------------------------------------------------------------
+    # Exécution
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _row_range(data, plan):
+        """Plage de lignes de la période (recherche dichotomique), et masque si non triée."""
+        n_rows = len(data)
+        if plan["start"] is None and plan["end"] is None:
+            return 0, n_rows, None
+        chunked = data.table.column(plan["time_column"])
+        unit = chunked.type.unit
+        values = (chunked.chunk(0).to_numpy(zero_copy_only=True) if chunked.num_chunks == 1
+                  else chunked.to_numpy()).view(np.int64)
+        bounds = [None if plan[key] is None else plan[key].as_unit(unit).value
+                  for key in ("start", "end")]
+        if n_rows > 1 and np.any(values[1:] < values[:-1]):
+            mask = np.ones(n_rows, dtype=bool)
+            if bounds[0] is not None:
+                mask &= values >= bounds[0]
+            if bounds[1] is not None:
+                mask &= values < bounds[1]
+            return 0, n_rows, mask
+        row_start = 0 if bounds[0] is None else int(np.searchsorted(values, bounds[0], side='left'))
+        row_stop = n_rows if bounds[1] is None else int(np.searchsorted(values, bounds[1], side='left'))
+        return row_start, max(row_start, row_stop), None
+
+    def _execute(self):
+        plan = self.plan()
+        data = open_processed(self.path)
+        row_start, row_stop, time_mask = self._row_range(data, plan)
+        table = data.table.slice(row_start, row_stop - row_start)
+
+        mask = time_mask[row_start:row_stop] if time_mask is not None else None
+        if plan["predicate"] is not None:
+            def read(name):
+                chunked = table.column(name)
+                if chunked.num_chunks == 1:
+                    return chunked.chunk(0).to_numpy(zero_copy_only=False)
+                return chunked.to_numpy()
+
+            predicate_mask = plan["predicate"].evaluate(lambda field: plan["resolved_fields"][field], read)
+            mask = predicate_mask if mask is None else mask & predicate_mask
+
+        output = ([plan["time_column"]] if plan["time_column"] else []) + plan["columns"]
+        table = table.select(output)
+        if mask is not None:
+            table = table.filter(pa.array(mask))
+        return table.replace_schema_metadata(data.table.schema.metadata), plan
+
+    def to_arrow(self):
+        """Exécute la requête et renvoie une table Arrow."""
+        return self._execute()[0]
+
+    def collect(self):
+        """Exécute la requête et renvoie un DataFrame (index temporel si présent)."""
+        table, plan = self._execute()
+        df = table.to_pandas()
+        metadata = table.schema.metadata or {}
+        if metadata.get(INDEX_METADATA_KEY):
+            df = df.set_index(plan["time_column"])
+        return df
+
+    def count(self):
+        """Nombre de lignes satisfaisant la requête."""
+        return self._execute()[0].num_rows
+
+    def __repr__(self):
+        return (f"Query(countries={self.countries}, metrics={sorted(self.metrics) if self.metrics else None}, "
+                f"start={self.start}, end={self.end}, where={self.predicate!r})")
+
+
+def select(countries=None, metrics=None, start=None, end=None, columns=None, path=DEFAULT_PROCESSED_FILE):
+    """
+    Crée une requête différée sur le fichier nettoyé.
+
+    Args:
+        countries: Codes pays (ex. ['DE']), None = tous
+        metrics: Rôles, variables ou mesures (ex. ['price', 'wind']), None = toutes
+        start, end: Période [start, end), UTC si sans fuseau
+        columns: Colonnes supplémentaires par nom (ex. ['hour', 'is_weekend'])
+        path: Fichier Arrow nettoyé
+    """
+    return Query(path, countries, metrics, start, end, columns)
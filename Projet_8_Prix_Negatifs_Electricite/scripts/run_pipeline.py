@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Script: Orchestrateur du Pipeline
+=================================
+Exécute les scripts 01 à 05 comme un graphe de dépendances (DAG):
+
+    download ──┬──> exploration
+               ├──> quality ───┐
+               ├───────────────┴──> cleaning
+               └──> weather
+
+- chaque étape a une clé de cache: empreinte SHA-256 de son code (script +
+  modules de scripts/ qu'il importe, directement ou non), de sa tranche de
+  configuration et du contenu de ses entrées
+- une étape dont la clé n'a pas changé et dont les sorties existent encore
+  est ignorée
+- les étapes indépendantes (exploration et analyse de qualité) s'exécutent
+  en parallèle, chacune dans son propre processus
+
+Avec `data_quality.exploration_report: true`, l'analyse de qualité écrit
+aussi le rapport d'exploration à partir du même profil: l'étape
+exploration n'est alors exécutée que si elle est demandée explicitement.
+L'étape weather n'est exécutée par défaut que si le fichier météo source
+est présent.
+
+Modifier `focus_countries` relance exploration, qualité, nettoyage et météo mais
+pas le téléchargement; modifier `dtype_plan` ne relance que le nettoyage.
+
+Utilisation (depuis la racine du projet):
+    python scripts/run_pipeline.py                      # tout le pipeline
+    python scripts/run_pipeline.py --dry-run            # plan sans exécution
+    python scripts/run_pipeline.py --stages cleaning    # une étape (et ses dépendances)
+    python scripts/run_pipeline.py --force quality      # ignorer le cache d'une étape
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import argparse
+import ast
+import hashlib
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+from pathlib import Path
+
+from opsd_store import load_config
+from processed_data import processed_settings
+from weather_subset import weather_settings
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s: %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+RAW_FILE = "data/raw/opsd_timeseries/time_series_60min_singleindex.csv"
+DEFAULT_CACHE_FILE = "data/interim/pipeline_cache.json"
+
+# Étapes: script, dépendances, sections de configuration lues, entrées et sorties
+STAGES = {
+    "download": {
+        "script": "01_download_opsd_data.py",
+        "depends_on": [],
+        "config": ["data_sources", "download", "fetcher", "storage"],
+        "inputs": [],
+        "outputs": [RAW_FILE],
+    },
+    "exploration": {
+        "script": "02_initial_exploration.py",
+        "depends_on": ["download"],
+        "config": ["focus_countries", "storage"],
+        "inputs": [RAW_FILE],
+        "outputs": ["reports/initial_exploration.txt"],
+    },
+    "quality": {
+        "script": "03_data_quality_analysis.py",
+        "depends_on": ["download"],
+        # Recommandations de remplissage (fill_settings) et heure locale des drapeaux
+        "config": ["focus_countries", "data_quality", "storage", "missing_values_strategy",
+                   "calendar_features"],
+        "inputs": [RAW_FILE],
+        "outputs": ["reports/data_quality_report.json"],
+    },
+    "cleaning": {
+        "script": "04_data_cleaning.py",
+        # L'index d'intégrité produit par l'analyse de qualité évite un rescan
+        "depends_on": ["download", "quality"],
+        "config": ["focus_countries", "missing_values_strategy", "data_quality", "cleaning",
+                   "calendar_features", "dtype_plan", "processed_output", "storage"],
+        "inputs": [RAW_FILE],
+        "outputs": [],  # fichier nettoyé: voir stage_outputs()
+    },
+    "weather": {
+        "script": "05_weather_ingestion.py",
+        "depends_on": ["download"],
+        "config": ["focus_countries", "temporal_split", "weather_ingestion"],
+        "inputs": [],   # fichier météo source: voir stage_inputs()
+        "outputs": [],  # table météo: voir stage_outputs()
+    },
+}
+
+
+# ============================================================================
+# EMPREINTES
+# ============================================================================
+
+def file_digest(path, digests):
+    """
+    SHA-256 du contenu d'un fichier. Le résultat est mémorisé par
+    (taille, date de modification): un fichier inchangé n'est pas relu.
+    """
+    stat = Path(path).stat()
+    known = digests.get(str(path))
+    if known and known["size"] == stat.st_size and known["mtime"] == stat.st_mtime:
+        return known["sha256"]
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(8 * 1024 * 1024), b''):
+            sha.update(block)
+    digests[str(path)] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha.hexdigest()}
+    return sha.hexdigest()
+
+
+def local_imports(path):
+    """Modules de scripts/ importés par un fichier (toutes les instructions import)."""
+    tree = ast.parse(Path(path).read_bytes(), filename=str(path))
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names.add(node.module.split('.')[0])
+    return {SCRIPTS_DIR / f"{name}.py" for name in names if (SCRIPTS_DIR / f"{name}.py").exists()}
+
+
+def stage_modules(stage):
+    """Script de l'étape et modules de scripts/ qu'il importe, directement ou non."""
+    script = SCRIPTS_DIR / STAGES[stage]["script"]
+    seen = {script}
+    pending = [script]
+    while pending:
+        for module in local_imports(pending.pop()) - seen:
+            seen.add(module)
+            pending.append(module)
+    return [script] + sorted(seen - {script})
+
+
+def code_digest(stage):
+    """Empreinte du script de l'étape et des seuls modules qu'il importe."""
+    sha = hashlib.sha256()
+    for path in stage_modules(stage):
+        sha.update(path.name.encode())
+        sha.update(path.read_bytes())
+    return sha.hexdigest()
+
+
+def exploration_in_quality(config):
+    """L'analyse de qualité écrit-elle aussi le rapport d'exploration?"""
+    return config.get('data_quality', {}).get('exploration_report', True)
+
+
+def default_stages(config):
+    """
+    Étapes exécutées sans --stages (exploration incluse dans la qualité si
+    configurée, météo seulement si le fichier source est présent).
+    """
+    skipped = set()
+    if exploration_in_quality(config):
+        skipped.add("exploration")
+    if not Path(weather_settings(config)["source_file"]).exists():
+        skipped.add("weather")
+    return [stage for stage in STAGES if stage not in skipped]
+
+
+def stage_inputs(stage, config):
+    """Entrées d'une étape (chemins issus de la configuration si besoin)."""
+    if stage == "weather":
+        return [weather_settings(config)["source_file"]]
+    return list(STAGES[stage]["inputs"])
+
+
+def stage_outputs(stage, config):
+    """Sorties attendues d'une étape (chemins issus de la configuration si besoin)."""
+    if stage == "cleaning":
+        return [processed_settings(config)["path"]]
+    if stage == "weather":
+        return [weather_settings(config)["output"]]
+    if stage == "quality" and exploration_in_quality(config):
+        return STAGES[stage]["outputs"] + STAGES["exploration"]["outputs"]
+    return list(STAGES[stage]["outputs"])
+
+
+def stage_key(stage, config, digests, upstream_keys):
+    """Clé de cache: code, tranche de configuration, entrées et clés amont."""
+    spec = STAGES[stage]
+    payload = {
+        "code": code_digest(stage),
+        "config": {key: config.get(key) for key in spec["config"]},
+        "inputs": {path: file_digest(path, digests) for path in stage_inputs(stage, config) if Path(path).exists()},
+        "upstream": {dep: upstream_keys.get(dep) for dep in spec["depends_on"]},
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def read_cache(path=DEFAULT_CACHE_FILE):
+    if not Path(path).exists():
+        return {"stages": {}, "digests": {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_cache(cache, path=DEFAULT_CACHE_FILE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# ============================================================================
+# EXÉCUTION
+# ============================================================================
+
+def run_stage(stage, force_download=False):
+    """Exécute le main() d'un script dans le processus courant (processus dédié)."""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    path = SCRIPTS_DIR / STAGES[stage]["script"]
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    # Module enregistré sous son nom: les fonctions du script restent
+    # sérialisables (pickle) pour ses propres ProcessPoolExecutor
+    sys.modules[path.stem] = module
+    spec.loader.exec_module(module)
+    sys.argv = [str(path)] + (["--force"] if force_download and stage == "download" else [])
+    start = time.perf_counter()
+    try:
+        module.main()
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            raise RuntimeError(f"{path.name} terminé avec le code {exc.code}") from None
+    return round(time.perf_counter() - start, 2)
+
+
+def with_dependencies(stages):
+    """Étapes demandées et toutes leurs dépendances, dans l'ordre du DAG."""
+    selected = set()
+
+    def visit(stage):
+        if stage not in selected:
+            selected.add(stage)
+            for dep in STAGES[stage]["depends_on"]:
+                visit(dep)
+
+    for stage in stages:
+        visit(stage)
+    return [stage for stage in STAGES if stage in selected]
+
+
+def plan_stage(stage, config, cache, keys, forced):
+    """Clé de l'étape et décision (exécuter ou ignorer)."""
+    keys[stage] = stage_key(stage, config, cache["digests"], keys)
+    cached = cache["stages"].get(stage, {})
+    outputs_present = all(Path(path).exists() for path in stage_outputs(stage, config))
+    if stage in forced:
+        return "forcée"
+    if cached.get("key") != keys[stage]:
+        return "modifiée" if cached else "jamais exécutée"
+    if not outputs_present:
+        return "sorties absentes"
+    return None
+
+
+def run_pipeline(stages, config, max_workers=2, force=(), dry_run=False, cache_file=DEFAULT_CACHE_FILE):
+    """
+    Exécute le DAG: une étape démarre dès que ses dépendances sont terminées.
+
+    Returns:
+        dict: étape → statut ('ignorée', 'exécutée', 'prévue' en dry-run, 'échec', 'annulée')
+    """
+    cache = read_cache(cache_file)
+    stages = with_dependencies(stages)
+    keys, status = {}, {}
+    pending = list(stages)
+    running = {}
+    context = multiprocessing.get_context('spawn')
+
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as executor:
+        while pending or running:
+            # Planifier les étapes dont toutes les dépendances sont résolues
+            for stage in list(pending):
+                deps = STAGES[stage]["depends_on"]
+                if any(status.get(dep) in ("échec", "annulée") for dep in deps if dep in stages):
+                    status[stage] = "annulée"
+                    pending.remove(stage)
+                    logger.warning(f"   ⏭️  {stage}: annulée (dépendance en échec)")
+                    continue
+                if not all(status.get(dep) in ("ignorée", "exécutée", "prévue") for dep in deps if dep in stages):
+                    continue
+                pending.remove(stage)
+                reason = plan_stage(stage, config, cache, keys, force)
+                if reason is None:
+                    status[stage] = "ignorée"
+                    logger.info(f"   ✅ {stage}: à jour (cache)")
+                    continue
+                if dry_run:
+                    status[stage] = "prévue"
+                    logger.info(f"   ▶️  {stage}: serait exécutée ({reason})")
+                    continue
+                logger.info(f"   ▶️  {stage}: exécution ({reason})")
+                running[executor.submit(run_stage, stage, "download" in force)] = stage
+
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                try:
+                    duration = future.result()
+                except Exception as exc:
+                    status[stage] = "échec"
+                    cache["stages"].pop(stage, None)
+                    logger.error(f"   ❌ {stage}: échec ({exc})")
+                    continue
+                status[stage] = "exécutée"
+                # Clé recalculée après exécution (entrées produites par l'étape)
+                keys[stage] = stage_key(stage, config, cache["digests"], keys)
+                cache["stages"][stage] = {
+                    "key": keys[stage],
+                    "finished": datetime.now().isoformat(timespec='seconds'),
+                    "duration_s": duration,
+                }
+                logger.info(f"   ✅ {stage}: terminée en {duration:.2f} s")
+            if not dry_run:
+                write_cache(cache, cache_file)
+
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Orchestrateur du pipeline (DAG avec cache)")
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES),
+                        help="Étapes à exécuter (leurs dépendances sont incluses)")
+    parser.add_argument('--force', nargs='*', choices=list(STAGES), default=[],
+                        help="Étapes à ré-exécuter même si leur cache est valide")
+    parser.add_argument('--dry-run', action='store_true', help="Afficher le plan sans exécuter")
+    args = parser.parse_args()
+
+    config = load_config()
+    pipeline_config = config.get('pipeline', {})
+
+    logger.info("=" * 80)
+    logger.info("PIPELINE D'INGESTION OPSD")
+    logger.info("=" * 80)
+
+    start = time.perf_counter()
+    status = run_pipeline(
+        args.stages or default_stages(config), config,
+        max_workers=pipeline_config.get('max_workers', 2),
+        force=set(args.force),
+        dry_run=args.dry_run,
+        cache_file=pipeline_config.get('cache_file', DEFAULT_CACHE_FILE),
+    )
+
+    logger.info("\n" + "=" * 80)
+    logger.info("RÉSUMÉ DU PIPELINE")
+    logger.info("=" * 80)
+    for stage, state in status.items():
+        logger.info(f"   {stage:12s} {state}")
+    logger.info(f"\n   Durée totale: {time.perf_counter() - start:.2f} s")
+    if any(state in ("échec", "annulée") for state in status.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Module: Profil d'Exécution
+==========================
+Instrumentation commune des scripts 01 à 04: pour chaque section nommée
+(ex. "1. SÉLECTION DES COLONNES POUR PAYS FOCUS"), temps réel, temps CPU,
+pic de mémoire résidente (RSS) et lignes/colonnes traitées.
+
+Les sections se suivent: ouvrir une section ferme la précédente, ce qui
+colle au découpage des scripts (bannières numérotées). Sans indication,
+une section traite les mêmes lignes/colonnes que la précédente.
+
+Le profil est écrit dans reports/run_profile.json, à côté de
+data_quality_report.json, une entrée par script (la dernière exécution de
+chaque script est conservée):
+
+    {"stages": {"04_data_cleaning": {"wall_s": ..., "hot_section": ...,
+                                     "sections": [{"name": ..., "wall_s": ...}]}}}
+
+Le pic RSS est celui du processus courant (ru_maxrss): les processus de
+travail (nettoyage parallèle) n'y sont pas inclus. Indisponible sous
+Windows (None).
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: pas de pic RSS
+    resource = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: écriture sans verrou
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_FILE = "reports/run_profile.json"
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus (Mo), ou None si indisponible."""
+    if resource is None:
+        return None
+    # ru_maxrss est en Ko sous Linux, en octets sous macOS
+    divisor = 1024 ** 2 if sys.platform == 'darwin' else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor, 2)
+
+
+class RunProfile:
+    """Profil d'un script: sections successives chronométrées."""
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.sections = []
+        self._current = None
+        self._shape = (None, None)
+        self._started = datetime.now().isoformat(timespec='seconds')
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    def section(self, name, rows=None, columns=None):
+        """Ferme la section en cours et ouvre la section `name`."""
+        self._close()
+        self._current = {"name": name, "rows": None, "columns": None}
+        self.processed(*self._shape)
+        self.processed(rows, columns)
+        self._current.update({
+            "_wall": time.perf_counter(),
+            "_cpu": time.process_time(),
+            "_rss": peak_rss_mb(),
+        })
+
+    def processed(self, rows=None, columns=None):
+        """Renseigne les lignes/colonnes traitées par la section en cours."""
+        if self._current is None:
+            return
+        if rows is not None:
+            self._current["rows"] = int(rows)
+        if columns is not None:
+            self._current["columns"] = int(columns)
+        self._shape = (self._current["rows"], self._current["columns"])
+
+    def _close(self):
+        current, self._current = self._current, None
+        if current is None:
+            return
+        peak = peak_rss_mb()
+        self.sections.append({
+            "name": current["name"],
+            "wall_s": round(time.perf_counter() - current["_wall"], 4),
+            "cpu_s": round(time.process_time() - current["_cpu"], 4),
+            "peak_rss_mb": peak,
+            # Hausse du pic pendant la section: mémoire propre à la section
+            "rss_growth_mb": (round(peak - current["_rss"], 2)
+                              if peak is not None and current["_rss"] is not None else None),
+            "rows": current["rows"],
+            "columns": current["columns"],
+        })
+
+    def finish(self):
+        """Ferme la dernière section et renvoie le profil du script."""
+        self._close()
+        hot = max(self.sections, key=lambda section: section["wall_s"], default=None)
+        return {
+            "started": self._started,
+            "finished": datetime.now().isoformat(timespec='seconds'),
+            "wall_s": round(time.perf_counter() - self._wall, 4),
+            "cpu_s": round(time.process_time() - self._cpu, 4),
+            "peak_rss_mb": peak_rss_mb(),
+            "hot_section": hot["name"] if hot else None,
+            "sections": self.sections,
+        }
+
+    def save(self, path=DEFAULT_PROFILE_FILE):
+        """Termine le profil et l'enregistre dans le fichier commun."""
+        profile = self.finish()
+        write_stage_profile(self.stage, profile, path)
+        if profile["hot_section"]:
+            hot = next(s for s in profile["sections"] if s["name"] == profile["hot_section"])
+            logger.info(f"\n⏱️  Profil d'exécution: {path} ({profile['wall_s']:.2f} s, "
+                        f"section la plus lente: {hot['name']} {hot['wall_s']:.2f} s)")
+        return profile
+
+
+def write_stage_profile(stage, profile, path=DEFAULT_PROFILE_FILE):
+    """
+    Fusionne le profil d'un script dans le fichier commun.
+
+    Lecture-modification-écriture sous verrou: plusieurs scripts lancés en
+    parallèle (exploration et qualité) ne s'écrasent pas.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + '.lock'), 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        content = {"stages": {}}
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    content = json.load(f)
+            except (OSError, ValueError):
+                logger.warning(f"   ⚠️  Profil illisible, remplacé: {path}")
+        content.setdefault("stages", {})[stage] = profile
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(content, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    return path
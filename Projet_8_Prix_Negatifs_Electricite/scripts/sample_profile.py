@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Module: Aperçu Rapide par Échantillonnage
+=========================================
+Estime en une seconde, sans parser le fichier complet, les indicateurs
+principaux de l'exploration initiale:
+
+- part de valeurs manquantes de chaque colonne
+- fourchette des prix (min/max observés, médiane de l'échantillon)
+- part de prix négatifs et prix moyen des pays focus
+
+L'échantillon est stratifié dans le temps: le fichier (trié par
+timestamp) est découpé en strates d'octets de même taille, et dans chaque
+strate quelques blocs de lignes consécutives sont lus à partir de
+positions aléatoires (seek + lecture de `block_rows` lignes).
+
+Les intervalles de confiance tiennent compte de l'autocorrélation des
+séries horaires: le bloc est l'unité d'échantillonnage (estimateur de
+ratio stratifié, loi de Student à blocs - strates degrés de liberté). Avec
+peu de blocs par strate, la variance entre blocs d'une strate peut être
+nulle (colonne vide jusqu'à une date, blocs tous du même côté): elle est
+complétée par les différences entre strates voisines, plus prudentes. Le
+rapport indique le nombre de blocs de chaque estimation.
+
+Les valeurs exactes restent obtenues par l'exploration complète
+(python scripts/02_initial_exploration.py, sans --preview).
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import io
+import logging
+import os
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from column_schema import schema_for
+from opsd_store import read_csv_header
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREVIEW_SETTINGS = {
+    "strata": 12,               # Strates temporelles (tranches d'octets du fichier)
+    "blocks_per_stratum": 4,    # Blocs tirés par strate (≥ 2 pour la variance)
+    "block_rows": 72,           # Lignes consécutives par bloc (trois jours horaires)
+    "confidence": 0.95,
+    "seed": None,
+}
+
+
+def preview_settings(config=None):
+    """Section `exploration_preview` de la configuration, avec valeurs par défaut."""
+    settings = dict(DEFAULT_PREVIEW_SETTINGS)
+    if config and config.get('exploration_preview'):
+        settings.update(config['exploration_preview'])
+    settings["blocks_per_stratum"] = max(2, settings["blocks_per_stratum"])
+    return settings
+
+
+def _read_lines(f, offset, n_lines):
+    """Lit `n_lines` lignes complètes à partir de la première fin de ligne après `offset`."""
+    f.seek(offset)
+    f.readline()  # ligne entamée: ignorée
+    lines = []
+    for _ in range(n_lines):
+        line = f.readline()
+        if not line:
+            break
+        lines.append(line)
+    return b"".join(lines)
+
+
+def sample_blocks(csv_path, strata=12, blocks_per_stratum=4, block_rows=72, seed=None):
+    """
+    Tire des blocs de lignes consécutives, stratifiés sur la longueur du fichier.
+
+    Les lignes n'ont pas toutes la même longueur (les colonnes vides sont
+    plus courtes): le nombre de lignes de chaque strate est estimé depuis
+    la longueur moyenne des lignes lues dans cette strate.
+
+    Returns:
+        tuple: (liste de (strate, DataFrame du bloc), nombre de lignes
+        estimé de chaque strate)
+    """
+    header = read_csv_header(csv_path)
+    size = os.path.getsize(csv_path)
+    rng = np.random.default_rng(seed)
+    blocks = []
+    sampled_bytes = np.zeros(strata)
+    sampled_lines = np.zeros(strata)
+    with open(csv_path, 'rb') as f:
+        data_start = len(f.readline())
+        bounds = np.linspace(data_start, size, strata + 1).astype(np.int64)
+        for stratum in range(strata):
+            for offset in rng.integers(bounds[stratum], max(bounds[stratum + 1], bounds[stratum] + 1),
+                                       size=blocks_per_stratum):
+                raw = _read_lines(f, int(offset), block_rows)
+                if not raw:
+                    continue
+                block = pd.read_csv(io.BytesIO(raw), header=None, names=header,
+                                    parse_dates=[0], low_memory=False)
+                sampled_bytes[stratum] += len(raw)
+                sampled_lines[stratum] += len(block)
+                blocks.append((stratum, block))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stratum_rows = np.nan_to_num(np.diff(bounds) * sampled_lines / sampled_bytes)
+    return blocks, stratum_rows
+
+
+def stratified_ratio(numerators, denominators, strata, weights, confidence=0.95):
+    """
+    Estimateur de ratio stratifié, blocs comme unités d'échantillonnage.
+
+    La variance est la plus grande de deux estimations sur les résidus
+    par bloc (d = y - R·x):
+
+    - entre blocs d'une même strate (classique, mais nulle si les quelques
+      blocs d'une strate tombent du même côté d'une rupture)
+    - par différences successives entre strates voisines (les strates
+      suivent l'ordre du temps): capte une rupture en marche d'escalier
+      (colonne vide jusqu'à une date) que les blocs n'ont pas encadrée
+
+    L'intervalle utilise la loi de Student à (blocs - strates) degrés de
+    liberté.
+
+    Args:
+        numerators, denominators: np.ndarray (blocs × colonnes)
+        strata: Strate de chaque bloc (ordre temporel)
+        weights: Poids de chaque strate (nombre de lignes estimé)
+        confidence: Niveau de confiance de l'intervalle
+
+    Returns:
+        tuple: (estimation, borne basse, borne haute), un tableau par colonne
+    """
+    numerators = np.asarray(numerators, dtype=np.float64)
+    denominators = np.asarray(denominators, dtype=np.float64)
+    strata = np.asarray(strata)
+    labels = np.unique(strata)
+    w = np.asarray(weights, dtype=np.float64)[labels][:, None]
+    mean_num = np.array([numerators[strata == h].mean(axis=0) for h in labels])
+    mean_den = np.array([denominators[strata == h].mean(axis=0) for h in labels])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        total_den = (w * mean_den).sum(axis=0)
+        ratio = (w * mean_num).sum(axis=0) / total_den
+
+        # Linéarisation: variance des résidus d = y - R·x entre blocs de chaque strate
+        residuals = numerators - ratio * denominators
+        within = np.zeros(numerators.shape[1])
+        for h, weight in zip(labels, w[:, 0]):
+            in_stratum = residuals[strata == h]
+            if len(in_stratum) > 1:
+                within += weight ** 2 * in_stratum.var(axis=0, ddof=1) / len(in_stratum)
+
+        # Différences successives des totaux de résidus de strates voisines
+        successive = np.zeros(numerators.shape[1])
+        if len(labels) > 1:
+            totals = w * (mean_num - ratio * mean_den)
+            successive = (len(labels) / (2 * (len(labels) - 1))
+                          * (np.diff(totals, axis=0) ** 2).sum(axis=0))
+        se = np.sqrt(np.maximum(within, successive)) / total_den
+    z = _student_quantile((1 + confidence) / 2, max(1, len(strata) - len(labels)))
+    return ratio, ratio - z * se, ratio + z * se
+
+
+def _student_quantile(p, df):
+    """Quantile de la loi de Student (développement de Cornish-Fisher, sans scipy)."""
+    z = NormalDist().inv_cdf(p)
+    g1 = (z ** 3 + z) / 4
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+    return z + g1 / df + g2 / df ** 2 + g3 / df ** 3
+
+
+def _period(csv_path):
+    """Premier et dernier timestamp (première et dernière ligne du fichier)."""
+    with open(csv_path, 'rb') as f:
+        f.readline()
+        first = f.readline()
+        f.seek(max(0, os.path.getsize(csv_path) - 64 * 1024))
+        last = f.read().rstrip(b"\n").rsplit(b"\n", 1)[-1]
+    return tuple(pd.Timestamp(line.split(b",", 1)[0].decode()) for line in (first, last))
+
+
+def profile_preview(csv_path, focus_countries, config=None):
+    """
+    Aperçu estimé du dataset à partir d'un échantillon de blocs temporels.
+
+    Returns:
+        dict: sampled_rows, blocks, strata (strates échantillonnées),
+        estimated_rows, period_start, period_end, missing (DataFrame
+        estimate/low/high en %), price_stats (par pays)
+    """
+    settings = preview_settings(config)
+    blocks, stratum_rows = sample_blocks(csv_path, settings["strata"],
+                                           settings["blocks_per_stratum"],
+                                           settings["block_rows"], settings["seed"])
+    if not blocks:
+        raise ValueError(f"Aucune ligne échantillonnée: {csv_path}")
+    columns = list(blocks[0][1].columns)
+    strata = np.array([stratum for stratum, _ in blocks])
+    rows = np.array([[len(block)] for _, block in blocks], dtype=np.float64)
+    confidence = settings["confidence"]
+
+    # Part de valeurs manquantes: ratio (manquantes / lignes) par colonne
+    missing = np.vstack([block.isnull().sum().to_numpy() for _, block in blocks])
+    estimate, low, high = stratified_ratio(missing, np.repeat(rows, len(columns), axis=1),
+                                           strata, stratum_rows, confidence)
+    missing_pct = pd.DataFrame({
+        "estimate": estimate * 100,
+        "low": np.clip(low, 0, 1) * 100,
+        "high": np.clip(high, 0, 1) * 100,
+    }, index=columns)
+
+    # Prix: deux premières colonnes de prix de chaque pays focus
+    schema = schema_for(columns)
+    price_stats = {}
+    for country in focus_countries:
+        price_cols = schema.columns_for(country, role='price')[:2]
+        if not price_cols:
+            continue
+        values = [block[price_cols].to_numpy(dtype='float64') for _, block in blocks]
+        counts = np.vstack([(~np.isnan(v)).sum(axis=0) for v in values])
+        negatives = np.vstack([(v < 0).sum(axis=0) for v in values])
+        sums = np.vstack([np.nansum(v, axis=0) for v in values])
+        share, share_low, share_high = stratified_ratio(negatives, counts, strata, stratum_rows, confidence)
+        mean, mean_low, mean_high = stratified_ratio(sums, counts, strata, stratum_rows, confidence)
+        pooled = np.vstack(values)
+        price_stats[country] = {}
+        for j, col in enumerate(price_cols):
+            observed = pooled[:, j][~np.isnan(pooled[:, j])]
+            if len(observed) == 0:
+                price_stats[country][col] = None
+                continue
+            price_stats[country][col] = {
+                "count": int(len(observed)),
+                "min": float(observed.min()),
+                "max": float(observed.max()),
+                "median": float(np.median(observed)),
+                "mean": (float(mean[j]), float(mean_low[j]), float(mean_high[j])),
+                "negative_pct": tuple(float(np.clip(v, 0, 1) * 100)
+                                      for v in (share[j], share_low[j], share_high[j])),
+            }
+
+    period_start, period_end = _period(csv_path)
+    return {
+        "columns": columns,
+        "sampled_rows": int(rows.sum()),
+        "blocks": len(blocks),
+        "strata": int(len(np.unique(strata))),
+        "estimated_rows": int(round(stratum_rows.sum())),
+        "period_start": period_start,
+        "period_end": period_end,
+        "confidence": confidence,
+        "missing": missing_pct,
+        "price_stats": price_stats,
+    }
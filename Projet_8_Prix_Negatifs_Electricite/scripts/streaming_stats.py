@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Module: Statistiques en Flux (Streaming)
+=========================================
+Accumulateurs fusionnables pour calculer les statistiques du rapport de
+qualité en une seule passe, bloc par bloc, en mémoire constante:
+
+- price_block_stats: noyau vectorisé sur un bloc 2-D (toutes colonnes)
+- BlockMoments: comptes, min/max, moyenne et écart-type (Welford/Chan)
+- QuantileSketch: histogramme quantifié fusionnable pour médiane, MAD et
+  comptes au-delà d'un seuil (exact à la résolution près)
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import numpy as np
+
+
+def price_block_stats(block):
+    """
+    Noyau vectorisé: toutes les statistiques de prix pour un bloc 2-D.
+
+    Un seul tri par colonne fournit min, max, médiane, comptes de prix
+    négatifs et d'outliers (par recherche dichotomique); deux passes
+    fournissent somme et somme des carrés centrés.
+
+    Args:
+        block: np.ndarray (lignes × colonnes), NaN pour les valeurs manquantes
+
+    Returns:
+        dict: Tableaux 1-D (une valeur par colonne) count, missing, min, max,
+        mean, median, std, negative_count, outliers_high_count,
+        outliers_low_count
+    """
+    block = np.asarray(block, dtype=np.float64)
+    n_rows, n_cols = block.shape
+    valid = ~np.isnan(block)
+    count = valid.sum(axis=0)
+
+    # Somme et écart-type (ddof=1) sur les valeurs non-nulles
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(valid, block, 0.0).sum(axis=0) / count
+        m2 = np.where(valid, block - mean, 0.0)
+        m2 = (m2 * m2).sum(axis=0)
+        std = np.sqrt(m2 / (count - 1))
+    std[count < 2] = np.nan
+
+    # Tri unique: les NaN sont rangés en fin de colonne
+    ordered = np.sort(block, axis=0)
+    minimum = np.full(n_cols, np.nan)
+    maximum = np.full(n_cols, np.nan)
+    median = np.full(n_cols, np.nan)
+    negative_count = np.zeros(n_cols, dtype=np.int64)
+    outliers_high = np.zeros(n_cols, dtype=np.int64)
+    outliers_low = np.zeros(n_cols, dtype=np.int64)
+
+    for j in range(n_cols):
+        n = count[j]
+        if n == 0:
+            continue
+        column = ordered[:n, j]
+        minimum[j] = column[0]
+        maximum[j] = column[-1]
+        median[j] = 0.5 * (column[(n - 1) // 2] + column[n // 2])
+        negative_count[j] = np.searchsorted(column, 0.0, side='left')
+        if np.isfinite(std[j]):
+            outliers_high[j] = n - np.searchsorted(column, mean[j] + 3 * std[j], side='right')
+            outliers_low[j] = np.searchsorted(column, mean[j] - 3 * std[j], side='left')
+
+    return {
+        "count": count,
+        "missing": n_rows - count,
+        "min": minimum,
+        "max": maximum,
+        "mean": mean,
+        "median": median,
+        "std": std,
+        "negative_count": negative_count,
+        "outliers_high_count": outliers_high,
+        "outliers_low_count": outliers_low,
+    }
+
+
+class BlockMoments:
+    """
+    Moments exacts de plusieurs colonnes, fusionnés bloc par bloc
+    (formule de Chan), vectorisés sur les colonnes.
+    """
+
+    def __init__(self, n_cols):
+        self.count = np.zeros(n_cols, dtype=np.int64)
+        self.mean = np.zeros(n_cols)
+        self.m2 = np.zeros(n_cols)
+        self.min = np.full(n_cols, np.inf)
+        self.max = np.full(n_cols, -np.inf)
+        self.negative_count = np.zeros(n_cols, dtype=np.int64)
+
+    def update(self, block):
+        """Ajoute un bloc 2-D (lignes × colonnes), NaN pour les manquants."""
+        block = np.asarray(block, dtype=np.float64)
+        valid = ~np.isnan(block)
+        n_b = valid.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_b = np.where(valid, block, 0.0).sum(axis=0) / n_b
+            centered = np.where(valid, block - mean_b, 0.0)
+        m2_b = (centered * centered).sum(axis=0)
+        mean_b = np.nan_to_num(mean_b)
+
+        n = self.count + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = mean_b - self.mean
+            self.mean = np.where(n > 0, self.mean + delta * n_b / n, 0.0)
+            self.m2 = np.where(n > 0, self.m2 + m2_b + delta ** 2 * self.count * n_b / n, 0.0)
+        self.count = n
+
+        self.min = np.fmin(self.min, np.where(valid, block, np.inf).min(axis=0, initial=np.inf))
+        self.max = np.fmax(self.max, np.where(valid, block, -np.inf).max(axis=0, initial=-np.inf))
+        self.negative_count += (block < 0).sum(axis=0)
+
+    @property
+    def std(self):
+        """Écart-type échantillonnal (ddof=1, comme pandas)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self.m2 / (self.count - 1))
+        std[self.count < 2] = np.nan
+        return std
+
+
+class QuantileSketch:
+    """
+    Histogramme quantifié fusionnable.
+
+    Chaque valeur est arrondie à `resolution` (0.01 EUR/MWh par défaut, la
+    précision des prix OPSD): la médiane et les comptes au-delà d'un seuil
+    sont donc exacts pour des prix au centime. La mémoire dépend du nombre de
+    valeurs distinctes, pas du nombre de lignes.
+    """
+
+    def __init__(self, resolution=0.01):
+        self.resolution = resolution
+        self._keys = np.empty(0, dtype=np.int64)
+        self._counts = np.empty(0, dtype=np.int64)
+
+    @property
+    def count(self):
+        return int(self._counts.sum())
+
+    def update(self, values):
+        """Ajoute un bloc de valeurs non-nulles."""
+        if len(values) == 0:
+            return
+        keys, counts = np.unique(
+            np.round(np.asarray(values, dtype=np.float64) / self.resolution).astype(np.int64),
+            return_counts=True,
+        )
+        self._merge_arrays(keys, counts)
+
+    def merge(self, other):
+        """Fusionne un autre sketch de même résolution."""
+        if other.resolution != self.resolution:
+            raise ValueError("Résolutions de sketch incompatibles")
+        self._merge_arrays(other._keys, other._counts)
+
+    def _merge_arrays(self, keys, counts):
+        all_keys = np.concatenate([self._keys, keys])
+        all_counts = np.concatenate([self._counts, counts])
+        self._keys, inverse = np.unique(all_keys, return_inverse=True)
+        self._counts = np.bincount(inverse, weights=all_counts).astype(np.int64)
+
+    @staticmethod
+    def _interpolate(values, counts, q):
+        """Quantile de valeurs triées pondérées par leurs comptes (interpolation linéaire)."""
+        cumulative = np.cumsum(counts)
+        position = q * (cumulative[-1] - 1)
+        lower = int(np.floor(position))
+        upper = int(np.ceil(position))
+        v_lower = values[np.searchsorted(cumulative, lower, side='right')]
+        v_upper = values[np.searchsorted(cumulative, upper, side='right')]
+        return float(v_lower + (v_upper - v_lower) * (position - lower))
+
+    def quantile(self, q):
+        """Quantile avec interpolation linéaire (même convention que pandas)."""
+        if self.count == 0:
+            return np.nan
+        return self._interpolate(self._keys * self.resolution, self._counts, q)
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def median_absolute_deviation(self, center):
+        """Médiane des écarts absolus à `center` (MAD), depuis le même histogramme."""
+        if self.count == 0:
+            return np.nan
+        deviations = np.abs(self._keys * self.resolution - center)
+        order = np.argsort(deviations, kind='stable')
+        return self._interpolate(deviations[order], self._counts[order], 0.5)
+
+    def count_above(self, threshold):
+        """Nombre de valeurs strictement supérieures au seuil."""
+        return int(self._counts[self._keys * self.resolution > threshold].sum())
+
+    def count_below(self, threshold):
+        """Nombre de valeurs strictement inférieures au seuil."""
+        return int(self._counts[self._keys * self.resolution < threshold].sum())
+
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Module: Intégrité Temporelle
+============================
+Index par plages (run-length) de l'intégrité temporelle du dataset, calculé
+sur le tableau int64 des timestamps (nanosecondes UTC), sans copier ni
+trier le DataFrame:
+
+- gaps: heures manquantes entre deux timestamps consécutifs
+- doublons: timestamps répétés (nombre d'occurrences)
+- anomalies DST: gaps ou doublons à moins d'une heure d'un changement
+  d'heure européen (symptôme d'une source exprimée en heure locale)
+- plages de valeurs manquantes par colonne (ligne de début, ligne de fin)
+
+L'index est sauvegardé en Parquet à côté du magasin colonnaire; le
+nettoyage le relit pour décider du remplissage sans recalculer les masques.
+
+Fichiers produits (data/interim/temporal_integrity/):
+    gaps.parquet            # début, fin, durée, heures manquantes, DST
+    duplicates.parquet      # timestamp, occurrences, DST
+    missing_runs.parquet    # colonne, ligne début, ligne fin (exclue), timestamps
+    _manifest.json          # empreinte de la source, lignes, colonnes
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from opsd_store import source_fingerprint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTEGRITY_DIR = "data/interim/temporal_integrity"
+MANIFEST_NAME = "_manifest.json"
+HOUR_NS = 3_600_000_000_000
+
+
+def integrity_dir(config=None):
+    """Répertoire de l'index d'intégrité (section data_quality de la configuration)."""
+    if config:
+        return config.get('data_quality', {}).get('integrity_dir') or DEFAULT_INTEGRITY_DIR
+    return DEFAULT_INTEGRITY_DIR
+
+
+def timestamps_ns(timestamps):
+    """Vue int64 (ns UTC) d'une Series ou d'un index temporel, sans copie."""
+    return pd.DatetimeIndex(timestamps).asi8
+
+
+def _to_timestamps(values_ns):
+    return pd.to_datetime(np.asarray(values_ns, dtype=np.int64), utc=True)
+
+
+def eu_dst_transitions(start_ns, end_ns):
+    """
+    Instants des changements d'heure européens (dernier dimanche de mars et
+    d'octobre à 01:00 UTC) couvrant la période, en ns UTC.
+    """
+    first_year = _to_timestamps([start_ns])[0].year
+    last_year = _to_timestamps([end_ns])[0].year
+    transitions = []
+    for year in range(first_year, last_year + 1):
+        for month in (3, 10):
+            last_day = pd.Timestamp(year=year, month=month, day=31, hour=1, tz='UTC')
+            transitions.append(last_day - pd.Timedelta(days=(last_day.weekday() + 1) % 7))
+    return pd.DatetimeIndex(transitions).asi8
+
+
+def _near(values_ns, transitions_ns, window_ns):
+    """Indique pour chaque instant s'il est à moins de `window_ns` d'une transition."""
+    # Sentinelles aux deux extrémités: chaque instant a un voisin de chaque côté
+    far = np.iinfo(np.int64).max // 4
+    bounds = np.concatenate([[-far], transitions_ns, [far]])
+    position = np.searchsorted(bounds, values_ns)
+    distance = np.minimum(values_ns - bounds[position - 1], bounds[position] - values_ns)
+    return distance <= window_ns
+
+
+def timestamp_runs(ts_ns, expected_ns=HOUR_NS):
+    """
+    Gaps, doublons et anomalies DST d'un tableau de timestamps.
+
+    Le tableau n'est trié (copie int64 uniquement) que s'il contient des
+    timestamps hors ordre.
+
+    Args:
+        ts_ns: Timestamps en ns UTC (np.ndarray int64), dans l'ordre du fichier
+        expected_ns: Pas de temps attendu (1 heure)
+
+    Returns:
+        dict: start, end, out_of_order, gaps (DataFrame), duplicates (DataFrame)
+    """
+    ts_ns = np.asarray(ts_ns, dtype=np.int64)
+    out_of_order = int((np.diff(ts_ns) < 0).sum())
+    tracker = TimestampRunTracker(expected_ns)
+    tracker.update(np.sort(ts_ns) if out_of_order else ts_ns)
+    runs = tracker.finish()
+    runs["out_of_order"] = out_of_order
+    return runs
+
+
+class TimestampRunTracker:
+    """
+    Gaps et doublons de timestamps, bloc de lignes par bloc.
+
+    Seuls le dernier timestamp et la plage de doublons en cours passent
+    d'un bloc au suivant: la mémoire ne dépend que du nombre de gaps et de
+    doublons. Les gaps et doublons sont relevés dans l'ordre du fichier
+    (résultat de timestamp_runs pour un fichier trié); les timestamps hors
+    ordre sont comptés.
+    """
+
+    def __init__(self, expected_ns=HOUR_NS):
+        self.expected_ns = expected_ns
+        self.out_of_order = 0
+        self.min = self.max = self.last = None
+        self._gaps = []
+        self._duplicates = []
+        self._open_ts = None    # Plage de doublons ouverte en fin de bloc
+        self._open_length = 0
+
+    def update(self, ts_ns):
+        """Ajoute les timestamps (ns UTC) d'un bloc, dans l'ordre du fichier."""
+        ts_ns = np.asarray(ts_ns, dtype=np.int64)
+        if len(ts_ns) == 0:
+            return
+        self.min = ts_ns.min() if self.min is None else min(self.min, ts_ns.min())
+        self.max = ts_ns.max() if self.max is None else max(self.max, ts_ns.max())
+        if self.last is not None:
+            ts_ns = np.concatenate([[self.last], ts_ns])
+        self.last = ts_ns[-1]
+        diffs = np.diff(ts_ns)
+        if len(diffs) == 0:
+            return
+        self.out_of_order += int((diffs < 0).sum())
+
+        gap_idx = np.flatnonzero(diffs > self.expected_ns)
+        self._gaps.append((ts_ns[gap_idx], ts_ns[gap_idx + 1]))
+
+        # Doublons: plages de différences nulles, la plage ouverte se poursuit
+        edges = np.diff(np.concatenate([[0], (diffs == 0).astype(np.int8), [0]]))
+        run_start = np.flatnonzero(edges == 1)
+        lengths = np.flatnonzero(edges == -1) - run_start
+        duplicated = ts_ns[run_start]
+        if self._open_length:
+            if len(run_start) and run_start[0] == 0:
+                duplicated[0], lengths[0] = self._open_ts, lengths[0] + self._open_length
+            else:
+                self._duplicates.append(([self._open_ts], [self._open_length]))
+        self._open_length = 0
+        if len(run_start) and run_start[-1] + lengths[-1] == len(diffs):
+            self._open_ts, self._open_length = duplicated[-1], lengths[-1]
+            duplicated, lengths = duplicated[:-1], lengths[:-1]
+        self._duplicates.append((duplicated, lengths))
+
+    def finish(self):
+        """
+        Returns:
+            dict: start, end, out_of_order, gaps (DataFrame), duplicates (DataFrame)
+        """
+        if self._open_length:
+            self._duplicates.append(([self._open_ts], [self._open_length]))
+            self._open_length = 0
+        empty = np.empty(0, dtype=np.int64)
+        before = np.concatenate([empty] + [gap[0] for gap in self._gaps])
+        after = np.concatenate([empty] + [gap[1] for gap in self._gaps])
+        duplicated = np.concatenate([empty] + [np.asarray(d[0], dtype=np.int64)
+                                               for d in self._duplicates])
+        lengths = np.concatenate([empty] + [np.asarray(d[1], dtype=np.int64)
+                                            for d in self._duplicates])
+        transitions = (eu_dst_transitions(self.min, self.max) if self.min is not None
+                       else np.empty(0, np.int64))
+
+        # Gaps: un enregistrement par intervalle manquant
+        diffs = after - before
+        gaps = pd.DataFrame({
+            "start": _to_timestamps(before),
+            "end": _to_timestamps(after),
+            "duration_h": diffs / HOUR_NS,
+            "missing_steps": diffs // self.expected_ns - 1,
+            "dst": _near(before, transitions, HOUR_NS) | _near(after, transitions, HOUR_NS),
+        })
+        duplicates = pd.DataFrame({
+            "timestamp": _to_timestamps(duplicated),
+            "occurrences": lengths + 1,
+            "dst": _near(duplicated, transitions, HOUR_NS),
+        })
+
+        return {
+            "start": _to_timestamps([self.min])[0] if self.min is not None else None,
+            "end": _to_timestamps([self.max])[0] if self.max is not None else None,
+            "out_of_order": self.out_of_order,
+            "gaps": gaps,
+            "duplicates": duplicates,
+        }
+
+
+class MissingRunTracker:
+    """
+    Plages de valeurs manquantes par colonne, bloc de lignes par bloc.
+
+    Une plage ouverte à la fin d'un bloc se poursuit dans le bloc suivant:
+    le résultat ne dépend pas de la taille des blocs. Si les timestamps des
+    blocs sont fournis, le premier et le dernier timestamp de chaque plage
+    sont relevés au passage (sans conserver les timestamps).
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.rows = 0
+        self._open_start = np.full(len(self.columns), -1, dtype=np.int64)
+        self._open_start_ts = np.zeros(len(self.columns), dtype=np.int64)
+        self._last_ts = None
+        self._runs = []
+
+    def update(self, block, ts_ns=None):
+        """
+        Ajoute un bloc 2-D (lignes × colonnes), NaN pour les manquants.
+
+        Args:
+            ts_ns: Timestamps des lignes du bloc (ns UTC), à fournir pour
+                tous les blocs ou pour aucun
+        """
+        mask = np.isnan(np.asarray(block, dtype=np.float64))
+        n_rows, n_cols = mask.shape
+        if n_rows == 0:
+            return
+        was_open = self._open_start >= 0
+
+        # Transitions colonne par colonne (ordre: colonne puis ligne)
+        edges = np.diff(np.vstack([was_open, mask]).astype(np.int8), axis=0).T
+        start_col, start_row = np.nonzero(edges == 1)
+        end_col, end_row = np.nonzero(edges == -1)
+
+        # Plages ouvertes au bloc précédent + plages commençant dans ce bloc
+        carried = np.flatnonzero(was_open)
+        all_col = np.concatenate([carried, start_col])
+        all_row = np.concatenate([self._open_start[carried], self.rows + start_row])
+        order = np.lexsort((all_row, all_col))
+        all_col, all_row = all_col[order], all_row[order]
+
+        # La k-ième fin d'une colonne ferme sa k-ième plage ouverte
+        n_ends = np.bincount(end_col, minlength=n_cols)
+        n_starts = np.bincount(all_col, minlength=n_cols)
+        first = np.concatenate([[0], np.cumsum(n_starts)[:-1]])
+        rank = np.arange(len(all_col)) - first[all_col]
+        closed = rank < n_ends[all_col]
+        run = (end_col, all_row[closed], self.rows + end_row)
+
+        if ts_ns is not None:
+            ts_ns = np.asarray(ts_ns, dtype=np.int64)
+            all_ts = np.concatenate([self._open_start_ts[carried], ts_ns[start_row]])[order]
+            # Dernière ligne manquante: end_row - 1, éventuellement dans le bloc précédent
+            previous = np.concatenate([[self._last_ts if self._last_ts is not None else 0], ts_ns])
+            run += (all_ts[closed], previous[end_row])
+            self._open_start_ts[all_col[~closed]] = all_ts[~closed]
+            self._last_ts = ts_ns[-1]
+        self._runs.append(run)
+
+        self._open_start[:] = -1
+        self._open_start[all_col[~closed]] = all_row[~closed]
+        self.rows += n_rows
+
+    def finish(self):
+        """
+        Returns:
+            pd.DataFrame: column, start_row, end_row (exclue), length, et
+            start/end (premier et dernier timestamp manquant) si les
+            timestamps ont été fournis
+        """
+        still_open = np.flatnonzero(self._open_start >= 0)
+        last = (still_open, self._open_start[still_open],
+                np.full(len(still_open), self.rows, dtype=np.int64))
+        if self._last_ts is not None:
+            last += (self._open_start_ts[still_open], np.full(len(still_open), self._last_ts))
+        parts = self._runs + [last]
+        col, start, end = (np.concatenate([p[k] for p in parts]).astype(np.int64) for k in range(3))
+        order = np.lexsort((start, col))
+        missing_runs = pd.DataFrame({
+            "column": pd.Categorical.from_codes(col[order], categories=self.columns),
+            "start_row": start[order],
+            "end_row": end[order],
+            "length": end[order] - start[order],
+        })
+        if self._last_ts is not None:
+            for k, name in ((3, "start"), (4, "end")):
+                values = np.concatenate([p[k] for p in parts]).astype(np.int64)
+                missing_runs[name] = _to_timestamps(values[order])
+        return missing_runs
+
+
+def missing_counts(missing_runs, columns):
+    """Nombre de valeurs manquantes par colonne, déduit des plages."""
+    counts = missing_runs.groupby("column", observed=False)["length"].sum()
+    return counts.reindex(columns, fill_value=0).astype('int64')
+
+
+def add_run_timestamps(missing_runs, ts_ns):
+    """Ajoute premier et dernier timestamp manquant de chaque plage."""
+    ts_ns = np.asarray(ts_ns, dtype=np.int64)
+    missing_runs = missing_runs.copy()
+    missing_runs["start"] = _to_timestamps(ts_ns[missing_runs["start_row"].to_numpy()])
+    missing_runs["end"] = _to_timestamps(ts_ns[missing_runs["end_row"].to_numpy() - 1])
+    return missing_runs
+
+
+def write_integrity_index(runs, missing_runs, rows, source_path, directory=DEFAULT_INTEGRITY_DIR):
+    """Sauvegarde l'index d'intégrité (Parquet + manifeste)."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    runs["gaps"].to_parquet(directory / "gaps.parquet", index=False)
+    runs["duplicates"].to_parquet(directory / "duplicates.parquet", index=False)
+    missing_runs.to_parquet(directory / "missing_runs.parquet", index=False)
+    manifest = {
+        "source": source_fingerprint(source_path),
+        "rows": int(rows),
+        "columns": list(missing_runs["column"].cat.categories),
+        "out_of_order": runs["out_of_order"],
+        "expected_step_h": 1,
+    }
+    with open(directory / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return directory
+
+
+def read_missing_runs(source_path, columns, rows, directory=DEFAULT_INTEGRITY_DIR):
+    """
+    Plages de valeurs manquantes persistées pour `columns`, ou None si
+    l'index est absent ou ne correspond plus à la source.
+
+    Les numéros de ligne ne sont fiables que si la source n'a pas changé,
+    a le même nombre de lignes et était déjà triée.
+    """
+    manifest_file = Path(directory) / MANIFEST_NAME
+    if not manifest_file.exists():
+        return None
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if (manifest["source"] != source_fingerprint(source_path)
+            or manifest["rows"] != rows
+            or manifest["out_of_order"]
+            or not set(columns) <= set(manifest["columns"])):
+        return None
+    missing_runs = pd.read_parquet(Path(directory) / "missing_runs.parquet",
+                                   filters=[("column", "in", list(columns))])
+    missing_runs["column"] = missing_runs["column"].astype(str)
+    return missing_runs
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Module: Extraction Ciblée des Données Météo (ERA5)
+==================================================
+Le fichier météo OPSD (weather_data.csv) couvre tous les pays européens
+sur plusieurs décennies (plusieurs Go). Seule une petite partie sert au
+projet: les pays focus sur la période de `temporal_split`.
+
+Lecture en flux, par blocs de lignes:
+
+- projection des colonnes dès le parsing (usecols): seules la colonne
+  temporelle et les colonnes {pays}_{variable} des pays focus sont
+  converties
+- les blocs antérieurs à la période sont ignorés, la lecture s'arrête au
+  premier bloc postérieur (fichier trié par timestamp)
+- le résultat est réaligné sur une grille horaire complète (UTC), indexée
+  par `timestamp` comme le dataset OPSD nettoyé: la jointure avec les prix
+  est un simple alignement d'index
+
+Colonnes du fichier source (exemples):
+    utc_timestamp, DE_temperature, DE_radiation_direct_horizontal,
+    DE_radiation_diffuse_horizontal, DE11_temperature (NUTS-2), ...
+
+Auteur: Étudiant 1 - Responsable Données & Ingestion
+Projet: Projet 8 - Prix Négatifs Électricité Renouvelable
+Date: Février 2026
+"""
+
+import logging
+
+import pandas as pd
+
+from opsd_store import read_csv_header, to_utc
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WEATHER_SETTINGS = {
+    "source_file": "data/raw/opsd_weather/weather_data.csv",
+    "output": "data/processed/weather_focus_countries.arrow",
+    "variables": None,          # None: toutes les variables disponibles
+    "include_regions": False,   # Colonnes régionales NUTS-2 (ex. DE11_temperature)
+    "chunksize": 200_000,
+    "float_dtype": "float32",
+}
+
+
+def weather_settings(config=None):
+    """Section `weather_ingestion` de la configuration, avec valeurs par défaut."""
+    settings = dict(DEFAULT_WEATHER_SETTINGS)
+    if config and config.get('weather_ingestion'):
+        settings.update({k: v for k, v in config['weather_ingestion'].items() if v is not None})
+    return settings
+
+
+def analysis_period(config):
+    """
+    Période couverte par `temporal_split` (entraînement → test), en UTC.
+
+    Les dates de fin sont inclusives: la dernière heure du jour de fin est
+    conservée.
+    """
+    split = config['temporal_split']
+    starts = [to_utc(value) for key, value in split.items() if key.endswith('_start')]
+    ends = [to_utc(value) for key, value in split.items() if key.endswith('_end')]
+    return min(starts), max(ends) + pd.Timedelta(days=1) - pd.Timedelta(hours=1)
+
+
+def select_weather_columns(header, countries, variables=None, include_regions=False):
+    """
+    Colonnes météo des pays demandés.
+
+    Args:
+        header: Colonnes du fichier source (colonne temporelle en premier)
+        countries: Codes pays (ex. ['DE', 'DK', 'FR'])
+        variables: Variables à conserver (None = toutes)
+        include_regions: Conserver aussi les colonnes régionales (DE11_...)
+
+    Returns:
+        list: Colonnes retenues, dans l'ordre du fichier
+    """
+    selected = []
+    for col in header[1:]:
+        area, _, variable = col.partition('_')
+        if not variable or (variables is not None and variable not in variables):
+            continue
+        country = area[:2]
+        if country in countries and (area == country or include_regions):
+            selected.append(col)
+    return selected
+
+
+def read_weather_subset(csv_path, countries, start, end, variables=None,
+                        include_regions=False, chunksize=200_000, float_dtype="float32"):
+    """
+    Lit en flux le sous-ensemble (pays × période) du fichier météo.
+
+    Returns:
+        tuple: (pd.DataFrame indexé par `timestamp` sur une grille horaire
+        complète [start, end], statistiques de lecture)
+    """
+    header = read_csv_header(csv_path)
+    time_col = header[0]
+    columns = select_weather_columns(header, countries, variables, include_regions)
+    if not columns:
+        raise ValueError(f"Aucune colonne météo pour {countries} dans {csv_path}")
+
+    blocks = []
+    stats = {"rows_read": 0, "rows_kept": 0, "columns_source": len(header) - 1,
+             "columns_kept": len(columns)}
+    dtypes = {col: float_dtype for col in columns}
+    reader = pd.read_csv(csv_path, usecols=[time_col] + columns, dtype=dtypes,
+                         chunksize=chunksize, low_memory=False)
+    for chunk in reader:
+        stats["rows_read"] += len(chunk)
+        timestamps = pd.to_datetime(chunk[time_col], utc=True)
+        if timestamps.iloc[-1] < start:
+            continue
+        mask = ((timestamps >= start) & (timestamps <= end)).to_numpy()
+        if mask.any():
+            block = chunk.loc[mask, columns]
+            block.index = pd.DatetimeIndex(timestamps[mask], name='timestamp')
+            blocks.append(block)
+            stats["rows_kept"] += int(mask.sum())
+        if timestamps.iloc[-1] > end:
+            break  # fichier trié: les blocs suivants sont hors période
+    reader.close()
+
+    grid = pd.date_range(start, end, freq='h', name='timestamp')
+    if blocks:
+        df = pd.concat(blocks)
+        df = df[~df.index.duplicated(keep='first')].reindex(grid)
+    else:
+        df = pd.DataFrame({col: pd.Series(index=grid, dtype=float_dtype) for col in columns})
+    stats["hours"] = len(grid)
+    stats["hours_missing"] = int(df.isnull().all(axis=1).sum())
+    return df, stats